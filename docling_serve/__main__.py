@@ -374,6 +374,7 @@ def rq_worker() -> Any:
     rq_config = RQOrchestratorConfig(
         redis_url=docling_serve_settings.eng_rq_redis_url,
         results_prefix=docling_serve_settings.eng_rq_results_prefix,
+        results_ttl=docling_serve_settings.eng_rq_results_ttl,
         sub_channel=docling_serve_settings.eng_rq_sub_channel,
         scratch_dir=get_scratch(),
     )
@@ -2,12 +2,12 @@ import asyncio
 import copy
 import importlib.metadata
 import logging
+import mimetypes
 import shutil
 import time
 from contextlib import asynccontextmanager
 from io import BytesIO
 from typing import Annotated
-from docling_serve.settings import docling_serve_settings
 
 from fastapi import (
     BackgroundTasks,
@@ -27,7 +27,7 @@ from fastapi.openapi.docs import (
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
 )
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from scalar_fastapi import get_scalar_api_reference
 
@@ -56,6 +56,7 @@ from docling_jobkit.orchestrators.base_orchestrator import (
 )
 
 from docling_serve.auth import APIKeyAuth, AuthenticationResult
+from docling_serve.batch_tuning import batch_tuning
 from docling_serve.datamodel.convert import ConvertDocumentsRequestOptions
 from docling_serve.datamodel.requests import (
     ConvertDocumentsRequest,
@@ -65,6 +66,8 @@ from docling_serve.datamodel.requests import (
     S3SourceRequest,
     TargetName,
     TargetRequest,
+    TaskStatusBatchRequest,
+    TaskWaitMode,
     make_request_model,
 )
 from docling_serve.datamodel.responses import (
@@ -74,14 +77,19 @@ from docling_serve.datamodel.responses import (
     HealthCheckResponse,
     MessageKind,
     PresignedUrlConvertDocumentResponse,
+    TaskStatusBatchResponse,
     TaskStatusResponse,
     WebsocketMessage,
 )
 from docling_serve.helper_functions import DOCLING_VERSIONS, FormDepends
-from docling_serve.orchestrator_factory import get_async_orchestrator
+from docling_serve.orchestrator_factory import (
+    RedisTaskStatusMixin,
+    get_async_orchestrator,
+    get_task_statuses,
+)
 from docling_serve.response_preparation import prepare_response
 from docling_serve.settings import docling_serve_settings
-from docling_serve.storage import get_scratch
+from docling_serve.storage import get_figure_store, get_scratch
 from docling_serve.websocket_notifier import WebsocketNotifier
 
 
@@ -142,6 +150,9 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         _log.info("Queue processor cancelled.")
 
+    if isinstance(orchestrator, RedisTaskStatusMixin):
+        await orchestrator.close_redis()
+
     # Remove scratch directory in case it was a tempfile
     if docling_serve_settings.scratch_path is not None:
         shutil.rmtree(scratch_dir, ignore_errors=True)
@@ -338,15 +349,46 @@ def create_app():  # noqa: C901
 
     async def _wait_task_complete(orchestrator: BaseOrchestrator, task_id: str) -> bool:
         start_time = time.monotonic()
+        notifier = orchestrator.notifier
         while True:
+            # Take the update event before checking the status, so that a
+            # notification arriving in between is not missed.
+            update_event = (
+                notifier.get_update_event(task_id)
+                if isinstance(notifier, WebsocketNotifier)
+                else None
+            )
             task = await orchestrator.task_status(task_id=task_id)
             if task.is_completed():
                 return True
-            await asyncio.sleep(docling_serve_settings.sync_poll_interval)
+
+            await _wait_task_updates(
+                [update_event] if update_event is not None else [],
+                docling_serve_settings.sync_poll_interval,
+            )
+
             elapsed_time = time.monotonic() - start_time
             if elapsed_time > docling_serve_settings.max_sync_wait:
                 return False
 
+    async def _wait_task_updates(events: list[asyncio.Event], timeout: float) -> None:
+        """
+        Wake up on the next notification of any of the tasks, or after the timeout.
+
+        Polling is only the fallback for updates which are not notified to this instance.
+        """
+        if not events:
+            await asyncio.sleep(timeout)
+            return
+        waiters = [asyncio.create_task(event.wait()) for event in events]
+        try:
+            await asyncio.wait(
+                waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
     ##########################################
     # Downgrade openapi 3.1 to 3.0.x helpers #
     ##########################################
@@ -448,6 +490,29 @@ def create_app():  # noqa: C901
             )
         return DOCLING_VERSIONS
 
+    # Adaptive batch sizes of the pipelines running in this process
+    @app.get("/v1/stats/batching", tags=["health"])
+    def batching_stats(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+    ) -> dict:
+        return batch_tuning.stats()
+
+    # Redis connection pool of the RQ engine
+    @app.get("/v1/stats/redis", tags=["health"])
+    def redis_stats(
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+    ) -> dict:
+        if not isinstance(orchestrator, RedisTaskStatusMixin):
+            raise HTTPException(
+                status_code=404,
+                detail=(
+                    "Redis is not used by the "
+                    f"{docling_serve_settings.eng_kind.value} engine."
+                ),
+            )
+        return orchestrator.redis_pool_stats()
+
     # Convert a document from URL(s)
     @app.post(
         "/v1/convert/source",
@@ -860,6 +925,65 @@ def create_app():  # noqa: C901
             task_meta=task.processing_meta,
         )
 
+    # Status of many tasks
+    @app.post(
+        "/v1/status/poll",
+        tags=["tasks"],
+        response_model=TaskStatusBatchResponse,
+    )
+    async def task_status_poll_batch(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        request: TaskStatusBatchRequest,
+    ):
+        task_ids = list(dict.fromkeys(request.task_ids))
+        deadline = time.monotonic() + min(
+            request.wait, docling_serve_settings.max_sync_wait
+        )
+        notifier = orchestrator.notifier
+        while True:
+            # Take the update events before checking the statuses, so that a
+            # notification arriving in between is not missed.
+            update_events = {}
+            if isinstance(notifier, WebsocketNotifier):
+                for task_id in task_ids:
+                    event = notifier.get_update_event(task_id)
+                    if event is not None:
+                        update_events[task_id] = event
+            statuses = await get_task_statuses(orchestrator, task_ids)
+
+            completed = [task.is_completed() for task, _ in statuses.values()]
+            if request.wait_for == TaskWaitMode.ANY:
+                done = any(completed) or not completed
+            else:
+                done = all(completed)
+            remaining = deadline - time.monotonic()
+            if done or remaining <= 0:
+                break
+
+            await _wait_task_updates(
+                [
+                    event
+                    for task_id, event in update_events.items()
+                    if task_id in statuses and not statuses[task_id][0].is_completed()
+                ],
+                min(remaining, docling_serve_settings.sync_poll_interval),
+            )
+
+        return TaskStatusBatchResponse(
+            tasks=[
+                TaskStatusResponse(
+                    task_id=task.task_id,
+                    task_type=task.task_type,
+                    task_status=task.task_status,
+                    task_position=task_queue_position,
+                    task_meta=task.processing_meta,
+                )
+                for task, task_queue_position in statuses.values()
+            ],
+            not_found=[task_id for task_id in task_ids if task_id not in statuses],
+        )
+
     # Task status websocket
     @app.websocket(
         "/v1/status/ws/{task_id}",
@@ -892,8 +1016,9 @@ def create_app():  # noqa: C901
             await websocket.close()
             return
 
-        # Track active WebSocket connections for this job
-        orchestrator.notifier.task_subscribers[task_id].add(websocket)
+        # Track active WebSocket connections for this job, also for the tasks
+        # enqueued on other replicas, whose updates are published to all of them
+        orchestrator.notifier.task_subscribers.setdefault(task_id, set()).add(websocket)
 
         try:
             task_queue_position = await orchestrator.get_queue_position(task_id=task_id)
@@ -933,7 +1058,9 @@ def create_app():  # noqa: C901
             _log.info(f"WebSocket disconnected for job {task_id}")
 
         finally:
-            orchestrator.notifier.task_subscribers[task_id].remove(websocket)
+            orchestrator.notifier.task_subscribers.get(task_id, set()).discard(
+                websocket
+            )
 
     # Task result
     @app.get(
@@ -971,6 +1098,36 @@ def create_app():  # noqa: C901
         except TaskNotFoundError:
             raise HTTPException(status_code=404, detail="Task not found.")
 
+    # Figure payload
+    @app.get(
+        "/v1/figures/{task_id}/{figure_id:path}",
+        tags=["tasks"],
+        response_class=FileResponse,
+        responses={
+            200: {
+                "content": {"image/png": {}},
+            }
+        },
+    )
+    async def figure_payload(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        task_id: str,
+        figure_id: str,
+    ):
+        if not docling_serve_settings.enable_figures_endpoint:
+            raise HTTPException(
+                status_code=404,
+                detail="Figure storage is disabled. Enable it with DOCLING_SERVE_ENABLE_FIGURES_ENDPOINT=true.",
+            )
+        # Only the figures of the documents returned to the task are served
+        figure_path = get_figure_store().path(task_id, figure_id)
+        if figure_path is None:
+            raise HTTPException(status_code=404, detail="Figure not found.")
+        media_type, _ = mimetypes.guess_type(figure_path.name)
+        return FileResponse(
+            figure_path, media_type=media_type or "application/octet-stream"
+        )
+
     # Update task progress
     @app.post(
         "/v1/callback/task/progress",
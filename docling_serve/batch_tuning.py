@@ -0,0 +1,173 @@
+"""
+Adaptive batch sizes of the layout and table stages of the PDF pipeline.
+
+Each stage has a controller fed with the latency of every batch it runs. The
+batch size follows the number of pages fitting in the target latency, based on a
+moving average of the seconds per page, and is halved while the process RSS is
+above the configured limit. Sizes stay between the configured bounds, shrink
+immediately and at most double per full batch.
+
+Controllers are keyed by the same pipeline options key as the model registry, so
+the parsers sharing a pipeline also share its controllers.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+_log = logging.getLogger(__name__)
+
+# Weight of the last batch in the moving average of the seconds per page
+_EWMA_WEIGHT = 0.3
+# Batch sizes only grow while the RSS is below this fraction of the limit
+_RSS_GROWTH_RATIO = 0.8
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class BatchTuning:
+    """
+    Bounds and targets of the adaptive batch sizes.
+
+    Attributes:
+        min_size: Smallest batch size
+        target_seconds: Latency aimed at for each batch
+        max_rss: Process RSS in bytes above which the batch sizes are halved, None for no limit
+    """
+
+    min_size: int = 1
+    target_seconds: float = 10.0
+    max_rss: Optional[int] = None
+
+
+class BatchSizeController:
+    """
+    Batch size of one pipeline stage, adjusted after every batch.
+
+    Args:
+        stage: Name of the pipeline stage (layout, table)
+        max_size: Largest and initial batch size
+        tuning: Bounds and targets
+    """
+
+    def __init__(self, stage: str, max_size: int, tuning: BatchTuning):
+        self.stage = stage
+        self.max_size = max(1, max_size)
+        self.min_size = min(self.max_size, max(1, tuning.min_size))
+        self.target_seconds = tuning.target_seconds
+        self.max_rss = tuning.max_rss
+
+        self._lock = threading.Lock()
+        self.size = self.max_size
+        self.seconds_per_page: Optional[float] = None
+        self.rss: Optional[int] = None
+        self.batches = 0
+        self.adjustments = 0
+
+    def observe(self, pages: int, seconds: float) -> int:
+        """
+        Record a batch and adjust the batch size.
+
+        Args:
+            pages: Number of pages in the batch
+            seconds: Time spent running the batch
+
+        Returns:
+            Batch size to use for the next batch
+        """
+        if pages <= 0:
+            return self.size
+
+        rss = current_rss()
+        with self._lock:
+            self.batches += 1
+            self.rss = rss
+            per_page = seconds / pages
+            if self.seconds_per_page is None:
+                self.seconds_per_page = per_page
+            else:
+                self.seconds_per_page += _EWMA_WEIGHT * (
+                    per_page - self.seconds_per_page
+                )
+
+            size = self.size
+            if self.max_rss is not None and rss is not None and rss > self.max_rss:
+                size = size // 2
+            else:
+                fit = int(self.target_seconds / max(self.seconds_per_page, 1e-6))
+                if fit < size:
+                    size = fit
+                elif pages >= size and (
+                    self.max_rss is None
+                    or rss is None
+                    or rss < self.max_rss * _RSS_GROWTH_RATIO
+                ):
+                    # Only full batches show whether a larger one still fits
+                    size = min(fit, size * 2)
+            size = min(self.max_size, max(self.min_size, size))
+
+            if size != self.size:
+                _log.info(
+                    f"{self.stage} batch size {self.size} -> {size} "
+                    f"({pages} pages in {seconds:.2f}s, rss={rss})"
+                )
+                self.size = size
+                self.adjustments += 1
+            return size
+
+    def stats(self) -> dict[str, Optional[float]]:
+        with self._lock:
+            return {
+                "batch_size": self.size,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "batches": self.batches,
+                "adjustments": self.adjustments,
+                "seconds_per_page": self.seconds_per_page,
+                "rss": self.rss,
+            }
+
+
+class BatchTuningRegistry:
+    """Batch size controllers of the pipelines of this process, by pipeline options key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._controllers: dict[str, dict[str, BatchSizeController]] = {}
+
+    def configure(
+        self, key: str, max_sizes: dict[str, int], tuning: BatchTuning
+    ) -> None:
+        """Create the controllers of a pipeline, keeping the existing ones."""
+        with self._lock:
+            controllers = self._controllers.setdefault(key, {})
+            for stage, max_size in max_sizes.items():
+                if stage not in controllers:
+                    controllers[stage] = BatchSizeController(stage, max_size, tuning)
+
+    def controllers(self, key: str) -> dict[str, BatchSizeController]:
+        with self._lock:
+            return dict(self._controllers.get(key, {}))
+
+    def stats(self) -> dict[str, dict[str, dict[str, Optional[float]]]]:
+        with self._lock:
+            controllers = {
+                key: dict(stages) for key, stages in self._controllers.items()
+            }
+        return {
+            key: {stage: controller.stats() for stage, controller in stages.items()}
+            for key, stages in controllers.items()
+        }
+
+
+batch_tuning = BatchTuningRegistry()
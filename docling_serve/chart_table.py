@@ -0,0 +1,424 @@
+"""
+Markdown tables of chart data.
+
+Renders the categories and series of a chart as
+pandas.DataFrame(series, index=categories).to_markdown() does, without pandas
+and tabulate: the dtypes pandas infers for the columns are applied to the
+values (DataFrame.values upcasts homogeneous numeric frames to floats), then
+the cells are typed, formatted and aligned with the rules of the tabulate
+"pipe" format.
+
+The values come from the XML parts of the documents, which cannot contain the
+control characters tabulate handles specially (ANSI escape codes and the
+separating line marker), so those are not supported.
+"""
+
+import datetime as dt
+import re
+from collections.abc import Mapping, Sequence
+from functools import reduce
+from itertools import zip_longest
+from typing import Any
+
+try:
+    import wcwidth  # optional wide-character (CJK) support, as in tabulate
+except ImportError:
+    wcwidth = None
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+_UINT64_MAX = 2**64 - 1
+# Range of datetime64[ns]
+_DATETIME_MIN = dt.datetime(1677, 9, 22)
+_DATETIME_MAX = dt.datetime(2262, 4, 11)
+_EPOCH = dt.datetime(1970, 1, 1)
+
+_MULTILINE_RE = re.compile(r"\r|\n|\r\n")
+_THOUSANDS_FLOAT_RE = re.compile(
+    r"^(([+-]?[0-9]{1,3})(?:,([0-9]{3}))*)?(?(1)\.[0-9]*|\.[0-9]+)?$"
+)
+_MIN_PADDING = 2
+_PADDING = 1
+
+
+def render_chart_table(
+    categories: Sequence[Any], series: Mapping[Any, Sequence[Any]]
+) -> str:
+    """
+    Markdown table of chart data, identical to
+    pandas.DataFrame(dict(series), index=categories).to_markdown().
+
+    Args:
+        categories: Row labels
+        series: Column values by series name, each as long as categories
+
+    Returns:
+        Markdown table string
+    """
+    index = _index_values(categories)
+    headers = [str(name) for name in series]
+    rows = [[label] for label in index]
+    for row, values in zip(rows, _frame_rows(list(series.values()), len(index))):
+        row.extend(values)
+    # The index column has an empty header
+    if headers and rows and len(headers) < len(rows[0]):
+        headers = [""] * (len(rows[0]) - len(headers)) + headers
+    return _tabulate_pipe(rows, headers)
+
+
+# pandas
+
+
+def _value_kind(value: Any) -> str:
+    """
+    dtype kind of a single value: "n" for None, "O" if the value forces an
+    object dtype.
+    """
+    if value is None:
+        return "n"
+    if isinstance(value, bool):
+        return "b"
+    if isinstance(value, int):
+        if _INT64_MIN <= value <= _INT64_MAX:
+            return "i"
+        return "u" if _INT64_MAX < value <= _UINT64_MAX else "O"
+    if isinstance(value, float):
+        return "f"
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None or not _DATETIME_MIN <= value <= _DATETIME_MAX:
+            return "O"
+        return "M"
+    if isinstance(value, dt.timedelta):
+        return "m"
+    return "O"
+
+
+def _numeric_kind(kinds: set[str], values: Sequence[Any]) -> str:
+    """dtype kind of values whose non-missing kinds are all "i", "u" or "f"."""
+    if "n" in kinds:
+        return "f"
+    # Ints above int64 with negative ones fit no numeric dtype
+    if "u" in kinds and any(isinstance(value, int) and value < 0 for value in values):
+        return "O"
+    if "f" in kinds:
+        return "f"
+    return "u" if "u" in kinds else "i"
+
+
+def _infer_kind(values: Sequence[Any]) -> str:
+    """
+    dtype kind pandas infers for a list: "i" (int64), "u" (uint64), "f" (float64),
+    "b" (bool), "M" (datetime64[ns]), "m" (timedelta64[ns]) or "O" (object).
+    """
+    kinds = {_value_kind(value) for value in values}
+    numeric = kinds - {"n"}
+    if not numeric or "O" in numeric:
+        return "O"
+    if numeric <= {"i", "u", "f"}:
+        return _numeric_kind(kinds, values)
+    # pandas stores missing datetimes as NaT, which tabulate cannot format as
+    # numbers: chart values are never missing dates, they are kept as objects
+    if numeric in ({"b"}, {"M"}, {"m"}) and "n" not in kinds:
+        return numeric.pop()
+    return "O"
+
+
+def _timedelta_str(value: dt.timedelta) -> str:
+    """str() of the pandas.Timedelta of value."""
+    hours, rest = divmod(value.seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    sign = " +" if value.days < 0 else " "
+    text = f"{value.days} days{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if value.microseconds:
+        text += f".{value.microseconds:06d}"
+    return text
+
+
+def _as_float(value: Any, kind: str) -> float:
+    """Value of a cell of a homogeneous numeric frame, as tabulate sees it."""
+    if value is None:
+        return float("nan")
+    if kind == "M":
+        return float((value - _EPOCH) // dt.timedelta(microseconds=1) * 1000)
+    if kind == "m":
+        return float(value // dt.timedelta(microseconds=1) * 1000)
+    return float(value)
+
+
+def _as_object(value: Any, kind: str) -> Any:
+    """Value of a cell stored in an object array by pandas."""
+    if kind == "f":
+        return float("nan") if value is None else float(value)
+    if kind == "m":
+        return _timedelta_str(value)
+    return value
+
+
+def _index_values(categories: Sequence[Any]) -> list[Any]:
+    """Values of list(pandas.Index(categories))."""
+    return [_as_object(value, _infer_kind(categories)) for value in categories]
+
+
+def _frame_rows(columns: list[Sequence[Any]], num_rows: int) -> list[list[Any]]:
+    """Rows of DataFrame.values for the columns."""
+    if not columns:
+        return [[] for _ in range(num_rows)]
+
+    kinds = [_infer_kind(values) for values in columns]
+    kind_set = set(kinds)
+    # Frames of one numeric dtype (or of ints and floats) keep a numpy array
+    # whose scalars tabulate formats as floats
+    if kind_set <= {"i", "u", "f"} or (len(kind_set) == 1 and kind_set != {"O"}):
+        cells = [
+            [_as_float(value, kind) for value in values]
+            for values, kind in zip(columns, kinds)
+        ]
+    else:
+        cells = [
+            [_as_object(value, kind) for value in values]
+            for values, kind in zip(columns, kinds)
+        ]
+    return [list(row) for row in zip(*cells)]
+
+
+# tabulate
+
+
+def _width(text: str) -> int:
+    if wcwidth is not None:
+        return wcwidth.wcswidth(text)
+    return len(text)
+
+
+def _multiline_width(text: str) -> int:
+    return max(map(_width, re.split("[\r\n]", text)))
+
+
+def _isconvertible(conv, value: Any) -> bool:
+    try:
+        conv(value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def _isnumber(value: Any) -> bool:
+    if not _isconvertible(float, value):
+        return False
+    if isinstance(value, str | bytes):
+        number = float(value)
+        if number != number or number in (float("inf"), float("-inf")):
+            return value.lower() in ["inf", "-inf", "nan"]
+    return True
+
+
+def _isint(value: Any) -> bool:
+    return type(value) is int or (
+        isinstance(value, bytes | str) and _isconvertible(int, value)
+    )
+
+
+def _isbool(value: Any) -> bool:
+    return type(value) is bool or (
+        isinstance(value, bytes | str) and value in ("True", "False")
+    )
+
+
+def _cell_type(value: Any) -> type:
+    if value is None:
+        return type(None)
+    if hasattr(value, "isoformat"):
+        return str
+    if _isbool(value):
+        return bool
+    if _isint(value):
+        return int
+    if _isnumber(value):
+        return float
+    if isinstance(value, bytes):
+        return bytes
+    return str
+
+
+_TYPE_ORDER = {type(None): 0, bool: 1, int: 2, float: 3, bytes: 4, str: 5}
+_ORDER_TYPE = {order: t for t, order in _TYPE_ORDER.items()}
+
+
+def _more_generic(type1: type, type2: type) -> type:
+    return _ORDER_TYPE[max(_TYPE_ORDER.get(type1, 5), _TYPE_ORDER.get(type2, 5))]
+
+
+def _column_type(values: Sequence[Any]) -> type:
+    initial: type = bool
+    return reduce(_more_generic, [_cell_type(value) for value in values], initial)
+
+
+def _format(value: Any, value_type: type) -> str:
+    if value is None:
+        return ""
+    if value_type is int:
+        return format(value, "")
+    if value_type is bytes:
+        try:
+            return str(value, "ascii")
+        except (TypeError, UnicodeDecodeError):
+            return str(value)
+    if value_type is float:
+        return format(float(value), "g")
+    return f"{value}"
+
+
+def _afterpoint(text: str) -> int:
+    """Symbols after the decimal point, -1 if there is none."""
+    if _isnumber(text) or re.match(_THOUSANDS_FLOAT_RE, text):
+        if _isint(text):
+            return -1
+        pos = text.rfind(".")
+        pos = text.lower().rfind("e") if pos < 0 else pos
+        return len(text) - pos - 1 if pos >= 0 else -1
+    return -1
+
+
+def _pad(width: int, text: str, alignment: str) -> str:
+    if alignment == "left":
+        return f"{text:<{width}s}"
+    return f"{text:>{width}s}"
+
+
+def _align_column(
+    strings: list[str], alignment: str, minwidth: int, is_multiline: bool
+) -> list[str]:
+    if alignment == "decimal":
+        decimals = [_afterpoint(s) for s in strings]
+        maxdecimals = max(decimals)
+        strings = [s + (maxdecimals - decs) * " " for s, decs in zip(strings, decimals)]
+    else:
+        strings = [s.strip() for s in strings]
+
+    if is_multiline:
+        lines_widths = [
+            [_width(line) for line in re.split("[\r\n]", s)] for s in strings
+        ]
+        maxwidth = max(
+            max(w for line_widths in lines_widths for w in line_widths), minwidth
+        )
+        if wcwidth is None:
+            return [
+                "\n".join(_pad(maxwidth, line, alignment) for line in s.splitlines())
+                for s in strings
+            ]
+        lens = [[len(line) for line in re.split("[\r\n]", s)] for s in strings]
+        return [
+            "\n".join(
+                _pad(maxwidth - (w - n), line, alignment)
+                for line, w, n in zip(s.splitlines() or s, line_widths, line_lens)
+            )
+            for s, line_widths, line_lens in zip(strings, lines_widths, lens)
+        ]
+
+    widths = [_width(s) for s in strings]
+    maxwidth = max(max(widths), minwidth)
+    if wcwidth is None:
+        return [_pad(maxwidth, s, alignment) for s in strings]
+    return [
+        _pad(maxwidth - (w - len(s)), s, alignment) for s, w in zip(strings, widths)
+    ]
+
+
+def _align_header(header: str, alignment: str, width: int, is_multiline: bool) -> str:
+    if is_multiline:
+        return "\n".join(
+            _align_header(line, alignment, width, False)
+            for line in re.split(_MULTILINE_RE, header)
+        )
+    width += len(header) - _width(header)
+    return _pad(width, header, alignment)
+
+
+def _pipe_line(widths: list[int], aligns: list[str]) -> str:
+    if not aligns:
+        aligns = [""] * len(widths)
+    segments = []
+    for align, w in zip(aligns, widths):
+        if align == "decimal":
+            segments.append("-" * (w - 1) + ":")
+        elif align == "left":
+            segments.append(":" + "-" * (w - 1))
+        else:
+            segments.append("-" * w)
+    return "|" + "|".join(segments) + "|"
+
+
+def _pipe_row(cells: list[str]) -> str:
+    return ("|" + "|".join(cells) + "|").rstrip()
+
+
+def _append_row(
+    lines: list[str], cells: list[str], padded_widths: list[int], is_multiline: bool
+) -> None:
+    pad = " " * _PADDING
+    if not is_multiline:
+        lines.append(
+            _pipe_row([pad + cell + pad for cell in cells] if cells else cells)
+        )
+        return
+
+    cells_lines = [cell.splitlines() for cell in cells]
+    num_lines = max(map(len, cells_lines))
+    cells_lines = [
+        cell_lines + [" " * (w - 2 * _PADDING)] * (num_lines - len(cell_lines))
+        for cell_lines, w in zip(cells_lines, padded_widths)
+    ]
+    for i in range(num_lines):
+        lines.append(
+            _pipe_row([pad + cell_lines[i] + pad for cell_lines in cells_lines])
+        )
+
+
+def _tabulate_pipe(rows: list[list[Any]], headers: list[str]) -> str:
+    """tabulate(rows, headers, tablefmt="pipe") with the default alignments and formats."""
+    plain_text = "\t".join([*headers, *(str(cell) for row in rows for cell in row)])
+    is_multiline = _MULTILINE_RE.search(plain_text) is not None
+    width_fn = _multiline_width if is_multiline else _width
+
+    values = list(zip_longest(*rows))
+    coltypes = [_column_type(col) for col in values]
+    cols = [[_format(value, ct) for value in col] for col, ct in zip(values, coltypes)]
+
+    aligns = ["decimal" if ct in (int, float) else "left" for ct in coltypes]
+    minwidths = (
+        [width_fn(h) + _MIN_PADDING for h in headers] if headers else [0] * len(cols)
+    )
+    cols = [
+        _align_column(col, a, minw, is_multiline)
+        for col, a, minw in zip(cols, aligns, minwidths)
+    ]
+
+    if headers:
+        t_cols = cols or [[""]] * len(headers)
+        t_aligns = aligns or ["left"] * len(headers)
+        minwidths = [
+            max(minw, max(width_fn(cell) for cell in col))
+            for minw, col in zip(minwidths, t_cols)
+        ]
+        headers = [
+            _align_header(h, a, minw, is_multiline)
+            for h, a, minw in zip(headers, t_aligns, minwidths)
+        ]
+    else:
+        minwidths = [max(width_fn(cell) for cell in col) for col in cols]
+    table_rows = list(zip(*cols))
+
+    padded_widths = [w + 2 * _PADDING for w in minwidths]
+    lines = []
+    if not headers:
+        lines.append(_pipe_line(padded_widths, aligns))
+    else:
+        _append_row(lines, headers, padded_widths, is_multiline)
+        lines.append(_pipe_line(padded_widths, aligns))
+    for row in table_rows:
+        _append_row(lines, list(row), padded_widths, is_multiline)
+
+    if headers or table_rows:
+        return "\n".join(lines)
+    return ""
@@ -4,6 +4,9 @@ This replaces DoclingConverterManager to use custom parsing logic while maintain
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Iterable
 from io import BytesIO
 from pathlib import Path
@@ -13,7 +16,16 @@ from docling.datamodel.base_models import DocumentStream
 from docling.datamodel.document import ConversionResult
 from docling_jobkit.convert.manager import DoclingConverterManagerConfig
 from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
-from docling_serve.docling_test import DocTool
+
+from docling_serve.batch_tuning import batch_tuning
+from docling_serve.model_registry import model_registry
+from docling_serve.result_cache import (
+    ResultCache,
+    config_fingerprint,
+    hash_source,
+)
+from docling_serve.settings import docling_serve_settings
+from docling_serve.storage import get_figure_store, get_figures_dir, get_scratch
 
 _log = logging.getLogger(__name__)
 
@@ -28,19 +40,63 @@ class CustomConverterManager:
         self.config = config
         _log.info("[CustomConverter] Initializing custom converter manager")
 
-        # Import ParserConfig and configure with settings from config
+        # The parser is imported here so that the server only pays for it with the local
+        # engine, its format-specific modules are only loaded with the first such file
+        start = time.perf_counter()
         from docling_serve.docling_test import ParserConfig
 
+        import_seconds = time.perf_counter() - start
+
         # Use ParserConfig defaults, override only if explicitly set in config
-        parser_kwargs = {}
+        parser_kwargs: dict[str, Any] = {}
         if config.layout_batch_size is not None:
-            parser_kwargs['layout_batch_size'] = config.layout_batch_size
+            parser_kwargs["layout_batch_size"] = config.layout_batch_size
         if config.table_batch_size is not None:
-            parser_kwargs['table_batch_size'] = config.table_batch_size
+            parser_kwargs["table_batch_size"] = config.table_batch_size
+
+        # Large PDFs are split in page ranges converted on a small pool of their own
+        parser_kwargs["shard_min_pages"] = docling_serve_settings.pdf_shard_min_pages
+        parser_kwargs["shard_pages"] = docling_serve_settings.pdf_shard_pages
+        parser_kwargs["shard_workers"] = docling_serve_settings.pdf_shard_workers
+        # PPTX, XLSX and DOCX files are converted on per-format workers, next to the PDFs
+        parser_kwargs["format_workers"] = docling_serve_settings.format_workers
+
+        # Layout/table batch sizes adjusted to the observed latency and memory, the
+        # batch sizes above are the upper bounds
+        parser_kwargs["adaptive_batching"] = docling_serve_settings.adaptive_batching
+        parser_kwargs["adaptive_batch_min_size"] = (
+            docling_serve_settings.adaptive_batch_min_size
+        )
+        parser_kwargs["adaptive_batch_target_seconds"] = (
+            docling_serve_settings.adaptive_batch_target_seconds
+        )
+        parser_kwargs["adaptive_batch_max_rss"] = (
+            docling_serve_settings.adaptive_batch_max_rss
+        )
+
+        parser_kwargs["scratch_dir"] = get_scratch()
+        parser_kwargs["known_bad_path"] = get_scratch() / "known_bad_pdfs.txt"
+        if docling_serve_settings.enable_figures_endpoint:
+            parser_kwargs["figures_dir"] = get_figures_dir()
 
         parser_config = ParserConfig(**parser_kwargs)
 
-        self.doc_tool = DocTool(config=parser_config)
+        self.parser_config = parser_config
+        # Parsers by effective ParserConfig, the least recently used ones are dropped
+        # (with their models, unless another parser shares them) past options_cache_size
+        self._doc_tools: OrderedDict[str, Any] = OrderedDict()
+        self._doc_tools_lock = threading.Lock()
+        # Task ids by the id() of their ConvertDocumentsOptions, the figures returned by
+        # a conversion are recorded for the task so /v1/figures only serves them to it
+        self._task_ids: dict[int, str] = {}
+        self.result_cache = ResultCache(
+            max_size=docling_serve_settings.result_cache_size,
+            disk_dir=(
+                get_scratch() / "result_cache"
+                if docling_serve_settings.result_cache_disk
+                else None
+            ),
+        )
         _log.info(
             f"[CustomConverter] Configured with: "
             f"do_ocr={parser_config.do_ocr}, "
@@ -50,40 +106,129 @@ class CustomConverterManager:
             f"layout_batch_size={parser_config.layout_batch_size}, "
             f"table_batch_size={parser_config.table_batch_size}, "
             f"doc_batch_size={parser_config.doc_batch_size}, "
-            f"doc_batch_concurrency={parser_config.doc_batch_concurrency}"
+            f"doc_batch_concurrency={parser_config.doc_batch_concurrency}, "
+            f"adaptive_batching={parser_config.adaptive_batching}"
         )
+        # Startup import-time report, including docling itself unless it was already
+        # imported, the format modules are reported when first loaded
+        _log.info(f"[CustomConverter] Parser imported in {import_seconds:.2f}s")
 
     def clear_cache(self):
-        """Clear any cached converters (no-op for custom implementation)."""
-        _log.debug("[CustomConverter] Cache clear requested (no-op)")
+        """Drop the cached parsers, releasing their models, and the cached conversion results."""
+        with self._doc_tools_lock:
+            doc_tools = list(self._doc_tools.values())
+            self._doc_tools.clear()
+        for doc_tool in doc_tools:
+            doc_tool.close()
+        self.result_cache.clear()
+        _log.debug("[CustomConverter] Parsers and result cache cleared")
+
+    def bind_task(self, task_id: str, options: ConvertDocumentsOptions) -> None:
+        """Attribute the next conversion with these options to the task."""
+        self._task_ids[id(options)] = task_id
+
+    def unbind_task(self, task_id: str) -> None:
+        """Forget a task which was deleted before it ran."""
+        for key, bound_id in list(self._task_ids.items()):
+            if bound_id == task_id:
+                self._task_ids.pop(key, None)
+
+    def _record_figures(self, task_id: Optional[str], custom_doc) -> None:
+        if task_id is None or self.parser_config.figures_dir is None:
+            return
+        get_figure_store().add(
+            task_id, (figure.id for figure in custom_doc.images or [])
+        )
+
+    def get_parser_config(self, options: ConvertDocumentsOptions):
+        """
+        ParserConfig of a request.
+
+        OCR, table structure and picture images enabled on the server can be turned
+        off by the request, so cheap requests get cheaper pipelines; features disabled
+        on the server stay disabled. The image scale is taken from the request.
+        """
+        base = self.parser_config
+        return base.model_copy(
+            update={
+                "do_ocr": base.do_ocr and options.do_ocr,
+                "do_table_structure": base.do_table_structure
+                and options.do_table_structure,
+                "generate_picture_images": base.generate_picture_images
+                and options.include_images,
+                "images_scale": options.images_scale,
+            }
+        )
+
+    def get_doc_tool(self, parser_config):
+        """DocTool of a ParserConfig, from the pool of the last options_cache_size ones."""
+        from docling_serve.docling_test import DocTool
+
+        key = parser_config.model_dump_json()
+        with self._doc_tools_lock:
+            doc_tool = self._doc_tools.get(key)
+            if doc_tool is not None:
+                self._doc_tools.move_to_end(key)
+                return doc_tool
+
+            doc_tool = DocTool(config=parser_config)
+            if self.config.options_cache_size > 0:
+                self._doc_tools[key] = doc_tool
+                while len(self._doc_tools) > self.config.options_cache_size:
+                    _, evicted = self._doc_tools.popitem(last=False)
+                    evicted.close()
+            else:
+                # Not kept, its pools are shut down after the conversion using it
+                doc_tool.close()
+            _log.info(
+                f"[CustomConverter] Created parser with "
+                f"do_ocr={parser_config.do_ocr}, "
+                f"do_table_structure={parser_config.do_table_structure}, "
+                f"generate_picture_images={parser_config.generate_picture_images}, "
+                f"images_scale={parser_config.images_scale} "
+                f"({len(self._doc_tools)} cached)"
+            )
+            return doc_tool
 
     def get_pdf_pipeline_opts(self, request: ConvertDocumentsOptions):
         """
-        Return pipeline options with artifacts_path for compatibility.
+        Return the pipeline options of the custom parser of a request.
         This is called by LocalOrchestrator.warm_up_caches().
         """
-        from docling.document_converter import PdfFormatOption
-        from docling.datamodel.pipeline_options import PdfPipelineOptions
         from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        from docling.document_converter import PdfFormatOption
 
-        _log.debug(f"[CustomConverter] get_pdf_pipeline_opts called (artifacts_path={self.config.artifacts_path})")
+        _log.debug(
+            f"[CustomConverter] get_pdf_pipeline_opts called (artifacts_path={self.config.artifacts_path})"
+        )
+        parser = self.get_doc_tool(self.get_parser_config(request)).parser
         return PdfFormatOption(
-            pipeline_options=PdfPipelineOptions(artifacts_path=self.config.artifacts_path),
-            backend=PyPdfiumDocumentBackend
+            pipeline_cls=parser.pipeline_cls,
+            pipeline_options=parser.pipeline_options,
+            backend=PyPdfiumDocumentBackend,
         )
 
     def get_converter(self, pdf_format_option):
         """
-        Return converter with proper artifacts_path for compatibility.
-        This is called by LocalOrchestrator.warm_up_caches().
+        Return a converter using the shared model registry.
+        This is called by LocalOrchestrator.warm_up_caches(), so the warm-up loads the
+        same models the custom parser uses instead of a separate default pipeline.
         """
-        from docling.document_converter import DocumentConverter
+        import weakref
+
         from docling.datamodel.base_models import InputFormat
+        from docling.document_converter import DocumentConverter
 
-        _log.debug(f"[CustomConverter] get_converter called (using pdf_format_option with artifacts_path)")
-        return DocumentConverter(
+        _log.debug(
+            "[CustomConverter] get_converter called (using the shared model registry)"
+        )
+        converter = DocumentConverter(
             format_options={InputFormat.PDF: pdf_format_option}
         )
+        models_key = model_registry.options_key(pdf_format_option.pipeline_options)
+        model_registry.acquire(models_key, converter)
+        weakref.finalize(converter, model_registry.release, models_key)
+        return converter
 
     def convert_documents(
         self,
@@ -100,38 +245,107 @@ class CustomConverterManager:
         _log.info("[CustomConverter] Starting custom document conversion")
 
         # Convert sources to file_dict format expected by DocTool
-        file_dict = {}
+        task_id = self._task_ids.pop(id(options), None)
+        file_dict: dict[str, BytesIO | Path] = {}
+        cache_keys: dict[str, str] = {}
+        # Content hashes computed for the cache keys, reused by the parser for its
+        # known-bad list instead of hashing the files again
+        content_hashes: dict[str, str] = {}
         source_list = list(sources)
+        parser_config = self.get_parser_config(options)
+        fingerprint = (
+            config_fingerprint(parser_config, options)
+            if self.result_cache.enabled
+            else None
+        )
 
         for source in source_list:
+            value: BytesIO | Path
             if isinstance(source, DocumentStream):
-                # Already a stream - use it directly
-                filename = source.name
-                source.stream.seek(0)
-                file_dict[filename] = BytesIO(source.stream.read())
-            elif isinstance(source, (Path, str)):
-                # File path - read it
+                # Already a stream - hand it over as is, the parser only takes
+                # zero-copy views of its buffer
+                name, value = source.name, source.stream
+            elif isinstance(source, Path | str):
+                # File path - let the parser read it from disk
                 path = Path(source)
-                filename = path.name
-                with open(path, "rb") as f:
-                    file_dict[filename] = BytesIO(f.read())
+                name, value = path.name, path
             else:
-                _log.warning(f"[CustomConverter] Unsupported source type: {type(source)}")
+                _log.warning(
+                    f"[CustomConverter] Unsupported source type: {type(source)}"
+                )
                 continue
 
+            if fingerprint is not None:
+                content_hash = hash_source(
+                    value if isinstance(value, Path) else value.getvalue()
+                )
+                content_hashes[name] = content_hash
+                cache_key = self.result_cache.make_key(content_hash, name, fingerprint)
+                cached_doc = self.result_cache.get(cache_key)
+                if cached_doc is not None and self._restore_figures(cached_doc):
+                    # Cache hit - skip the conversion entirely
+                    _log.info(f"[CustomConverter] Result cache hit for {name}")
+                    self._record_figures(task_id, cached_doc)
+                    yield self._create_conversion_result(cached_doc, options)
+                    continue
+                if cached_doc is not None:
+                    _log.info(
+                        f"[CustomConverter] Figures of the cached {name} are not "
+                        "available, converting it again"
+                    )
+                cache_keys[name] = cache_key
+
+            file_dict[name] = value
+
+        if fingerprint is not None:
+            _log.info(
+                f"[CustomConverter] Result cache stats: {self.result_cache.stats()}"
+            )
+
+        if not file_dict:
+            return
+
         _log.info(f"[CustomConverter] Processing {len(file_dict)} documents")
 
-        # Use custom DocTool to parse
-        custom_results = self.doc_tool.run(file_dict)
+        # Use custom DocTool to parse. Documents are yielded as soon as they are
+        # finalized, so results can be consumed while the batch is still running.
+        custom_results = self.get_doc_tool(parser_config).run_iter(
+            file_dict,
+            page_range=tuple(options.page_range),
+            content_hashes=content_hashes,
+        )
 
         # Convert custom Document objects back to ConversionResult format
         # This is a compatibility layer to match docling's expected output
         for custom_doc in custom_results:
+            doc_cache_key = cache_keys.get(custom_doc.id)
+            # The cache does not keep the figure payloads, documents with figures
+            # are only cached when the figures are spilled to figures_dir
+            if doc_cache_key is not None and (
+                self.parser_config.figures_dir is not None or not custom_doc.images
+            ):
+                self.result_cache.put(doc_cache_key, custom_doc)
+            self._record_figures(task_id, custom_doc)
+
             # Create a mock ConversionResult that wraps our custom output
             # The orchestrator expects ConversionResult objects
             result = self._create_conversion_result(custom_doc, options)
             yield result
 
+        if self.parser_config.adaptive_batching:
+            _log.info(f"[CustomConverter] Adaptive batch sizes: {batch_tuning.stats()}")
+
+    def _restore_figures(self, custom_doc) -> bool:
+        """
+        Point the figures of a cached document to their files, False if some of them
+        were removed with the tasks which returned them, or if there is no figures_dir
+        to read them from.
+        """
+        figures_dir = self.parser_config.figures_dir
+        if figures_dir is None:
+            return not custom_doc.images
+        return all(figure.attach(figures_dir) for figure in custom_doc.images or [])
+
     def _create_conversion_result(self, custom_doc, options: ConvertDocumentsOptions):
         """
         Convert custom Document object to docling's ConversionResult format.
@@ -139,9 +353,13 @@ class CustomConverterManager:
         This creates a compatibility layer between the custom parser output
         and what docling_serve expects.
         """
-        from docling.datamodel.document import ConversionResult, ConversionStatus, InputDocument
-        from docling.datamodel.base_models import InputFormat
         from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.document import (
+            ConversionResult,
+            ConversionStatus,
+            InputDocument,
+        )
         from docling_core.types.doc import DoclingDocument
 
         # Create a wrapper class that overrides export_to_markdown
@@ -166,7 +384,7 @@ class CustomConverterManager:
             limits=None,
         )
         # Manually set the file attribute for compatibility
-        input_doc.file = type('obj', (object,), {'name': custom_doc.id})()
+        input_doc.file = type("obj", (object,), {"name": custom_doc.id})()
 
         # Create conversion result
         result = ConversionResult(
@@ -179,6 +397,8 @@ class CustomConverterManager:
         result._custom_markdown = custom_doc.text
         result._custom_images = custom_doc.images
 
-        _log.info(f"[CustomConverter] Converted {custom_doc.id} with {len(custom_doc.images or [])} images")
+        _log.info(
+            f"[CustomConverter] Converted {custom_doc.id} with {len(custom_doc.images or [])} images"
+        )
 
         return result
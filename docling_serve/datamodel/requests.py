@@ -42,6 +42,11 @@ class TargetName(str, enum.Enum):
     ZIP = ZipTarget().kind
 
 
+class TaskWaitMode(str, enum.Enum):
+    ANY = "any"
+    ALL = "all"
+
+
 ## Aliases
 SourceRequestItem = Annotated[
     FileSourceRequest | HttpSourceRequest | S3SourceRequest, Field(discriminator="kind")
@@ -103,6 +108,36 @@ class BaseChunkDocumentsRequest(BaseModel):
     ] = InBodyTarget()
 
 
+## Status of many tasks
+class TaskStatusBatchRequest(BaseModel):
+    task_ids: Annotated[
+        list[str],
+        Field(
+            min_length=1,
+            max_length=docling_serve_settings.max_status_batch_size,
+            description="Ids of the tasks.",
+        ),
+    ]
+    wait: Annotated[
+        float,
+        Field(
+            ge=0.0,
+            description=(
+                "Number of seconds to wait for completed statuses, "
+                "bounded by the server max sync wait."
+            ),
+        ),
+    ] = 0.0
+    wait_for: Annotated[
+        TaskWaitMode,
+        Field(
+            description=(
+                "Return as soon as any task or only when all the tasks are completed."
+            )
+        ),
+    ] = TaskWaitMode.ALL
+
+
 ChunkingOptT = TypeVar("ChunkingOptT", bound=BaseChunkerOptions)
 
 
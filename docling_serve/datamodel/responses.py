@@ -55,6 +55,11 @@ class TaskStatusResponse(BaseModel):
     task_meta: Optional[TaskProcessingMeta] = None
 
 
+class TaskStatusBatchResponse(BaseModel):
+    tasks: list[TaskStatusResponse]
+    not_found: list[str] = []
+
+
 class MessageKind(str, enum.Enum):
     CONNECTION = "connection"
     UPDATE = "update"
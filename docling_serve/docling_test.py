@@ -1,38 +1,151 @@
+import base64
+import bisect
+import importlib
+import logging
+import re
 import shutil
+import threading
 import time
+import uuid
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Optional, List, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Literal,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 
-from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.datamodel.settings import DEFAULT_PAGE_RANGE, settings
+from docling.pipeline.standard_pdf_pipeline import StandardPdfPipeline
+from docling.utils.locks import pypdfium2_lock
 from docling_core.types.doc.base import ImageRefMode
-from docling_core.types.io import DocumentStream
-from docling.datamodel.settings import settings
 from docling_core.types.doc.document import PictureItem
-from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
-from docling.backend.docling_parse_v4_backend import DoclingParseV4DocumentBackend
+from docling_core.types.io import DocumentStream
 
-from pydantic import BaseModel, Field
+from docling_serve.batch_tuning import BatchSizeController, BatchTuning, batch_tuning
+from docling_serve.markdown_pages import export_markdown_pages
+from docling_serve.model_registry import model_registry
+from docling_serve.result_cache import hash_source
 
-from openpyxl import load_workbook
-from openpyxl.utils import range_boundaries
-from pptx import Presentation
-import pandas as pd
-import re
+_log = logging.getLogger(__name__)
 
 
 class Figure(BaseModel):
-    id: str                         # Image ID for placeholder and figure reference
-    mime_type: str                  # MIME type (e.g., "image/png", "image/jpg")
-    data: str                       # Base64-encoded image data
- 
- 
+    """
+    Extracted figure with a lazily encoded payload.
+
+    The Base64 `data` is only produced when it is accessed (or the model is dumped).
+    Until then the figure keeps the image handle from the document, or the path of
+    the encoded file when figures are spilled to disk.
+    """
+
+    id: str  # Image ID for placeholder and figure reference
+    mime_type: str  # MIME type (e.g., "image/png", "image/jpg")
+
+    _data: Optional[str] = PrivateAttr(default=None)  # Base64-encoded image data
+    _path: Optional[Path] = PrivateAttr(default=None)  # Encoded image spilled to disk
+    _image: Any = PrivateAttr(default=None)  # PIL image not encoded yet
+    _save_kwargs: dict[str, Any] = PrivateAttr(default_factory=dict)  # Encoder options
+    _pending: Optional[Future] = PrivateAttr(default=None)  # Background spill
+
+    def __init__(self, data: Optional[str] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._data = data
+
+    @classmethod
+    def from_image(
+        cls,
+        id: str,
+        image: Any,
+        mime_type: str = "image/png",
+        save_kwargs: Optional[dict[str, Any]] = None,
+    ) -> "Figure":
+        figure = cls(id=id, mime_type=mime_type)
+        figure._image = image
+        figure._save_kwargs = save_kwargs or {}
+        return figure
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def data(self) -> str:
+        """Base64-encoded image data, encoded on first access."""
+        if self._data is None:
+            self._data = base64.b64encode(self.get_bytes()).decode("utf-8")
+            self._image = None
+        return self._data
+
+    def get_bytes(self) -> bytes:
+        """Encoded image bytes."""
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+        if self._path is not None:
+            return self._path.read_bytes()
+        if self._image is not None:
+            return self._encode()
+        if self._data is not None:
+            return base64.b64decode(self._data)
+        raise ValueError(f"Figure {self.id} has no image data.")
+
+    def _encode(self) -> bytes:
+        image = self._image
+        image_format = self.mime_type.split("/")[-1].upper()
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        buffered = BytesIO()
+        image.save(buffered, format=image_format, **self._save_kwargs)
+        return buffered.getvalue()
+
+    def _write(self, figures_dir: Path) -> Path:
+        path = Path(figures_dir) / self.id
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self._image is not None:
+            path.write_bytes(self._encode())
+        elif self._data is not None:
+            path.write_bytes(base64.b64decode(self._data))
+        else:
+            raise ValueError(f"Figure {self.id} has no image data.")
+        self._path = path
+        self._image = None
+        return path
+
+    def attach(self, figures_dir: Path) -> bool:
+        """Use the encoded file of the figure under figures_dir, False if it is missing."""
+        path = Path(figures_dir) / self.id
+        if not path.is_file():
+            return False
+        self._path = path
+        return True
+
+    def spill(self, figures_dir: Path, executor: Optional[Executor] = None) -> None:
+        """
+        Write the encoded image under figures_dir/<id> and release the image handle.
+
+        With an executor the encoding runs in the background; get_bytes() and data
+        wait for it to complete.
+        """
+        if executor is None:
+            self._write(figures_dir)
+        else:
+            self._pending = executor.submit(self._write, figures_dir)
+
+
 class Document(BaseModel):
     id: str
     text: str
-    images: Optional[List[Figure]] = Field(default=None)
+    images: Optional[list[Figure]] = Field(default=None)
 
 
 class ParserConfig(BaseModel):
@@ -48,6 +161,26 @@ class ParserConfig(BaseModel):
         table_batch_size: Batch size for table structure recognition
         doc_batch_size: Number of documents to process in parallel
         doc_batch_concurrency: Maximum concurrent document processing threads
+        markdown_export_workers: Threads used for the per-page markdown export of large documents
+        markdown_parallel_min_pages: Minimum number of pages for a parallel markdown export
+        figures_dir: Directory where encoded figures are stored for retrieval by id
+        figure_format: Image codec used to encode the figures (png, jpeg or webp)
+        figure_compression: Codec compression level, codec default if None
+        figure_encode_workers: Size of the thread pool encoding figures in the background
+        fallback_workers: Number of fallback conversions running in parallel to the primary batch
+        known_bad_path: File persisting the fingerprints of inputs sent directly to the fallback
+        shard_min_pages: Minimum number of pages for splitting a PDF in page ranges, 0 to disable
+        shard_pages: Number of pages per page range
+        shard_workers: Number of page ranges converted in parallel
+        adaptive_batching: Whether the layout and table batch sizes follow the observed
+            batch latency and memory, up to layout_batch_size and table_batch_size
+        adaptive_batch_min_size: Smallest adaptive batch size
+        adaptive_batch_target_seconds: Latency aimed at for each layout or table batch
+        adaptive_batch_max_rss: Process RSS in bytes above which the adaptive batch sizes are halved
+        format_workers: Workers converting each format without models (pptx, xlsx, docx),
+            by format name, the handler default if missing
+        scratch_dir: Directory used to spool large inputs to disk
+        spool_threshold: Minimum input size in bytes for spooling to scratch_dir
     """
 
     do_ocr: bool = False
@@ -64,6 +197,407 @@ class ParserConfig(BaseModel):
     doc_batch_size: int = 4  # Number of documents processed at once
     doc_batch_concurrency: int = 1  # Number of concurrent workers
 
+    # Markdown export: thread pool shared by the pages of very large documents
+    markdown_export_workers: int = 1
+    markdown_parallel_min_pages: int = 200
+
+    # Figures: if set, encoded figures are written to <figures_dir>/<figure id>
+    figures_dir: Optional[Path] = None
+    figure_format: Literal["png", "jpeg", "webp"] = "png"  # Codec used for the figures
+    figure_compression: Optional[int] = (
+        None  # PNG compress_level (0-9), JPEG/WebP quality (1-100)
+    )
+    figure_encode_workers: int = 2  # Threads encoding spilled figures, 0 encodes inline
+
+    # Fallback: files failing with "Invalid code point" are reconverted with PyPdfium
+    fallback_workers: int = 1  # Fallback conversions running next to the primary batch
+    known_bad_path: Optional[Path] = (
+        None  # Persisted fingerprints of files known to need the fallback
+    )
+
+    # Sharding: PDFs with at least shard_min_pages pages are converted in page ranges
+    shard_min_pages: int = 0  # 0 disables the sharding
+    shard_pages: int = 50  # Pages per shard
+    shard_workers: int = 2  # Shards converted in parallel
+
+    # Adaptive batching: layout/table batch sizes between adaptive_batch_min_size and the above
+    adaptive_batching: bool = False
+    adaptive_batch_min_size: int = 1
+    adaptive_batch_target_seconds: float = 10.0
+    adaptive_batch_max_rss: Optional[int] = None  # None: no memory limit
+
+    # Formats without models are converted on their own workers, by format name
+    format_workers: dict[str, int] = Field(default_factory=dict)
+
+    # Input handling
+    scratch_dir: Optional[Path] = (
+        None  # Where large inputs are spooled; None keeps them in memory
+    )
+    spool_threshold: int = (
+        32 * 1024 * 1024
+    )  # Inputs at least this large (bytes) are spooled to disk
+
+
+# Figure codecs: extension, MIME type and the encoder option set by figure_compression
+FIGURE_FORMATS = {
+    "png": ("png", "image/png", "compress_level"),
+    "jpeg": ("jpg", "image/jpeg", "quality"),
+    "webp": ("webp", "image/webp", "quality"),
+}
+
+
+class _BoundedExecutor(Executor):
+    """Thread pool whose submit() blocks once max_pending tasks are queued."""
+
+    def __init__(
+        self, max_workers: int, max_pending: int, thread_name_prefix: str = ""
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True, **kwargs) -> None:
+        self._executor.shutdown(wait=wait, **kwargs)
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_ws(s: str) -> str:
+    """Collapse whitespace runs to a single space, for whitespace-insensitive matching."""
+    return _WHITESPACE_RE.sub(" ", s).strip()
+
+
+class _NormalizedText:
+    """
+    Text with its whitespace-normalized form, computed once.
+
+    contains(needle, start) is equivalent to needle in _normalize_ws(text[start:]) for
+    a normalized needle, without normalizing the remaining text again.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        parts = []
+        # Offset in the normalized text of the first original offset of every segment
+        self._starts = []
+        self._norm_starts = []
+        pos = 0
+        norm_len = 0
+        for match in _WHITESPACE_RE.finditer(text):
+            if match.start() > pos:
+                self._starts.append(pos)
+                self._norm_starts.append(norm_len)
+                parts.append(text[pos : match.start()])
+                norm_len += match.start() - pos
+            self._starts.append(match.start())
+            self._norm_starts.append(norm_len)
+            parts.append(" ")
+            norm_len += 1
+            pos = match.end()
+        if pos < len(text):
+            self._starts.append(pos)
+            self._norm_starts.append(norm_len)
+            parts.append(text[pos:])
+            norm_len += len(text) - pos
+        self.normalized = "".join(parts)
+        self._whitespace = {
+            start for start, part in zip(self._starts, parts) if part == " "
+        }
+
+    def to_normalized(self, offset: int) -> int:
+        """Offset in the normalized text where text[offset:] starts."""
+        if offset >= len(self.text):
+            return len(self.normalized)
+        i = bisect.bisect_right(self._starts, offset) - 1
+        start = self._starts[i]
+        if start in self._whitespace:
+            # Inside a whitespace run: the rest of the run still collapses to one space
+            return self._norm_starts[i]
+        return self._norm_starts[i] + offset - start
+
+    def contains(self, needle: str, start: int) -> bool:
+        return self.normalized.find(needle, self.to_normalized(start)) != -1
+
+
+class _SlideTextIndex:
+    """
+    Text shapes of a slide with their vertical extents, computed once.
+
+    The shapes are kept sorted by bottom and by top edge, so the closest text
+    above or below a chart is found with a binary search. Among shapes at the same
+    distance, the first one in slide order wins.
+    """
+
+    def __init__(self, shapes):
+        entries = []
+        for order, other in enumerate(shapes):
+            if not other.has_text_frame:
+                continue
+            text_content = other.text_frame.text.strip()
+            if not text_content:
+                continue
+            entries.append((other.top, other.top + other.height, order, text_content))
+
+        by_bottom = sorted(entries, key=lambda e: (e[1], e[2]))
+        self._bottoms = [e[1] for e in by_bottom]
+        self._bottom_texts = [e[3] for e in by_bottom]
+        by_top = sorted(entries, key=lambda e: (e[0], e[2]))
+        self._tops = [e[0] for e in by_top]
+        self._top_texts = [e[3] for e in by_top]
+
+    def above(self, top: int) -> str:
+        """Text of the shape ending closest above top, or an empty string."""
+        i = bisect.bisect_left(self._bottoms, top)
+        if i == 0:
+            return ""
+        return self._bottom_texts[
+            bisect.bisect_left(self._bottoms, self._bottoms[i - 1])
+        ]
+
+    def below(self, bottom: int) -> str:
+        """Text of the shape starting closest below bottom, or an empty string."""
+        i = bisect.bisect_right(self._tops, bottom)
+        if i == len(self._tops):
+            return ""
+        return self._top_texts[i]
+
+
+class _PresentationCache:
+    """
+    Presentations parsed by the PPTX backend, by document hash, until the parser
+    extracts their charts. Bounded, so the entries of conversions which never get
+    finalized are evicted.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: str, presentation) -> None:
+        with self._lock:
+            self._entries[key] = presentation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str):
+        with self._lock:
+            return self._entries.pop(key, None)
+
+
+_parsed_presentations = _PresentationCache()
+
+
+@lru_cache
+def _chart_powerpoint_backend() -> type:
+    """
+    Docling PPTX backend handing its parsed package over to the chart extraction,
+    so each deck is opened once per conversion. Defined on first use, the backend
+    imports python-pptx.
+    """
+    from docling.backend.mspowerpoint_backend import MsPowerpointDocumentBackend
+
+    class _ChartPowerpointBackend(MsPowerpointDocumentBackend):
+        def convert(self):
+            doc = super().convert()
+            # python-pptx loads every part on open, the package outlives the stream
+            if self.pptx_obj is not None:
+                _parsed_presentations.put(self.document_hash, self.pptx_obj)
+            return doc
+
+    return _ChartPowerpointBackend
+
+
+class FormatHandler(NamedTuple):
+    """
+    Processing of one document format by DoclingParser.
+
+    Attributes:
+        name: Format name, also the key of ParserConfig.format_workers
+        extensions: File extensions of the format
+        process: Called with (parser, docling document, file key, original file,
+            deck parsed by the PPTX backend), returns (markdown, figures)
+        modules: Modules needed beyond docling itself, imported with the first file
+            of the format so that deployments not using it never load them
+        model_backed: Converted in the primary batch with the layout and table models,
+            otherwise converted and post-processed on the format's own workers
+        max_workers: Number of workers of the format unless set in ParserConfig.format_workers
+        needs_file: The original file is read by process (charts, sheet names)
+    """
+
+    name: str
+    extensions: tuple[str, ...]
+    process: Callable[..., tuple[str, list[Figure]]]
+    modules: tuple[str, ...] = ()
+    model_backed: bool = False
+    max_workers: int = 2
+    needs_file: bool = False
+
+
+# Format handlers by extension
+_FORMAT_HANDLERS: dict[str, FormatHandler] = {}
+
+
+def register_format_handler(handler: FormatHandler) -> None:
+    """Register a handler for its extensions, replacing their previous handlers."""
+    for ext in handler.extensions:
+        _FORMAT_HANDLERS[ext.lower()] = handler
+
+
+register_format_handler(
+    FormatHandler(
+        name="pdf",
+        extensions=(".pdf",),
+        process=lambda parser,
+        doc,
+        file_key,
+        file_obj,
+        presentation: parser._process_pdf_document(doc, file_key, file_obj),
+        model_backed=True,
+    )
+)
+register_format_handler(
+    FormatHandler(
+        name="image",
+        extensions=(".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".webp"),
+        process=lambda parser,
+        doc,
+        file_key,
+        file_obj,
+        presentation: parser._process_docx_document(doc, file_key),
+        model_backed=True,
+    )
+)
+register_format_handler(
+    FormatHandler(
+        name="pptx",
+        extensions=(".pptx", ".ppt"),
+        process=lambda parser,
+        doc,
+        file_key,
+        file_obj,
+        presentation: parser._process_pptx_document(
+            doc, file_key, file_obj, presentation
+        ),
+        modules=("pptx", "docling_serve.chart_table"),
+        needs_file=True,
+    )
+)
+register_format_handler(
+    FormatHandler(
+        name="xlsx",
+        extensions=(".xlsx", ".xls", ".xlsm"),
+        process=lambda parser,
+        doc,
+        file_key,
+        file_obj,
+        presentation: parser._process_excel_document(doc, file_key, file_obj),
+        modules=(
+            "openpyxl.utils",
+            "docling_serve.xlsx_stream",
+            "docling_serve.chart_table",
+        ),
+        needs_file=True,
+    )
+)
+register_format_handler(
+    FormatHandler(
+        name="docx",
+        extensions=(".docx", ".doc"),
+        process=lambda parser,
+        doc,
+        file_key,
+        file_obj,
+        presentation: parser._process_docx_document(doc, file_key),
+    )
+)
+
+
+def _format_handler(filename: str) -> FormatHandler:
+    """Handler of a file, other formats are exported as a single linear document."""
+    return _FORMAT_HANDLERS.get(
+        Path(filename).suffix.lower(), _FORMAT_HANDLERS[".docx"]
+    )
+
+
+# Seconds spent importing each lazily loaded format module
+_import_times: dict[str, float] = {}
+_import_lock = threading.Lock()
+
+
+def _load_format_modules(handler: FormatHandler) -> None:
+    """Import the modules needed by a format handler on first use, timing each import."""
+    for name in handler.modules:
+        if name in _import_times:
+            continue
+        with _import_lock:
+            if name in _import_times:
+                continue
+            start = time.perf_counter()
+            importlib.import_module(name)
+            _import_times[name] = time.perf_counter() - start
+        print(
+            f"[Info] Loaded {name} for {handler.name} files in {_import_times[name]:.2f}s"
+        )
+
+
+class _TimedStageModel:
+    """Model of a pipeline stage reporting each batch to its batch size controller."""
+
+    def __init__(self, stage, model, controller: BatchSizeController):
+        self._stage = stage
+        self._model = model
+        self._controller = controller
+
+    def __call__(self, conv_res, pages):
+        start = time.perf_counter()
+        processed = list(self._model(conv_res, pages))
+        # The stage thread reads its batch size before every batch
+        self._stage.batch_size = self._controller.observe(
+            len(pages), time.perf_counter() - start
+        )
+        return processed
+
+
+class _AdaptivePdfPipeline(StandardPdfPipeline):
+    """
+    Standard PDF pipeline whose layout and table stages use the adaptive batch sizes
+    configured for its options, if any.
+    """
+
+    def __init__(self, pipeline_options):
+        super().__init__(pipeline_options)
+        self._tuning_key = model_registry.options_key(pipeline_options)
+
+    def _create_run_ctx(self):
+        ctx = super()._create_run_ctx()
+        controllers = batch_tuning.controllers(self._tuning_key)
+        for stage in ctx.stages:
+            controller = controllers.get(stage.name)
+            if controller is not None:
+                stage.batch_size = controller.size
+                stage.model = _TimedStageModel(stage, stage.model, controller)
+        return ctx
+
+
+# The layout and table stages are only exposed by the threaded StandardPdfPipeline of
+# the recent docling releases, older ones run the pipeline without _create_run_ctx
+_ADAPTIVE_BATCHING_SUPPORTED = hasattr(StandardPdfPipeline, "_create_run_ctx")
+
+
 class DoclingParser:
     """
     Document parser that converts various formats to Markdown using Docling library.
@@ -82,19 +616,39 @@ class DoclingParser:
             config: Parser configuration. If None, uses default ParserConfig
         """
 
+        # The converters import the backends of every format supported by docling,
+        # python-pptx and openpyxl included, so they are only loaded with a parser
+        from docling.backend.docling_parse_v4_backend import (
+            DoclingParseV4DocumentBackend,
+        )
+        from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        from docling.document_converter import (
+            DocumentConverter,
+            PdfFormatOption,
+            PowerpointFormatOption,
+        )
+
         self.config = config or ParserConfig()
 
         settings.perf.doc_batch_size = self.config.doc_batch_size
         settings.perf.doc_batch_concurrency = self.config.doc_batch_concurrency
         pipeline_options = self._create_pipeline_options(self.config)
+        self.pipeline_options = pipeline_options
+        # Also the pipeline of the warm-up converter, a different class would load the models again
+        self.pipeline_cls = _AdaptivePdfPipeline
 
         # Primary converter with DoclingParseV4DocumentBackend (faster, but may fail on some PDFs)
         self.converter = DocumentConverter(
             format_options={
                 InputFormat.PDF: PdfFormatOption(
+                    pipeline_cls=self.pipeline_cls,
                     pipeline_options=pipeline_options,
-                    backend=DoclingParseV4DocumentBackend
-                )
+                    backend=DoclingParseV4DocumentBackend,
+                ),
+                # Keeps the parsed deck for the chart extraction
+                InputFormat.PPTX: PowerpointFormatOption(
+                    backend=_chart_powerpoint_backend()
+                ),
             }
         )
 
@@ -102,12 +656,121 @@ class DoclingParser:
         self.fallback_converter = DocumentConverter(
             format_options={
                 InputFormat.PDF: PdfFormatOption(
+                    pipeline_cls=self.pipeline_cls,
                     pipeline_options=pipeline_options,
-                    backend=PyPdfiumDocumentBackend
+                    backend=PyPdfiumDocumentBackend,
                 )
             }
         )
 
+        # Both converters use the process-wide pipeline cache, so the layout and TableFormer
+        # models are loaded once for every parser sharing these pipeline options
+        self._models_key = model_registry.options_key(pipeline_options)
+        model_registry.acquire(
+            self._models_key, self.converter, self.fallback_converter
+        )
+        weakref.finalize(self, model_registry.release, self._models_key)
+
+        # Layout and table batch sizes adjusted by the pipelines after every batch
+        if self.config.adaptive_batching and not _ADAPTIVE_BATCHING_SUPPORTED:
+            _log.warning(
+                "Adaptive batching needs the threaded StandardPdfPipeline of a newer "
+                "docling release, the layout and table batch sizes stay fixed"
+            )
+        elif self.config.adaptive_batching:
+            batch_tuning.configure(
+                self._models_key,
+                {
+                    "layout": self.config.layout_batch_size,
+                    "table": self.config.table_batch_size,
+                },
+                BatchTuning(
+                    min_size=self.config.adaptive_batch_min_size,
+                    target_seconds=self.config.adaptive_batch_target_seconds,
+                    max_rss=self.config.adaptive_batch_max_rss,
+                ),
+            )
+
+        # Fingerprints of the files failing with "Invalid code point" on the primary backend
+        self._known_bad = self._load_known_bad()
+        self._known_bad_lock = threading.Lock()
+
+        # Workers converting and post-processing the formats without models, one pool
+        # per format created with its first file
+        self._format_executors: dict[str, ThreadPoolExecutor] = {}
+        self._format_executors_lock = threading.Lock()
+
+        # The worker pools are shut down by close() once no conversion runs, and
+        # created again if a conversion starts on a closed parser
+        self._usage_lock = threading.Lock()
+        self._active = 0
+        self._closed = False
+        self._create_executors()
+
+    def _create_executors(self) -> None:
+        # Fallback conversions run on their own worker next to the primary batch
+        self._fallback_executor = ThreadPoolExecutor(
+            max_workers=max(1, self.config.fallback_workers),
+            thread_name_prefix="pdf-fallback",
+        )
+
+        # Workers converting the page ranges of large PDFs
+        self._shard_executor: Optional[ThreadPoolExecutor] = None
+        if self.config.shard_min_pages > 0:
+            self._shard_executor = ThreadPoolExecutor(
+                max_workers=max(1, self.config.shard_workers),
+                thread_name_prefix="pdf-shard",
+            )
+
+        # Bounded pool encoding the spilled figures off the conversion loop
+        self._figure_executor: Optional[Executor] = None
+        if self.config.figure_encode_workers > 0:
+            self._figure_executor = _BoundedExecutor(
+                max_workers=self.config.figure_encode_workers,
+                max_pending=self.config.figure_encode_workers * 8,
+                thread_name_prefix="figure-encode",
+            )
+        self._executors_open = True
+
+    def _shutdown_executors(self) -> None:
+        """Shut down the worker pools, the work already submitted still completes."""
+        with self._format_executors_lock:
+            executors: list[Optional[Executor]] = [*self._format_executors.values()]
+            self._format_executors.clear()
+        executors += [
+            self._fallback_executor,
+            self._shard_executor,
+            self._figure_executor,
+        ]
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False)
+        self._executors_open = False
+
+    def close(self) -> None:
+        """
+        Release the worker pools of the parser.
+
+        Conversions running when the parser is closed keep their pools until they
+        finish, the models are released with the parser itself.
+        """
+        with self._usage_lock:
+            self._closed = True
+            if self._active == 0 and self._executors_open:
+                self._shutdown_executors()
+
+    def _begin_conversion(self) -> None:
+        with self._usage_lock:
+            self._active += 1
+            if not self._executors_open:
+                self._create_executors()
+
+    def _end_conversion(self) -> None:
+        with self._usage_lock:
+            self._active -= 1
+            if self._closed and self._active == 0 and self._executors_open:
+                self._shutdown_executors()
+
     @staticmethod
     def _create_pipeline_options(config: ParserConfig) -> PdfPipelineOptions:
         """
@@ -121,7 +784,8 @@ class DoclingParser:
         """
         # Get artifacts path from environment or use default
         import os
-        artifacts_path = os.getenv('DOCLING_SERVE_ARTIFACTS_PATH')
+
+        artifacts_path = os.getenv("DOCLING_SERVE_ARTIFACTS_PATH")
         if artifacts_path:
             artifacts_path = Path(artifacts_path)
 
@@ -141,30 +805,91 @@ class DoclingParser:
         return options
 
     def _input_streams(
-        self, 
-        file_dict: Dict[str, BytesIO]
-    ) -> Tuple[List[DocumentStream], Dict[str, bytes]]:
-        """file_dict -> DocumentStream"""
-        doc_streams = []
-        raw_bytes_map = {}
+        self, file_dict: dict[str, Union[BytesIO, Path]]
+    ) -> tuple[
+        list[Union[DocumentStream, Path]], dict[str, Union[bytes, Path]], list[Path]
+    ]:
+        """
+        file_dict -> Docling sources, keeping a single buffer per file.
+
+        In-memory files are read once with getvalue(), which shares the BytesIO
+        buffer instead of copying it, and every consumer (Docling, the fallback
+        converter, chart extraction) gets a cheap BytesIO view over those bytes.
+        Files larger than config.spool_threshold are written once to the scratch
+        directory and passed to Docling by path, so the backends read them from
+        disk rather than from another in-memory copy. Their BytesIO is emptied
+        once spooled, so the upload buffer is not kept alive by the task for the
+        rest of the conversion.
+
+        Returns:
+            Tuple of (docling sources, raw source per filename, spooled paths)
+        """
+        doc_sources: list[Union[DocumentStream, Path]] = []
+        raw_sources: dict[str, Union[bytes, Path]] = {}
+        spooled: list[Path] = []
 
         for filename, stream in file_dict.items():
-            stream.seek(0)
-            
-            file_bytes = stream.read() 
-            
-            raw_bytes_map[filename] = file_bytes
-            
-            doc_streams.append(
-                DocumentStream(name=filename, stream=BytesIO(file_bytes))
-            )
-            
-        return doc_streams, raw_bytes_map
+            if isinstance(stream, Path):
+                raw_sources[filename] = stream
+                doc_sources.append(stream)
+                continue
+
+            file_bytes = stream.getvalue()
+
+            scratch_dir = self.config.scratch_dir
+            if (
+                scratch_dir is not None
+                and len(file_bytes) >= self.config.spool_threshold
+            ):
+                spool_path = self._spool_to_scratch(scratch_dir, filename, file_bytes)
+                stream.seek(0)
+                stream.truncate()
+                spooled.append(spool_path)
+                raw_sources[filename] = spool_path
+                doc_sources.append(spool_path)
+            else:
+                raw_sources[filename] = file_bytes
+                doc_sources.append(
+                    DocumentStream(name=filename, stream=BytesIO(file_bytes))
+                )
+
+        return doc_sources, raw_sources, spooled
+
+    @staticmethod
+    def _spool_to_scratch(scratch_dir: Path, filename: str, file_bytes: bytes) -> Path:
+        """Write a large input once under scratch_dir, keeping its original filename."""
+        spool_dir = Path(scratch_dir) / "spool" / uuid.uuid4().hex
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        spool_path = spool_dir / Path(filename).name
+        spool_path.write_bytes(file_bytes)
+        return spool_path
+
+    @staticmethod
+    def _release_spooled(spool_path: Path) -> None:
+        shutil.rmtree(spool_path.parent, ignore_errors=True)
+
+    @staticmethod
+    def _as_docling_source(
+        filename: str, raw: Union[bytes, Path]
+    ) -> Union[DocumentStream, Path]:
+        if isinstance(raw, Path):
+            return raw
+        return DocumentStream(name=filename, stream=BytesIO(raw))
+
+    @staticmethod
+    def _open_raw_source(raw: Union[bytes, Path, None]) -> Optional[BinaryIO]:
+        """Rewindable handle over a raw source (view for bytes, file handle for paths)."""
+        if raw is None:
+            return None
+        if isinstance(raw, Path):
+            return open(raw, "rb")
+        return BytesIO(raw)
 
     def parse(
         self,
-        file_dict: Dict[str, BytesIO],
-    ) -> List[Document]:
+        file_dict: dict[str, Union[BytesIO, Path]],
+        page_range: Optional[tuple[int, int]] = None,
+    ) -> list[Document]:
         """
         Parse multiple document files to Markdown format with image extraction in batch.
 
@@ -177,177 +902,614 @@ class DoclingParser:
 
         Args:
             file_dict: Dictionary mapping filenames (with extensions) to BytesIO file objects
+                or paths of files already on disk
+            page_range: Pages (1-based, inclusive) converted of the PDFs and images, all if None
 
         Returns:
-            Dictionary mapping filenames to their converted markdown text content
+            List of Document objects, one per successfully converted file
         """
-        # Prepare input streams
-        doc_streams, raw_bytes_map = self._input_streams(file_dict)
         results_map = {}
+        for doc_obj in self.parse_iter(file_dict, page_range):
+            results_map[doc_obj.id] = doc_obj
+        return list(results_map.values())
+
+    def parse_iter(
+        self,
+        file_dict: dict[str, Union[BytesIO, Path]],
+        page_range: Optional[tuple[int, int]] = None,
+        content_hashes: Optional[dict[str, str]] = None,
+    ) -> Iterator[Document]:
+        """
+        Generator variant of parse().
+
+        Yields each Document as soon as it is finalized, while the remaining files
+        of the batch are still being converted. The raw bytes of a file are released
+        once its result has been produced.
+
+        Args:
+            file_dict: Dictionary mapping filenames (with extensions) to BytesIO file objects
+                or paths of files already on disk
+            page_range: Pages (1-based, inclusive) converted of the PDFs and images, all if None
+            content_hashes: SHA-256 of the files already computed by the caller (see
+                result_cache.hash_source), by filename, the other files are hashed here
+
+        Yields:
+            Document objects in completion order
+        """
+        self._begin_conversion()
+        try:
+            # Prepare input streams
+            doc_sources, raw_sources, spooled = self._input_streams(file_dict)
+
+            try:
+                yield from self._convert_sources(
+                    doc_sources,
+                    raw_sources,
+                    page_range or DEFAULT_PAGE_RANGE,
+                    content_hashes,
+                )
+            finally:
+                for spool_path in spooled:
+                    self._release_spooled(spool_path)
+        finally:
+            self._end_conversion()
 
+    def _convert_sources(
+        self,
+        doc_sources: list[Union[DocumentStream, Path]],
+        raw_sources: dict[str, Union[bytes, Path]],
+        page_range: tuple[int, int] = DEFAULT_PAGE_RANGE,
+        content_hashes: Optional[dict[str, str]] = None,
+    ) -> Iterator[Document]:
         print("[Info] Starting Batch Conversion...")
 
-        # Execute primary batch conversion
-        # raises_on_error = False : the iterator yields failure results instead of crashing.
-        primary_iter = self.converter.convert_all(doc_streams, raises_on_error=False)
+        # Fallback conversions and files of the formats without models running next to
+        # the primary batch, by filename
+        pending: dict[Future, str] = {}
+
+        # Page-range shards of the large PDFs, by filename
+        sharded: dict[str, list[Future]] = {}
+
+        # Large PDFs are split in page ranges converted in parallel, files known to
+        # fail on the primary backend go straight to the fallback
+        primary_sources = []
+        fingerprints = dict(content_hashes or {})
+        for source in doc_sources:
+            filename = source.name
+            handler = _format_handler(filename)
+            if not handler.model_backed:
+                # A burst of office files does not hold up the layout and table inference
+                # of the primary batch
+                pending[
+                    self._format_executor(handler).submit(
+                        self._run_format, source, raw_sources
+                    )
+                ] = filename
+                continue
+            raw = raw_sources.get(filename)
+            if raw is not None and handler.name == "pdf":
+                fingerprints[filename] = fingerprints.get(filename) or hash_source(raw)
+                shards = self._page_shards(filename, raw, page_range)
+                if shards and self._shard_executor is not None:
+                    print(
+                        f"[Info] Splitting {filename} into {len(shards)} page ranges..."
+                    )
+                    sharded[filename] = [
+                        self._shard_executor.submit(
+                            self._convert_shard,
+                            filename,
+                            raw,
+                            shard,
+                            fingerprints[filename],
+                        )
+                        for shard in shards
+                    ]
+                    continue
+                if fingerprints[filename] in self._known_bad:
+                    print(
+                        f"[Fallback] {filename} is known to fail, using PyPdfiumBackend directly..."
+                    )
+                    pending[
+                        self._fallback_executor.submit(
+                            self._run_fallback, filename, raw_sources, page_range
+                        )
+                    ] = filename
+                    continue
+            primary_sources.append(source)
+
+        try:
+            # Execute primary batch conversion
+            # raises_on_error = False : the iterator yields failure results instead of crashing.
+            primary_iter = (
+                self.converter.convert_all(
+                    primary_sources, raises_on_error=False, page_range=page_range
+                )
+                if primary_sources
+                else iter(())
+            )
+
+            for result in primary_iter:
+                filename = result.input.file.name
+
+                # Primary conversion successful
+                if result.status.name == "SUCCESS":
+                    doc_obj = self._finalize_result(result, filename, raw_sources)
+                    raw_sources.pop(filename, None)
+                    if doc_obj is not None:
+                        yield doc_obj
+
+                else:
+                    # Primary failed -> Analyze errors
+                    print(f"[Warning] Primary conversion failed for {filename}.")
+
+                    # Check for "Invalid code point" error.
+                    is_target_error = False
+                    for err in result.errors:
+                        if "Invalid code point" in str(err.error_message):
+                            is_target_error = True
+                            break
+
+                    # Queue the fallback, the primary batch keeps going meanwhile
+                    if is_target_error:
+                        print(f"[Fallback] queueing PyPdfiumBackend for {filename}...")
+                        raw = raw_sources.get(filename)
+                        fingerprint = fingerprints.get(filename)
+                        if fingerprint is None and raw is not None:
+                            fingerprint = hash_source(raw)
+                        if fingerprint is not None:
+                            self._remember_known_bad(fingerprint)
+                        pending[
+                            self._fallback_executor.submit(
+                                self._run_fallback, filename, raw_sources, page_range
+                            )
+                        ] = filename
+
+                    # Non-recoverable error
+                    else:
+                        print(
+                            f"[Failure] {filename} failed with non-recoverable error."
+                        )
+                        raw_sources.pop(filename, None)
+
+                # Emit the fallbacks and sharded files completed in the meantime
+                yield from self._collect_pending(pending, raw_sources, block=False)
+                yield from self._collect_sharded(sharded, raw_sources, block=False)
+
+            yield from self._collect_pending(pending, raw_sources, block=True)
+            yield from self._collect_sharded(sharded, raw_sources, block=True)
+
+        finally:
+            # Closed early: drop the queued conversions before the inputs are released
+            queued = list(pending) + [
+                f for futures in sharded.values() for f in futures
+            ]
+            for future in queued:
+                future.cancel()
+            wait(queued)
+
+    def _run_fallback(
+        self,
+        filename: str,
+        raw_sources: dict[str, Union[bytes, Path]],
+        page_range: tuple[int, int] = DEFAULT_PAGE_RANGE,
+    ) -> Optional[Document]:
+        """Convert a single file with the PyPdfium fallback converter. Runs on the fallback worker."""
+        try:
+            raw = raw_sources.get(filename)
+            if not raw:
+                print(f"[Error] Bytes missing for {filename}")
+                return None
+
+            retry_source = self._as_docling_source(filename, raw)
+
+            # Run fallback converter on the single file
+            fallback_iter = self.fallback_converter.convert_all(
+                [retry_source], raises_on_error=False, page_range=page_range
+            )
+            retry_result = next(fallback_iter)
+
+            if retry_result.status.name == "SUCCESS":
+                print(f"[Fallback Success] Recovered {filename}")
+                return self._finalize_result(retry_result, filename, raw_sources)
+
+            print(f"[Fallback Failed] {filename} failed again.")
+            for e in retry_result.errors:
+                print(f"   - Error: {e.error_message}")
+
+        except Exception as e:
+            print(f"[Fallback Critical] Error during PyPdfiumBackend: {e}")
+            import traceback
+
+            traceback.print_exc()
+
+        return None
+
+    def _format_executor(self, handler: FormatHandler) -> ThreadPoolExecutor:
+        """Workers of a format, as many as ParserConfig.format_workers or the handler default."""
+        with self._format_executors_lock:
+            executor = self._format_executors.get(handler.name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max(
+                        1,
+                        self.config.format_workers.get(
+                            handler.name, handler.max_workers
+                        ),
+                    ),
+                    thread_name_prefix=f"{handler.name}-format",
+                )
+                self._format_executors[handler.name] = executor
+            return executor
 
-        for result in primary_iter:
-            filename = result.input.file.name
-            
-            # Primary conversion successful
+    def _run_format(
+        self,
+        source: Union[DocumentStream, Path],
+        raw_sources: dict[str, Union[bytes, Path]],
+    ) -> Optional[Document]:
+        """Convert and finalize a single file of a format without models. Runs on the format's workers."""
+        filename = source.name
+        try:
+            result = self.converter.convert(source, raises_on_error=False)
             if result.status.name == "SUCCESS":
-                self._finalize_result(result, filename, raw_bytes_map, results_map)
-                continue
+                return self._finalize_result(result, filename, raw_sources)
+
+            print(f"[Failure] {filename} failed with non-recoverable error.")
+            for e in result.errors:
+                print(f"   - Error: {e.error_message}")
+
+        except Exception as e:
+            print(f"[Error] Converting {filename}: {e}")
+            import traceback
 
-            # Primary failed -> Analyze errors
-            print(f"[Warning] Primary conversion failed for {filename}.")
-            
-            # Check for "Invalid code point" error.
-            is_target_error = False
-            for err in result.errors:
-                if "Invalid code point" in str(err.error_message):
-                    is_target_error = True
-                    break
-            
-            # Trigger immediate fallback if critical error detected
-            if is_target_error:
-                print(f"[Fallback] triggering PyPdfiumBackend for {filename}...")
-                
+            traceback.print_exc()
+
+        return None
+
+    @staticmethod
+    def _collect_pending(
+        pending: dict[Future, str],
+        raw_sources: dict[str, Union[bytes, Path]],
+        block: bool,
+    ) -> Iterator[Document]:
+        """Yield the documents of the finished pending conversions, waiting for all of them if block."""
+        finished: Iterable[Future]
+        if block:
+            finished = as_completed(list(pending))
+        else:
+            finished = [future for future in list(pending) if future.done()]
+
+        for future in finished:
+            filename = pending.pop(future)
+            raw_sources.pop(filename, None)
+            doc_obj = future.result()
+            if doc_obj is not None:
+                yield doc_obj
+
+    def _page_shards(
+        self,
+        filename: str,
+        raw: Union[bytes, Path],
+        page_range: tuple[int, int] = DEFAULT_PAGE_RANGE,
+    ) -> list[tuple[int, int]]:
+        """
+        Page ranges (1-based, inclusive) of the converted pages of a PDF large enough
+        to be split, else [].
+
+        Only the page count is read here. Each shard worker cuts the PDF of its own
+        range, so at most shard_workers shards are held in memory and the
+        conversion of the other files does not wait for the cutting.
+        """
+        if self._shard_executor is None:
+            return []
+        try:
+            import pypdfium2 as pdfium
+
+            with pypdfium2_lock:
+                pdf = pdfium.PdfDocument(raw)
                 try:
-                    file_bytes = raw_bytes_map.get(filename)
-                    if not file_bytes:
-                        print(f"[Error] Bytes missing for {filename}")
-                        continue
+                    num_pages = len(pdf)
+                    first, last = max(1, page_range[0]), min(num_pages, page_range[1])
+                    if last - first + 1 < self.config.shard_min_pages:
+                        return []
+                    size = max(1, self.config.shard_pages)
+                    return [
+                        (start, min(start + size - 1, last))
+                        for start in range(first, last + 1, size)
+                    ]
+                finally:
+                    pdf.close()
+        except Exception as e:
+            print(f"[Warning] Could not split the pages of {filename}: {e}")
+            return []
 
-                    retry_stream = DocumentStream(name=filename, stream=BytesIO(file_bytes))
+    @staticmethod
+    def _extract_pages(raw: Union[bytes, Path], start: int, end: int) -> bytes:
+        """PDF of the pages start..end (1-based, inclusive) of a PDF file."""
+        import pypdfium2 as pdfium
 
-                    # Run fallback converter on the single file
-                    fallback_iter = self.fallback_converter.convert_all([retry_stream], raises_on_error=False)
-                    retry_result = next(fallback_iter)
+        with pypdfium2_lock:
+            pdf = pdfium.PdfDocument(raw)
+            shard = pdfium.PdfDocument.new()
+            try:
+                shard.import_pages(pdf, pages=list(range(start - 1, end)))
+                buffer = BytesIO()
+                shard.save(buffer)
+                return buffer.getvalue()
+            finally:
+                shard.close()
+                pdf.close()
+
+    def _convert_shard(
+        self,
+        filename: str,
+        raw: Union[bytes, Path],
+        page_range: tuple[int, int],
+        fingerprint: str,
+    ) -> Optional[tuple[str, list[Figure]]]:
+        """
+        Cut the PDF of a page range and convert it to (markdown, figures), numbered as
+        the pages of the whole file. Runs on the shard workers.
+        """
+        start, end = page_range
+        try:
+            shard_pdf = self._extract_pages(raw, start, end)
+            result = None
+            if fingerprint not in self._known_bad:
+                result = self.converter.convert(
+                    self._as_docling_source(filename, shard_pdf),
+                    raises_on_error=False,
+                )
+                if result.status.name != "SUCCESS":
+                    if not any(
+                        "Invalid code point" in str(err.error_message)
+                        for err in result.errors
+                    ):
+                        print(
+                            f"[Failure] Pages {start}-{end} of {filename} failed with non-recoverable error."
+                        )
+                        return None
+                    self._remember_known_bad(fingerprint)
+                    result = None
+
+            if result is None:
+                print(
+                    f"[Fallback] PyPdfiumBackend for pages {start}-{end} of {filename}..."
+                )
+                result = self.fallback_converter.convert(
+                    self._as_docling_source(filename, shard_pdf),
+                    raises_on_error=False,
+                )
+                if result.status.name != "SUCCESS":
+                    print(
+                        f"[Fallback Failed] Pages {start}-{end} of {filename} failed again."
+                    )
+                    for e in result.errors:
+                        print(f"   - Error: {e.error_message}")
+                    return None
+
+            return self._process_pdf_document(
+                result.document,
+                self._figure_key(filename, fingerprint),
+                None,
+                pages=range(1, end - start + 2),
+                page_offset=start - 1,
+            )
 
-                    if retry_result.status.name == "SUCCESS":
-                        print(f"[Fallback Success] Recovered {filename}")
-                        self._finalize_result(retry_result, filename, raw_bytes_map, results_map)
-                    else:
-                        print(f"[Fallback Failed] {filename} failed again.")
-                        for e in retry_result.errors:
-                            print(f"   - Error: {e.error_message}")
-
-                except Exception as e:
-                    print(f"[Fallback Critical] Error during PyPdfiumBackend: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            # Non-recoverable error
-            else:
-                print(f"[Failure] {filename} failed with non-recoverable error.")
+        except Exception as e:
+            print(f"[Error] Converting pages {start}-{end} of {filename}: {e}")
+            import traceback
 
-        return list(results_map.values())
+            traceback.print_exc()
+            return None
+
+    @staticmethod
+    def _collect_sharded(
+        sharded: dict[str, list[Future]],
+        raw_sources: dict[str, Union[bytes, Path]],
+        block: bool,
+    ) -> Iterator[Document]:
+        """Merge in page order the files whose shards are all done, waiting for them if block."""
+        for filename in list(sharded):
+            futures = sharded[filename]
+            if not block and not all(future.done() for future in futures):
+                continue
+            del sharded[filename]
+            parts = [future.result() for future in futures]
+            raw_sources.pop(filename, None)
+
+            failed = sum(part is None for part in parts)
+            if failed:
+                _log.error(
+                    f"Dropping {filename}: {failed} of its {len(parts)} page ranges "
+                    "failed to convert"
+                )
+                continue
 
-    def _finalize_result(self, result, filename, raw_bytes_map, results_map):
+            figures = [figure for _, shard_figures in parts for figure in shard_figures]
+            print(f"[Completed] {filename} (Extracted {len(figures)} images)")
+            yield Document(
+                id=filename,
+                text="".join(text for text, _ in parts).strip(),
+                images=figures,
+            )
+
+    def _load_known_bad(self) -> set:
+        path = self.config.known_bad_path
+        if path is None or not path.exists():
+            return set()
+        try:
+            return set(path.read_text().split())
+        except OSError as e:
+            print(f"[Warning] Could not read known-bad list {path}: {e}")
+            return set()
+
+    def _remember_known_bad(self, fingerprint: str) -> None:
+        """Record a file failing on the primary backend, so the next runs skip it."""
+        with self._known_bad_lock:
+            if fingerprint in self._known_bad:
+                return
+            self._known_bad.add(fingerprint)
+            path = self.config.known_bad_path
+            if path is None:
+                return
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a") as f:
+                    f.write(f"{fingerprint}\n")
+            except OSError as e:
+                print(f"[Warning] Could not update known-bad list {path}: {e}")
+
+    def _finalize_result(self, result, filename, raw_sources) -> Optional[Document]:
+        file_obj = None
         try:
-            # Prepare file object for formats that need it
-            file_obj = None
-            ext = Path(filename).suffix.lower()
-            if ext in ['.pptx', '.ppt', '.xlsx', '.xls', '.xlsm']:
-                file_bytes = raw_bytes_map.get(filename)
-                if file_bytes:
-                    file_obj = BytesIO(file_bytes)
+            # Prepare file object for formats that need it, decks already parsed
+            # by the PPTX backend are reused instead of being opened again
+            handler = _format_handler(filename)
+            presentation = None
+            if handler.name == "pptx":
+                presentation = _parsed_presentations.pop(result.input.document_hash)
+            if handler.needs_file and presentation is None:
+                file_obj = self._open_raw_source(raw_sources.get(filename))
 
             # Extract markdown text and figures
             markdown_text, figures = self._convert_to_document_content(
                 doc=result.document,
                 display_name=filename,
-                file_obj=file_obj
+                file_obj=file_obj,
+                presentation=presentation,
+                content_hash=result.input.document_hash,
             )
 
-            # Create Document object and store in results map
-            doc_obj = Document(
-                id=filename,
-                text=markdown_text,
-                images=figures
-            )
+            # Create Document object
+            doc_obj = Document(id=filename, text=markdown_text, images=figures)
 
-            results_map[filename] = doc_obj
-            
             print(f"[Completed] {filename} (Extracted {len(figures)} images)")
+            return doc_obj
 
         except Exception as e:
             print(f"[Error] Finalizing {filename}: {e}")
             import traceback
+
             traceback.print_exc()
+            return None
+
+        finally:
+            if file_obj is not None:
+                file_obj.close()
+
+    def _extract_figures_and_patch_doc(
+        self, doc, file_key: str, page_offset: int = 0
+    ) -> list[Figure]:
+        ext, mime_type, compression_option = FIGURE_FORMATS[self.config.figure_format]
+        save_kwargs = {}
+        if self.config.figure_compression is not None:
+            save_kwargs[compression_option] = self.config.figure_compression
 
-    def _extract_figures_and_patch_doc(self, doc, file_key: str) -> List[Figure]:
         figures = []
         for item, _ in doc.iterate_items():
             if isinstance(item, PictureItem):
                 img = item.get_image(doc=doc)
                 if img:
                     # Generate unique image ID
-                    page_no = item.prov[0].page_no if item.prov else 0
+                    page_no = item.prov[0].page_no + page_offset if item.prov else 0
                     self_ref = item.self_ref.replace("#/", "").replace("/", "_")
                     if page_no == 0:
-                        img_id = f"{file_key}/images/{self_ref}.png"
+                        img_id = f"{file_key}/images/{self_ref}.{ext}"
                     else:
                         page_no = f"{page_no:04d}"
-                        img_id = f"{file_key}/page_{page_no}/{self_ref}.png"
+                        img_id = f"{file_key}/page_{page_no}/{self_ref}.{ext}"
 
-                    # Create Figure object with Base64 data
-                    figures.append(Figure(
+                    # Create Figure object, the Base64 data is only encoded on demand
+                    figure = Figure.from_image(
                         id=img_id,
-                        mime_type="image/png",
-                        data=item._image_to_base64(img)
-                    ))
+                        image=img,
+                        mime_type=mime_type,
+                        save_kwargs=save_kwargs,
+                    )
+                    if self.config.figures_dir is not None:
+                        # Encoded in the background while the next documents are converted
+                        figure.spill(self.config.figures_dir, self._figure_executor)
+                    figures.append(figure)
 
                     # Patch document object for markdown links
                     item.image.uri = Path(img_id)
         return figures
 
+    def _figure_key(self, display_name: str, content_hash: str) -> str:
+        """
+        Prefix of the figure ids of a file, <content hash>/<file stem> when figures
+        are spilled to figures_dir, the file stem otherwise.
+
+        Spilled figures of files uploaded with the same name but a different content
+        do not overwrite each other.
+        """
+        stem = Path(display_name).stem
+        if self.config.figures_dir is None:
+            return stem
+        return f"{content_hash[:16]}/{stem}"
 
     def _convert_to_document_content(
         self,
         doc,
         display_name: str,
-        file_obj: Optional[BytesIO] = None
-    ) -> Tuple[str, List[Figure]]:
-
-        path_obj = Path(display_name)
-        ext = path_obj.suffix.lower()
-        file_key = path_obj.stem
-
-        # Handlers return (text, figures) tuple
-        handlers = {
-            '.pdf': lambda: self._process_pdf_document(doc, file_key, file_obj),
-            '.pptx': lambda: self._process_pptx_document(doc, file_key, file_obj),
-            '.ppt': lambda: self._process_pptx_document(doc, file_key, file_obj),
-            '.xlsx': lambda: self._process_excel_document(doc, file_key, file_obj),
-            '.xls': lambda: self._process_excel_document(doc, file_key, file_obj),
-            '.xlsm': lambda: self._process_excel_document(doc, file_key, file_obj),
-            '.docx': lambda: self._process_docx_document(doc, file_key),
-            '.doc': lambda: self._process_docx_document(doc, file_key),
-        }
+        file_obj: Optional[BinaryIO] = None,
+        presentation=None,
+        content_hash: str = "",
+    ) -> tuple[str, list[Figure]]:
+        file_key = self._figure_key(display_name, content_hash)
+
+        handler = _format_handler(display_name)
+        _load_format_modules(handler)
+        text, figures = handler.process(self, doc, file_key, file_obj, presentation)
+        return text.strip(), figures
 
-        handler = handlers.get(ext, lambda: self._process_docx_document(doc, file_key))
+    def _export_pages_markdown(
+        self, doc, pages: Optional[range] = None
+    ) -> dict[int, str]:
+        """
+        Export the markdown of every page in a single traversal of the document.
 
-        text, figures = handler()
-        return text.strip(), figures
+        Output is identical to calling doc.export_to_markdown(page_no=...) for each page.
+        """
+        return export_markdown_pages(
+            doc,
+            pages if pages is not None else range(1, doc.num_pages() + 1),
+            image_mode=ImageRefMode.REFERENCED,
+            max_workers=self.config.markdown_export_workers,
+            parallel_min_pages=self.config.markdown_parallel_min_pages,
+        )
+
+    def _process_pdf_document(
+        self,
+        doc,
+        file_key: str,
+        file_obj: BytesIO,
+        pages: Optional[range] = None,
+        page_offset: int = 0,
+    ) -> tuple[str, list[Figure]]:
+        # pages: page numbers to export, default all the converted pages, which start
+        # at the first page of the requested range
+        # page_offset: added to the page numbers of a shard to number them as the
+        # pages of the whole file
+        if pages is None:
+            first = min(doc.pages, default=1)
+            pages = range(first, first + doc.num_pages())
 
-    def _process_pdf_document(self, doc, file_key: str, file_obj: BytesIO) -> Tuple[str, List[Figure]]:
         # Extract images and patch document
-        all_figures = self._extract_figures_and_patch_doc(doc, file_key)
+        all_figures = self._extract_figures_and_patch_doc(doc, file_key, page_offset)
 
         markdown_parts = []
         # Generate markdown with REFERENCED mode
-        for page_num in range(1, doc.num_pages() + 1):
-            page_md = doc.export_to_markdown(
-                page_no=page_num, 
-                image_mode=ImageRefMode.REFERENCED
+        pages_md = self._export_pages_markdown(doc, pages)
+        for page_num in pages:
+            page_md = pages_md[page_num]
+            markdown_parts.append(
+                f"\n\n- Page {page_num + page_offset} -\n\n{page_md.strip()}"
             )
-            markdown_parts.append(f"\n\n- Page {page_num} -\n\n{page_md.strip()}")
-            
+
         return "".join(markdown_parts), all_figures
 
-    def _process_docx_document(self, doc, file_key: str) -> Tuple[str, List[Figure]]:
+    def _process_docx_document(self, doc, file_key: str) -> tuple[str, list[Figure]]:
         # Extract images and patch document
         figures = self._extract_figures_and_patch_doc(doc, file_key)
 
@@ -355,39 +1517,41 @@ class DoclingParser:
         text = doc.export_to_markdown(image_mode=ImageRefMode.REFERENCED)
         return text, figures
 
-    def _process_pptx_document(self, doc, file_key: str, file_obj: BytesIO) -> Tuple[str, List[Figure]]:
+    def _process_pptx_document(
+        self, doc, file_key: str, file_obj: BytesIO, presentation=None
+    ) -> tuple[str, list[Figure]]:
         # Extract images and patch document
         all_figures = self._extract_figures_and_patch_doc(doc, file_key)
 
         # Extract charts
-        charts_by_page = self._extract_charts_from_pptx(file_obj)
+        charts_by_page = self._extract_charts_from_pptx(file_obj, presentation)
 
         markdown_parts = []
+        pages_md = self._export_pages_markdown(doc)
         for page_num in range(1, doc.num_pages() + 1):
-            page_text = doc.export_to_markdown(
-                page_no=page_num, 
-                image_mode=ImageRefMode.REFERENCED
-            )
-            
+            page_text = pages_md[page_num]
+
             if page_num in charts_by_page:
-                page_text = self._insert_charts_at_position(page_text, charts_by_page[page_num])
+                page_text = self._insert_charts_at_position(
+                    page_text, charts_by_page[page_num]
+                )
 
             markdown_parts.append(f"\n\n- Slide {page_num} -\n\n{page_text.strip()}")
 
         return "".join(markdown_parts), all_figures
 
-    def _process_excel_document(self, doc, file_key: str, file_obj: BytesIO) -> Tuple[str, List[Figure]]:
+    def _process_excel_document(
+        self, doc, file_key: str, file_obj: BytesIO
+    ) -> tuple[str, list[Figure]]:
         # Extract images and patch document
         all_figures = self._extract_figures_and_patch_doc(doc, file_key)
 
         sheet_names, charts_by_page = self._extract_excel_metadata(file_obj)
         markdown_parts = []
 
+        pages_md = self._export_pages_markdown(doc)
         for page_num in range(1, doc.num_pages() + 1):
-            page_text = doc.export_to_markdown(
-                page_no=page_num,
-                image_mode=ImageRefMode.REFERENCED
-            )
+            page_text = pages_md[page_num]
 
             # Add sheet header
             if (page_num - 1) < len(sheet_names):
@@ -396,7 +1560,9 @@ class DoclingParser:
                 header = f"\n\n- Sheet {page_num} -\n\n"
 
             if page_num in charts_by_page:
-                page_text = self._insert_charts_at_position(page_text, charts_by_page[page_num])
+                page_text = self._insert_charts_at_position(
+                    page_text, charts_by_page[page_num]
+                )
 
             markdown_parts.append(header)
             markdown_parts.append(page_text.strip())
@@ -405,7 +1571,9 @@ class DoclingParser:
 
     # ==================== Chart Insertion and Extraction Methods ====================
 
-    def _find_chart_insert_position(self, text: str, pre_text: str, post_text: str, start_pos: int) -> int:
+    def _find_chart_insert_position(
+        self, text: str, pre_text: str, post_text: str, start_pos: int
+    ) -> int:
         """
         Find optimal position to insert a chart based on surrounding text.
         """
@@ -413,20 +1581,17 @@ class DoclingParser:
             return -1
 
         search_text = text[start_pos:]
-        
-        def normalize(s):  # Normalize whitespace for comparison
-            return re.sub(r'\s+', ' ', s).strip()
 
-        norm_pre = normalize(pre_text)
-        norm_post = normalize(post_text)
-        norm_search = normalize(search_text)
+        norm_pre = _normalize_ws(pre_text)
+        norm_post = _normalize_ws(post_text)
+        norm_search = _normalize_ws(search_text)
 
         # Try to find position using pre_text
         if norm_pre and norm_pre in norm_search:
             idx = text.find(pre_text, start_pos)
             if idx != -1:
                 return idx + len(pre_text)
-            
+
             short_pre = pre_text[:20]
             idx = text.find(short_pre, start_pos)
             if idx != -1:
@@ -434,24 +1599,29 @@ class DoclingParser:
 
         # Try to find position using post_text
         if norm_post:
-             idx = text.find(post_text, start_pos)
-             if idx != -1:
-                 return idx
+            idx = text.find(post_text, start_pos)
+            if idx != -1:
+                return idx
 
-             short_post = post_text[:20]
-             idx = text.find(short_post, start_pos)
-             if idx != -1:
-                 return idx
+            short_post = post_text[:20]
+            idx = text.find(short_post, start_pos)
+            if idx != -1:
+                return idx
 
         return -1
 
-    def _insert_charts_at_position(self, markdown_text: str, charts: List[Dict[str, str]]) -> str:
+    def _insert_charts_at_position(
+        self, markdown_text: str, charts: list[dict[str, str]]
+    ) -> str:
         """
         Insert charts at their original positions in the markdown text.
 
         Uses context text (pre_text and post_text) to locate the best insertion point.
         Falls back to appending at the end if no matching position is found.
 
+        The page is normalized once and the insertion points are found in a single
+        forward scan of the original text, the result is assembled with one join.
+
         Args:
             markdown_text: Original markdown text from Docling
             charts: List of chart info dicts with pre_text, post_text, title, and table
@@ -459,36 +1629,112 @@ class DoclingParser:
         Returns:
             Modified markdown with charts inserted at appropriate positions
         """
-        result = markdown_text
-        last_pos = 0
+        index = _NormalizedText(markdown_text)
+        pieces = []
+        cursor = 0  # Offset in markdown_text of the text not emitted yet
+        shift = 0  # Length of the charts inserted before cursor
 
-        for chart in charts:
+        for i, chart in enumerate(charts):
             pre_text = chart["pre_text"].strip()
             post_text = chart["post_text"].strip()
             chart_markdown = f"\n# Chart: {chart['title']}\n{chart['table']}\n"
 
             # Find optimal insertion position
-            insert_idx = self._find_chart_insert_position(result, pre_text, post_text, last_pos)
+            insert_idx = self._find_chart_offset(index, pre_text, post_text, cursor)
 
             if insert_idx != -1:
                 # Insert chart at found position
+                pieces.append(markdown_text[cursor:insert_idx])
+                pieces.append(chart_markdown)
+                print(
+                    f"# Chart inserted: {chart['title']} (position: {insert_idx + shift})"
+                )
+                cursor = insert_idx
+                shift += len(chart_markdown)
+            else:
+                # Fallback: append to end. The appended charts are searched too by the
+                # next charts, so the remaining ones go through the string rebuild.
+                pieces.append(markdown_text[cursor:])
+                result = "".join(pieces)
+                last_pos = cursor + shift
+                result += chart_markdown
+                print(
+                    f"# Chart appended: {chart['title']} (no matching position found)"
+                )
+                return self._insert_charts_by_rebuild(result, charts[i + 1 :], last_pos)
+
+        pieces.append(markdown_text[cursor:])
+        return "".join(pieces)
+
+    def _find_chart_offset(
+        self, index: "_NormalizedText", pre_text: str, post_text: str, start_pos: int
+    ) -> int:
+        """
+        Same as _find_chart_insert_position() on index.text, using the normalized index
+        instead of normalizing the remaining text.
+        """
+        if not pre_text and not post_text:
+            return -1
+
+        text = index.text
+
+        # Try to find position using pre_text
+        norm_pre = _normalize_ws(pre_text)
+        if norm_pre and index.contains(norm_pre, start_pos):
+            idx = text.find(pre_text, start_pos)
+            if idx != -1:
+                return idx + len(pre_text)
+
+            short_pre = pre_text[:20]
+            idx = text.find(short_pre, start_pos)
+            if idx != -1:
+                return idx + len(short_pre)
+
+        # Try to find position using post_text
+        if _normalize_ws(post_text):
+            idx = text.find(post_text, start_pos)
+            if idx != -1:
+                return idx
+
+            short_post = post_text[:20]
+            idx = text.find(short_post, start_pos)
+            if idx != -1:
+                return idx
+
+        return -1
+
+    def _insert_charts_by_rebuild(
+        self, result: str, charts: list[dict[str, str]], last_pos: int
+    ) -> str:
+        """Insert charts by rebuilding the string, used once a chart was appended to the end."""
+        for chart in charts:
+            pre_text = chart["pre_text"].strip()
+            post_text = chart["post_text"].strip()
+            chart_markdown = f"\n# Chart: {chart['title']}\n{chart['table']}\n"
+
+            insert_idx = self._find_chart_insert_position(
+                result, pre_text, post_text, last_pos
+            )
+
+            if insert_idx != -1:
                 result = result[:insert_idx] + chart_markdown + result[insert_idx:]
                 last_pos = insert_idx + len(chart_markdown)
                 print(f"# Chart inserted: {chart['title']} (position: {insert_idx})")
             else:
-                # Fallback: append to end
                 result += chart_markdown
-                print(f"# Chart appended: {chart['title']} (no matching position found)")
+                print(
+                    f"# Chart appended: {chart['title']} (no matching position found)"
+                )
 
         return result
 
-    def _get_chart_context(self, shape, all_shapes) -> Tuple[str, str]:
+    def _get_chart_context(self, shape, text_index: _SlideTextIndex) -> tuple[str, str]:
         """
         Find the closest text above and below a chart.
 
         Args:
             shape: Chart shape object
-            all_shapes: List of all shapes in the slide
+            text_index: Index of the text shapes of the slide
 
         Returns:
             Tuple of (text_above, text_below)
@@ -496,47 +1742,23 @@ class DoclingParser:
         chart_top = shape.top
         chart_bottom = shape.top + shape.height
 
-        text_above = []
-        text_below = []
-
-        for other in all_shapes:
-            # Skip if it's the chart itself or has no text
-            if other == shape or not other.has_text_frame:
-                continue
-
-            text_content = other.text_frame.text.strip()
-            if not text_content:
-                continue
-
-            other_top = other.top
-            other_bottom = other.top + other.height
-
-            # Text above the chart
-            if other_bottom < chart_top:
-                distance = chart_top - other_bottom
-                text_above.append((distance, text_content))
-
-            # Text below the chart
-            elif other_top > chart_bottom:
-                distance = other_top - chart_bottom
-                text_below.append((distance, text_content))
-
-        # Sort by distance (closest first)
-        text_above.sort(key=lambda x: x[0])
-        text_below.sort(key=lambda x: x[0])
-
-        # Return closest text (empty string if none found)
-        context_pre = text_above[0][1] if text_above else ""
-        context_post = text_below[0][1] if text_below else ""
+        # Closest text ending above the chart and starting below it
+        # (empty string if none found)
+        context_pre = text_index.above(chart_top)
+        context_post = text_index.below(chart_bottom)
 
         return context_pre, context_post
 
-    def _extract_charts_from_pptx(self, file_obj: BytesIO) -> Dict[int, List[Dict[str, str]]]:
+    def _extract_charts_from_pptx(
+        self, file_obj: BytesIO, presentation=None
+    ) -> dict[int, list[dict[str, str]]]:
         """
         Extract charts from PPTX file and convert to markdown format.
 
         Args:
             file_obj: BytesIO object containing PPTX file
+            presentation: Presentation already parsed by the PPTX backend, file_obj is
+                only opened if None
 
         Returns:
             Dictionary mapping page numbers to list of chart info dicts with keys:
@@ -545,15 +1767,23 @@ class DoclingParser:
                 - post_text: Text below the chart
                 - table: Markdown table of chart data
         """
+        from pptx import Presentation
+
+        from docling_serve.chart_table import render_chart_table
+
         charts_by_page = {}
 
         try:
-            file_obj.seek(0)
-            prs = Presentation(file_obj)
+            if presentation is not None:
+                prs = presentation
+            else:
+                file_obj.seek(0)
+                prs = Presentation(file_obj)
 
             for slide_idx, slide in enumerate(prs.slides):
                 page_num = slide_idx + 1
-                all_shapes = list(slide.shapes)
+                # Built with the first chart of the slide
+                text_index = None
 
                 for shape in slide.shapes:
                     if shape.has_chart:
@@ -562,35 +1792,44 @@ class DoclingParser:
                         # Extract chart title
                         try:
                             title = chart.chart_title.text_frame.text
-                        except:
+                        except Exception:
                             title = "no title"
 
                         # Find context text above and below
-                        pre_text, post_text = self._get_chart_context(shape, all_shapes)
+                        if text_index is None:
+                            text_index = _SlideTextIndex(slide.shapes)
+                        pre_text, post_text = self._get_chart_context(shape, text_index)
 
                         # Extract chart data and convert to markdown table
                         try:
-                            df = pd.DataFrame()
                             plot = chart.plots[0]
                             cats = [c.label for c in plot.categories]
 
                             # Generate categories if none exist
                             if not cats:
-                                cats = [f"Item {i}" for i in range(len(plot.series[0].values))]
+                                cats = [
+                                    f"Item {i}"
+                                    for i in range(len(plot.series[0].values))
+                                ]
 
-                            df.index = cats
+                            data_dict = {}
                             for ser in plot.series:
-                                df[ser.name] = pd.Series(ser.values, index=cats)
-                            md_table = df.to_markdown()
+                                values = list(ser.values)
+                                if len(values) != len(cats):
+                                    raise ValueError(
+                                        f"Length of values ({len(values)}) does not match length of index ({len(cats)})"
+                                    )
+                                data_dict[ser.name] = values
+                            md_table = render_chart_table(cats, data_dict)
                         except Exception as e:
-                            md_table = f"(fail to extract data: {str(e)})"
+                            md_table = f"(fail to extract data: {e!s})"
 
                         # Store chart info
                         chart_info = {
                             "title": title,
                             "pre_text": pre_text,
                             "post_text": post_text,
-                            "table": md_table
+                            "table": md_table,
                         }
 
                         # Add to page's chart list
@@ -601,16 +1840,18 @@ class DoclingParser:
             return charts_by_page
 
         except Exception as e:
-            print(f"Error extracting charts from PPTX: {str(e)}")
+            print(f"Error extracting charts from PPTX: {e!s}")
             return {}
 
     # ==================== Excel Metadata Extraction Methods ====================
 
-    def _extract_excel_metadata(self, file_obj: BytesIO) -> Tuple[List[str], Dict[int, List[Dict[str, str]]]]:
+    def _extract_excel_metadata(
+        self, file_obj: BytesIO
+    ) -> tuple[list[str], dict[int, list[dict[str, str]]]]:
         """
         Extract sheet names AND charts from Excel file in a single pass.
 
-        Opens the Excel file ONCE and extracts all necessary metadata:
+        Opens the Excel file ONCE in streaming mode and extracts all necessary metadata:
         - Sheet names for headers
         - Chart data with position context
 
@@ -622,14 +1863,24 @@ class DoclingParser:
                 - sheet_names: List of sheet names in order
                 - charts_by_page: Dictionary mapping page numbers (sheet numbers) to list of chart info dicts
         """
+        from docling_serve.xlsx_stream import StreamingWorkbook
+
         sheet_names = []
         charts_by_page = {}
 
+        wb = None
         try:
             file_obj.seek(0)
-            # data_only=True: Get calculated values instead of formulas
-            wb = load_workbook(file_obj, data_only=True)
+            # Streams the chart parts and the referenced cells instead of loading every cell,
+            # values are the calculated ones as with load_workbook(data_only=True)
+            wb = StreamingWorkbook(file_obj)
             sheet_names = wb.sheetnames
+            # Read every range the charts reference with one pass per sheet,
+            # ranges which are not prefetched are still read on demand
+            try:
+                wb.prefetch(self._excel_chart_ranges(wb))
+            except Exception as e:
+                print(f"Error prefetching Excel chart data: {e}")
 
             for page_idx, sheet_name in enumerate(sheet_names):
                 sheet = wb[sheet_name]
@@ -649,11 +1900,13 @@ class DoclingParser:
                     try:
                         if chart.title:
                             # Title entered directly
-                            if hasattr(chart.title, 'tx') and chart.title.tx.rich:
+                            if hasattr(chart.title, "tx") and chart.title.tx.rich:
                                 title = chart.title.tx.rich.p[0].r[0].t
                             # Title referencing a cell
-                            elif hasattr(chart.title, 'tx') and chart.title.tx.strRef:
-                                ref_vals = self._get_values_from_ref(wb, chart.title.tx.strRef.f)
+                            elif hasattr(chart.title, "tx") and chart.title.tx.strRef:
+                                ref_vals = self._get_values_from_ref(
+                                    wb, chart.title.tx.strRef.f
+                                )
                                 if ref_vals:
                                     title = ref_vals[0]
                     except Exception:
@@ -665,12 +1918,14 @@ class DoclingParser:
                     # Extract chart data and convert to markdown
                     md_table = self._resolve_excel_chart_data(wb, chart)
 
-                    page_charts.append({
-                        "title": title,
-                        "pre_text": pre_text,
-                        "post_text": post_text,
-                        "table": md_table
-                    })
+                    page_charts.append(
+                        {
+                            "title": title,
+                            "pre_text": pre_text,
+                            "post_text": post_text,
+                            "table": md_table,
+                        }
+                    )
 
                 if page_charts:
                     charts_by_page[page_num] = page_charts
@@ -678,10 +1933,83 @@ class DoclingParser:
             return sheet_names, charts_by_page
 
         except Exception as e:
-            print(f"Error extracting Excel metadata: {str(e)}")
+            print(f"Error extracting Excel metadata: {e!s}")
             return [], {}
 
-    def _get_chart_context_excel(self, sheet, chart) -> Tuple[str, str]:
+        finally:
+            if wb is not None:
+                wb.close()
+
+    def _excel_chart_ranges(self, wb) -> list[tuple[str, tuple[int, int, int, int]]]:
+        """
+        Collect the cell ranges read for the charts of a workbook: titles, categories,
+        series names and values, and the context cells around each chart.
+
+        Args:
+            wb: Workbook object
+
+        Returns:
+            List of (sheet name, (min_col, min_row, max_col, max_row)) ranges
+        """
+        refs = []
+        ranges: list[tuple[str, tuple[int, int, int, int]]] = []
+        for sheet_name in wb.sheetnames:
+            sheet = wb[sheet_name]
+            charts = getattr(sheet, "charts", []) or getattr(sheet, "_charts", [])
+            for chart in charts:
+                refs.extend(self._chart_refs(chart))
+                ranges.extend(
+                    (sheet_name, rect) for rect in self._chart_context_cells(chart)
+                )
+
+        for ref_str in refs:
+            try:
+                parsed = self._parse_ref(wb, ref_str)
+            except Exception:
+                continue
+            if parsed is not None:
+                ranges.append(parsed)
+        return ranges
+
+    def _chart_refs(self, chart) -> list[str]:
+        """Cell references of the title, categories, series names and values of a chart."""
+        refs = []
+        try:
+            if chart.title and chart.title.tx.strRef:
+                refs.append(chart.title.tx.strRef.f)
+        except Exception:
+            pass
+
+        for idx, series in enumerate(chart.series):
+            if idx == 0:
+                cat_ref = self._chart_category_ref(series)
+                if cat_ref:
+                    refs.append(cat_ref)
+            try:
+                if series.title and series.title.tx.strRef:
+                    refs.append(series.title.tx.strRef.f)
+            except Exception:
+                pass
+            if series.val and series.val.numRef:
+                refs.append(series.val.numRef.f)
+        return refs
+
+    @staticmethod
+    def _chart_context_cells(chart) -> list[tuple[int, int, int, int]]:
+        """Cells read by _get_chart_context_excel() above and below a chart."""
+        cells = []
+        try:
+            anchor = chart.anchor
+            col = anchor._from.col + 1
+            if anchor._from.row > 0:
+                cells.append((col, anchor._from.row, col, anchor._from.row))
+            row = anchor.to.row + 2
+            cells.append((col, row, col, row))
+        except Exception:
+            pass  # No position info or OneCellAnchor
+        return cells
+
+    def _get_chart_context_excel(self, sheet, chart) -> tuple[str, str]:
         """
         Extract text above and below a chart in Excel.
 
@@ -697,7 +2025,7 @@ class DoclingParser:
         try:
             # Get anchor information (TwoCellAnchor recommended)
             anchor = chart.anchor
-            if hasattr(anchor, '_from'):
+            if hasattr(anchor, "_from"):
                 row_start = anchor._from.row
                 col_start = anchor._from.col
 
@@ -715,10 +2043,48 @@ class DoclingParser:
 
         return pre_text.strip(), post_text.strip()
 
+    @staticmethod
+    def _chart_category_ref(series) -> Optional[str]:
+        """Cell reference of the categories of a series, string (strRef) or numeric (numRef)."""
+        if not (hasattr(series, "cat") and series.cat):
+            return None
+        if hasattr(series.cat, "strRef") and series.cat.strRef:
+            return series.cat.strRef.f
+        if hasattr(series.cat, "numRef") and series.cat.numRef:
+            return series.cat.numRef.f
+        return None
+
+    def _chart_series_name(self, wb, series) -> Optional[str]:
+        """Name of a series from its rich text title or its title cell reference."""
+        if not series.title or not hasattr(series.title, "tx"):
+            return None
+        if hasattr(series.title.tx, "rich"):
+            p_list = getattr(series.title.tx.rich, "p", [])
+            if p_list:
+                r_list = getattr(p_list[0], "r", [])
+                if r_list:
+                    return r_list[0].t
+        elif hasattr(series.title.tx, "strRef"):
+            ref_vals = self._get_values_from_ref(wb, series.title.tx.strRef.f)
+            if ref_vals:
+                return str(ref_vals[0])
+        return None
+
+    @staticmethod
+    def _fit_chart_categories(categories: list[Any], length: int) -> list[Any]:
+        """Categories auto-generated if missing, padded or cut if their length mismatches."""
+        if categories and len(categories) == length:
+            return categories
+        categories = [str(i) for i in categories]
+        if len(categories) < length:
+            categories.extend([f"Item {i + 1}" for i in range(len(categories), length)])
+            return categories
+        return categories[:length]
+
     def _resolve_excel_chart_data(self, wb, chart) -> str:
         """
         Parse cell references from chart object and convert actual data
-        from Pandas DataFrame to Markdown format.
+        to Markdown table format.
 
         Args:
             wb: Workbook object
@@ -727,6 +2093,8 @@ class DoclingParser:
         Returns:
             Markdown table string
         """
+        from docling_serve.chart_table import render_chart_table
+
         try:
             data_dict = {}
             categories = []
@@ -734,16 +2102,8 @@ class DoclingParser:
             # Get X-axis (category) data
             # Usually use first series category reference as common X-axis
             if len(chart.series) > 0:
-                cat_ref = None
                 try:
-                    # Check string reference (strRef) or numeric reference (numRef)
-                    first_series = chart.series[0]
-                    if hasattr(first_series, 'cat') and first_series.cat:
-                        if hasattr(first_series.cat, 'strRef') and first_series.cat.strRef:
-                            cat_ref = first_series.cat.strRef.f
-                        elif hasattr(first_series.cat, 'numRef') and first_series.cat.numRef:
-                            cat_ref = first_series.cat.numRef.f
-                    
+                    cat_ref = self._chart_category_ref(chart.series[0])
                     if cat_ref:
                         categories = self._get_values_from_ref(wb, cat_ref)
                 except Exception:
@@ -752,28 +2112,17 @@ class DoclingParser:
             # Get Y-axis (series values) data
             for idx, series in enumerate(chart.series):
                 # Series name extract
-                series_name = f"Series {idx+1}" 
+                series_name = f"Series {idx + 1}"
                 try:
-                    if series.title:
-                        if hasattr(series.title, 'tx') and hasattr(series.title.tx, 'rich'):
-                            p_list = getattr(series.title.tx.rich, 'p', [])
-                            if p_list:
-                                r_list = getattr(p_list[0], 'r', [])
-                                if r_list:
-                                    series_name = r_list[0].t
-                        
-                        elif hasattr(series.title, 'tx') and hasattr(series.title.tx, 'strRef'):
-                            ref_vals = self._get_values_from_ref(wb, series.title.tx.strRef.f)
-                            if ref_vals:
-                                series_name = str(ref_vals[0])
+                    series_name = self._chart_series_name(wb, series) or series_name
                 except Exception:
-                    pass 
+                    pass
 
                 # Actual data values
                 vals = []
                 try:
                     if series.val:
-                        if hasattr(series.val, 'numRef') and series.val.numRef:
+                        if hasattr(series.val, "numRef") and series.val.numRef:
                             vals = self._get_values_from_ref(wb, series.val.numRef.f)
                 except Exception:
                     pass
@@ -781,34 +2130,25 @@ class DoclingParser:
                 if vals:
                     data_dict[series_name] = vals
 
-            # Convert to Markdown via Pandas
+            # Convert to Markdown
             if not data_dict:
                 return "(No chart data reference found)"
 
             # Match data lengths (based on longest data)
             max_len = max(len(v) for v in data_dict.values())
 
-            # Auto-generate categories if missing or length mismatch
-            if not categories or len(categories) != max_len:
-                categories = [str(i) for i in categories]
-                if len(categories) < max_len:
-                    categories.extend([f"Item {i+1}" for i in range(len(categories), max_len)])
-                else:
-                    categories = categories[:max_len]
+            categories = self._fit_chart_categories(categories, max_len)
 
             for k, v in data_dict.items():
                 if len(v) < max_len:
                     data_dict[k] = list(v) + [""] * (max_len - len(v))
 
-            # Create DataFrame
-            df = pd.DataFrame(data_dict, index=categories[:max_len])
-
-            return df.to_markdown()
+            return render_chart_table(categories[:max_len], data_dict)
 
         except Exception as e:
-            return f"(Error parsing chart data: {str(e)})"
+            return f"(Error parsing chart data: {e!s})"
 
-    def _get_values_from_ref(self, wb, ref_str: str) -> List[Any]:
+    def _get_values_from_ref(self, wb, ref_str: str) -> list[Any]:
         """
         Parse reference string like 'Sheet1!$A$1:$A$5' and return actual values.
 
@@ -820,40 +2160,22 @@ class DoclingParser:
             List of cell values
         """
         try:
-            if "!" not in ref_str:
+            parsed = self._parse_ref(wb, ref_str)
+            if parsed is None:
                 return []
-
-            sheet_part, cell_part = ref_str.rsplit("!", 1)
-            # Remove quotes from sheet name ('Sheet 1' -> Sheet 1)
-            sheet_name = sheet_part
-            if sheet_name.startswith("'") and sheet_name.endswith("'"):
-                sheet_name = sheet_name[1:-1]
-                sheet_name = sheet_name.replace("''", "'")
-
-            if sheet_name not in wb.sheetnames:
-                found = False
-                for s in wb.sheetnames:
-                    if s.lower() == sheet_name.lower():
-                        sheet_name = s
-                        found = True
-                        break
-                if not found:
-                    return []
-
+            sheet_name, (min_col, min_row, max_col, max_row) = parsed
             sheet = wb[sheet_name]
 
-            # Parse range 
-            try:
-                min_col, min_row, max_col, max_row = range_boundaries(cell_part)
-            except ValueError:
-                return []
-
             values = []
 
             # Read cell values in range order
-            for row in sheet.iter_rows(min_row=min_row, max_row=max_row,
-                                       min_col=min_col, max_col=max_col,
-                                       values_only=True):
+            for row in sheet.iter_rows(
+                min_row=min_row,
+                max_row=max_row,
+                min_col=min_col,
+                max_col=max_col,
+                values_only=True,
+            ):
                 for cell in row:
                     # Handle None values (empty cells as 0 or empty string)
                     val = cell if cell is not None else ""
@@ -865,6 +2187,45 @@ class DoclingParser:
             print(f"Error parsing reference ({ref_str}): {e}")
             return []
 
+    def _parse_ref(
+        self, wb, ref_str: str
+    ) -> Optional[tuple[str, tuple[int, int, int, int]]]:
+        """
+        Split a reference string like 'Sheet1!$A$1:$A$5' into the sheet name and the
+        range boundaries.
+
+        Args:
+            wb: Workbook object
+            ref_str: Cell reference string
+
+        Returns:
+            Tuple of (sheet_name, (min_col, min_row, max_col, max_row)), or None if
+            the reference has no sheet, an unknown sheet or an invalid range
+        """
+        if "!" not in ref_str:
+            return None
+
+        sheet_part, cell_part = ref_str.rsplit("!", 1)
+        # Remove quotes from sheet name ('Sheet 1' -> Sheet 1)
+        sheet_name = sheet_part
+        if sheet_name.startswith("'") and sheet_name.endswith("'"):
+            sheet_name = sheet_name[1:-1]
+            sheet_name = sheet_name.replace("''", "'")
+
+        # Exact name first, then a case-insensitive match
+        sheet_name = wb.resolve_sheet_name(sheet_name)
+        if sheet_name is None:
+            return None
+
+        from openpyxl.utils import range_boundaries
+
+        # Parse range
+        try:
+            return sheet_name, range_boundaries(cell_part)
+        except ValueError:
+            return None
+
+
 class DocTool:
     """
     High-level document processing tool with simplified interface.
@@ -886,18 +2247,51 @@ class DocTool:
 
         self._parser = DoclingParser(config=config)
 
-    def run(self, file_dict: Dict[str, BytesIO]) -> List[Document]:
+    @property
+    def parser(self) -> DoclingParser:
+        """The underlying DoclingParser."""
+        return self._parser
+
+    def run(
+        self,
+        file_dict: dict[str, Union[BytesIO, Path]],
+        page_range: Optional[tuple[int, int]] = None,
+    ) -> list[Document]:
         """
         Process multiple documents to Markdown format in batch.
 
         Args:
             file_dict: Dictionary mapping filenames (with extensions) to BytesIO file objects
+            page_range: Pages (1-based, inclusive) converted of the PDFs and images, all if None
 
         Returns:
            a list of Document objects.
         """
         # Pass all files at once for batch processing
-        return self._parser.parse(file_dict)
+        return self._parser.parse(file_dict, page_range)
+
+    def run_iter(
+        self,
+        file_dict: dict[str, Union[BytesIO, Path]],
+        page_range: Optional[tuple[int, int]] = None,
+        content_hashes: Optional[dict[str, str]] = None,
+    ) -> Iterator[Document]:
+        """
+        Process multiple documents in batch, yielding each result as soon as it is ready.
+
+        Args:
+            file_dict: Dictionary mapping filenames (with extensions) to BytesIO file objects
+            page_range: Pages (1-based, inclusive) converted of the PDFs and images, all if None
+            content_hashes: SHA-256 of the files already computed by the caller, by filename
+
+        Returns:
+           an iterator of Document objects, in completion order.
+        """
+        return self._parser.parse_iter(file_dict, page_range, content_hashes)
+
+    def close(self) -> None:
+        """Shut down the worker pools of the parser once its conversions are done."""
+        self._parser.close()
 
 
 # ex
@@ -905,57 +2299,60 @@ if __name__ == "__main__":
     input_folder = Path("/home/shaush/projects/pdfs")
     output_root = Path("/home/shaush/projects/parsed-outputs-gpu")
     log_file_path = output_root / "parsing_log.txt"
-    
+
     output_root.mkdir(parents=True, exist_ok=True)
-    
+
     file_list = [p.resolve() for p in input_folder.iterdir() if p.is_file()]
     print(f"Found {len(file_list)} files.")
 
     processor = DocTool()
 
-    file_dict = {}
+    file_dict: dict[str, Union[BytesIO, Path]] = {}
     for file_path in file_list:
         with open(file_path, "rb") as f:
             file_dict[file_path.name] = BytesIO(f.read())
-            
+
     print("Processing started... (Logs will be saved to parsing_log.txt)")
     start_time = time.perf_counter()
-    
+
     results = processor.run(file_dict)
-    
+
     total_time = time.perf_counter() - start_time
     print(f"Total parsing time: {total_time:.2f} seconds")
 
     with open(log_file_path, "w", encoding="utf-8") as log_file:
-        log_file.write(f"Batch Processing Report\n")
+        log_file.write("Batch Processing Report\n")
         log_file.write(f"Total Files: {len(results)}\n")
         log_file.write(f"Total Time: {total_time:.2f}s\n")
-        log_file.write("="*50 + "\n")
+        log_file.write("=" * 50 + "\n")
 
         for doc in results:
             filename = doc.id
-            
-            md_content = doc.text 
-            
+
+            md_content = doc.text
+
             save_name = Path(filename).stem + ".md"
             save_path = output_root / save_name
-            
+
             # Markdown 파일 저장
             try:
                 with open(save_path, "w", encoding="utf-8") as f:
                     f.write(md_content)
-                
+
                 log_msg = f"[Success] {filename} | Images extracted: {len(doc.images)}"
-                log_file.write(log_msg + "\n"+ "doc.id: "+ doc.id+ "doc.text"+ doc.text[:30])
+                log_file.write(
+                    log_msg + "\n" + "doc.id: " + doc.id + "doc.text" + doc.text[:30]
+                )
                 doc.id
                 if doc.images:
                     first_img = doc.images[0]
-                    log_file.write(f"   - Sample Image ID: {first_img.id} ({first_img.mime_type}) ({first_img.data[:30]})\n")
+                    log_file.write(
+                        f"   - Sample Image ID: {first_img.id} ({first_img.mime_type}) ({first_img.data[:30]})\n"
+                    )
 
             except Exception as e:
                 err_msg = f"[Failed] {filename}: {e}"
-                print(err_msg) 
+                print(err_msg)
                 log_file.write(err_msg + "\n")
 
     print(f"Done! Results saved in '{output_root}'")
-
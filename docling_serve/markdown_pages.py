@@ -0,0 +1,269 @@
+"""
+Page-partitioned Markdown export.
+
+DoclingDocument.export_to_markdown(page_no=...) walks the whole document tree
+for every page, so exporting an N-page document page by page costs O(N^2).
+export_markdown_pages() produces the same per-page Markdown in a single
+traversal: every top-level node is serialized only for the pages its subtree
+actually touches, with the same serializer parameters export_to_markdown uses.
+"""
+
+import logging
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from pydantic import PrivateAttr
+
+from docling_core.transforms.serializer.markdown import (
+    MarkdownDocSerializer,
+    MarkdownParams,
+)
+from docling_core.types.doc.base import ImageRefMode
+from docling_core.types.doc.document import (
+    DEFAULT_CONTENT_LAYERS,
+    DOCUMENT_TOKENS_EXPORT_LABELS,
+    DocItem,
+    DoclingDocument,
+    FloatingItem,
+    NodeItem,
+)
+
+_log = logging.getLogger(__name__)
+
+
+class _PageExcludedRefs:
+    """Set-like view of the refs excluded for a page selection.
+
+    Equivalent to the set built by DocSerializer.get_excluded_refs(), but shared
+    by all pages: the page-independent exclusions are computed once and the page
+    filter is applied on lookup.
+    """
+
+    __slots__ = ("_base", "_item_pages", "_pages")
+
+    def __init__(
+        self,
+        base: set[str],
+        item_pages: dict[str, Optional[int]],
+        pages: Optional[set[int]],
+    ):
+        self._base = base
+        self._item_pages = item_pages
+        self._pages = pages
+
+    def __contains__(self, ref: object) -> bool:
+        if ref in self._base:
+            return True
+        if self._pages is None or ref not in self._item_pages:
+            return False
+        page_no = self._item_pages[ref]  # type: ignore[index]
+        return page_no is None or page_no not in self._pages
+
+
+class _PagedMarkdownSerializer(MarkdownDocSerializer):
+    _exclusions: dict[str, tuple[set[str], dict[str, Optional[int]]]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def get_excluded_refs(self, **kwargs: Any) -> _PageExcludedRefs:  # type: ignore[override]
+        params = self.params.merge_with_patch(patch=kwargs)
+        key = params.model_dump_json(exclude={"pages"})
+        cached = self._exclusions.get(key)
+        if cached is None:
+            base: set[str] = set()
+            item_pages: dict[str, Optional[int]] = {}
+            for ix, (item, _) in enumerate(
+                self.doc.iterate_items(
+                    with_groups=True,
+                    traverse_pictures=True,
+                    included_content_layers=params.layers,
+                )
+            ):
+                if ix < params.start_idx or ix >= params.stop_idx:
+                    base.add(item.self_ref)
+                elif isinstance(item, DocItem):
+                    if (
+                        item.label not in params.labels
+                        or item.content_layer not in params.layers
+                    ):
+                        base.add(item.self_ref)
+                    else:
+                        item_pages[item.self_ref] = (
+                            item.prov[0].page_no if item.prov else None
+                        )
+            cached = (base, item_pages)
+            self._exclusions[key] = cached
+        return _PageExcludedRefs(cached[0], cached[1], params.pages)
+
+
+def _markdown_params(image_mode: ImageRefMode) -> MarkdownParams:
+    # Same parameters as DoclingDocument.export_to_markdown() with its defaults
+    return MarkdownParams(
+        labels=DOCUMENT_TOKENS_EXPORT_LABELS,
+        layers=DEFAULT_CONTENT_LAYERS,
+        pages=None,
+        start_idx=0,
+        stop_idx=sys.maxsize,
+        escape_html=True,
+        escape_underscores=True,
+        image_placeholder="<!-- image -->",
+        enable_chart_tables=True,
+        image_mode=image_mode,
+        indent=4,
+        wrap_width=None,
+        page_break_placeholder=None,
+        mark_meta=False,
+        include_annotations=True,
+        allowed_meta_names=None,
+        blocked_meta_names=set(),
+        mark_annotations=False,
+    )
+
+
+def _touched_pages(
+    doc: DoclingDocument,
+    node: NodeItem,
+    all_pages: frozenset[int],
+    memo: dict[str, frozenset[int]],
+) -> frozenset[int]:
+    """Pages on which serializing `node` can produce any text."""
+    ref = node.self_ref
+    if ref in memo:
+        return memo[ref]
+    memo[ref] = frozenset()  # guard against reference cycles
+
+    pages: set[int] = set()
+    if isinstance(node, DocItem):
+        if node.prov:
+            pages.add(node.prov[0].page_no)
+        if isinstance(node, FloatingItem):
+            for ref_item in (*node.captions, *node.footnotes, *node.references):
+                pages |= _touched_pages(doc, ref_item.resolve(doc), all_pages, memo)
+    elif node.meta is not None:
+        # Meta of groups is never excluded by the page filter
+        memo[ref] = all_pages
+        return all_pages
+
+    for child in node.children:
+        pages |= _touched_pages(doc, child.resolve(doc), all_pages, memo)
+
+    memo[ref] = frozenset(pages)
+    return memo[ref]
+
+
+def _serialize_pages(
+    doc: DoclingDocument,
+    page_numbers: list[int],
+    image_mode: ImageRefMode,
+) -> dict[int, str]:
+    serializer = _PagedMarkdownSerializer(doc=doc, params=_markdown_params(image_mode))
+    base_params = serializer.params
+
+    requested = frozenset(page_numbers)
+    page_params = {
+        p: base_params.model_copy(update={"pages": {p}}) for p in page_numbers
+    }
+    page_kwargs = {
+        p: {**params.model_dump(), "delim": "\n\n"} for p, params in page_params.items()
+    }
+    visited: dict[int, set[str]] = {p: set() for p in page_numbers}
+    parts: dict[int, list] = {p: [] for p in page_numbers}
+    memo: dict[str, frozenset[int]] = {}
+    all_pages = frozenset(doc.pages.keys()) | requested
+
+    # Same traversal as DocSerializer.get_parts(), shared by all the pages
+    for node, lvl in doc.iterate_items(
+        with_groups=True,
+        included_content_layers=base_params.layers,
+        traverse_pictures=False,
+    ):
+        for page_no in sorted(_touched_pages(doc, node, all_pages, memo) & requested):
+            page_visited = visited[page_no]
+            if node.self_ref in page_visited:
+                continue
+            page_visited.add(node.self_ref)
+
+            # Nested serializers read the page selection from the serializer params
+            serializer.params = page_params[page_no]
+            part = serializer.serialize(
+                item=node,
+                list_level=0,
+                is_inline_scope=False,
+                visited=page_visited,
+                **({"level": lvl} | page_kwargs[page_no]),
+            )
+            if part.text:
+                parts[page_no].append(part)
+
+    pages_md = {}
+    for page_no in page_numbers:
+        serializer.params = page_params[page_no]
+        pages_md[page_no] = serializer.serialize_doc(
+            parts=parts[page_no], **page_kwargs[page_no]
+        ).text
+    serializer.params = base_params
+    return pages_md
+
+
+def export_markdown_pages(
+    doc: DoclingDocument,
+    page_numbers: Iterable[int],
+    image_mode: ImageRefMode = ImageRefMode.PLACEHOLDER,
+    max_workers: int = 1,
+    parallel_min_pages: int = 200,
+) -> dict[int, str]:
+    """
+    Export the Markdown of each page, identical to
+    doc.export_to_markdown(page_no=page_no, image_mode=image_mode).
+
+    Args:
+        doc: Document to export
+        page_numbers: Page numbers to export
+        image_mode: Image reference mode used for pictures
+        max_workers: Number of threads sharing the pages of large documents
+        parallel_min_pages: Minimum number of pages for using the thread pool
+
+    Returns:
+        Dictionary mapping page numbers to their Markdown
+    """
+    page_numbers = list(page_numbers)
+    if not page_numbers:
+        return {}
+
+    if doc.body.meta is not None:
+        # The meta of the body is serialized on every page, which the single pass
+        # does not reproduce
+        return _export_page_by_page(doc, page_numbers, image_mode)
+
+    try:
+        if max_workers <= 1 or len(page_numbers) < parallel_min_pages:
+            return _serialize_pages(doc, page_numbers, image_mode)
+
+        # Every thread walks the tree once for its own contiguous range of pages
+        chunk_size = -(-len(page_numbers) // max_workers)
+        chunks = [
+            page_numbers[i : i + chunk_size]
+            for i in range(0, len(page_numbers), chunk_size)
+        ]
+        pages_md: dict[int, str] = {}
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            for chunk_md in executor.map(
+                lambda chunk: _serialize_pages(doc, chunk, image_mode), chunks
+            ):
+                pages_md.update(chunk_md)
+        return pages_md
+
+    except Exception as e:
+        _log.warning(f"Single-pass page export failed, exporting page by page: {e}")
+        return _export_page_by_page(doc, page_numbers, image_mode)
+
+
+def _export_page_by_page(
+    doc: DoclingDocument, page_numbers: list[int], image_mode: ImageRefMode
+) -> dict[int, str]:
+    return {
+        page_no: doc.export_to_markdown(page_no=page_no, image_mode=image_mode)
+        for page_no in page_numbers
+    }
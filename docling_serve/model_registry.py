@@ -0,0 +1,94 @@
+"""
+Process-wide registry of the Docling pipelines (and the models they load).
+
+A DocumentConverter caches its pipelines in `initialized_pipelines`, keyed by
+pipeline class and options hash. The backend is not part of the key, so the
+converters of a parser (DoclingParseV4 primary, PyPdfium fallback) and every
+parser created with the same pipeline options can use one shared cache.
+Pipelines, and their layout and TableFormer models, are still created lazily by
+the first converter needing them, under a lock of the entry so that two
+converters never build the same pipeline twice. The entries are reference counted and dropped
+when the last parser using them is released.
+"""
+
+import hashlib
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from docling.datamodel.pipeline_options import PipelineOptions
+
+if TYPE_CHECKING:
+    # Importing the converter loads the backends of every format
+    from docling.document_converter import DocumentConverter
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    pipelines: dict[Any, Any] = field(default_factory=dict)
+    refs: int = 0
+    # Held while a converter looks up or creates a pipeline of the entry
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class ModelRegistry:
+    """Reference-counted pipeline caches shared by the converters of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+
+    @staticmethod
+    def options_key(pipeline_options: PipelineOptions) -> str:
+        # Same hashing as DocumentConverter._get_pipeline_options_hash()
+        return hashlib.md5(
+            str(pipeline_options.model_dump()).encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+
+    def acquire(self, key: str, *converters: "DocumentConverter") -> None:
+        """Make the converters use the shared pipeline cache of key, adding one reference."""
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry())
+            entry.refs += 1
+            for converter in converters:
+                converter.initialized_pipelines = entry.pipelines
+                converter._get_pipeline = self._guarded(  # type: ignore[method-assign]
+                    entry, converter._get_pipeline
+                )
+        _log.debug(f"Acquired shared models {key} (refs={entry.refs})")
+
+    @staticmethod
+    def _guarded(entry: _Entry, get_pipeline: Callable) -> Callable:
+        # The pipelines are shared by the converters, so is the lock guarding their
+        # creation
+        def _get_pipeline(doc_format):
+            with entry.lock:
+                return get_pipeline(doc_format)
+
+        return _get_pipeline
+
+    def release(self, key: str) -> None:
+        """Drop one reference, unloading the pipelines of key with the last one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[key]
+        _log.info(f"Released shared models {key}")
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                key: {"refs": entry.refs, "pipelines": len(entry.pipelines)}
+                for key, entry in self._entries.items()
+            }
+
+
+model_registry = ModelRegistry()
@@ -1,23 +1,115 @@
 import json
 import logging
+import time
+import uuid
 from functools import lru_cache
 from typing import Any, Optional
 
 import redis.asyncio as redis
+from pydantic import BaseModel
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError,
+    TimeoutError as RedisTimeoutError,
+)
 
+from docling_jobkit.datamodel.callback import (
+    ProgressCallbackRequest,
+    ProgressSetNumDocs,
+)
 from docling_jobkit.datamodel.task import Task
-from docling_jobkit.datamodel.task_meta import TaskStatus
+from docling_jobkit.datamodel.task_meta import TaskProcessingMeta, TaskStatus
 from docling_jobkit.orchestrators.base_orchestrator import (
     BaseOrchestrator,
+    ProgressInvalid,
     TaskNotFoundError,
 )
 
 from docling_serve.settings import AsyncEngine, docling_serve_settings
-from docling_serve.storage import get_scratch
+from docling_serve.storage import get_figure_store, get_scratch
 
 _log = logging.getLogger(__name__)
 
 
+# RQ job statuses mapped as RQOrchestrator._update_task_from_rq does, other ones are failures
+_RQ_PENDING_STATUSES = {"queued", "scheduled", "stopped", "deferred"}
+
+# Number of locally cached statuses above which the expired ones are pruned
+_STATUS_CACHE_PRUNE_SIZE = 4096
+
+# Progress of the task statuses, a task never goes back to an earlier one
+_STATUS_ORDER = {
+    TaskStatus.PENDING: 0,
+    TaskStatus.STARTED: 1,
+    TaskStatus.SUCCESS: 2,
+    TaskStatus.FAILURE: 2,
+}
+
+# Version of the task hash encoding, stored in its "v" field. Hashes of another
+# version are ignored, the task status is then resolved from RQ.
+_TASK_HASH_VERSION = b"1"
+
+# Task hash fields of the processing counters, by TaskProcessingMeta attribute
+_TASK_HASH_COUNTERS = {
+    "num_docs": "docs",
+    "num_processed": "processed",
+    "num_succeeded": "succeeded",
+    "num_failed": "failed",
+}
+
+
+class _TaskStatusUpdate(BaseModel):
+    """
+    Task update published on the RQ updates channel.
+
+    Superset of the updates published by the RQ workers, which carry no
+    processing metadata and no origin.
+    """
+
+    task_id: str
+    task_status: TaskStatus
+    result_key: Optional[str] = None
+    processing_meta: Optional[TaskProcessingMeta] = None
+    # Instance id of the API replica which published the update, None for workers
+    origin: Optional[str] = None
+
+
+class _TimedBlockingConnectionPool(redis.BlockingConnectionPool):
+    """Blocking connection pool recording the time spent waiting for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def get_connection(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except RedisConnectionError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.acquisitions += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "acquisitions": self.acquisitions,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
 class RedisTaskStatusMixin:
     tasks: dict[str, Task]
     _task_result_keys: dict[str, str]
@@ -26,100 +118,148 @@ class RedisTaskStatusMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.redis_prefix = "docling:tasks:"
-        self._redis_pool = redis.ConnectionPool.from_url(
+        # One client shared by all the operations, waiting up to eng_rq_pool_timeout
+        # for a free connection and reconnecting on connection errors
+        self._redis_pool = _TimedBlockingConnectionPool.from_url(
             self.config.redis_url,
-            max_connections=10,
+            max_connections=docling_serve_settings.eng_rq_pool_size,
+            timeout=docling_serve_settings.eng_rq_pool_timeout,
             socket_timeout=2.0,
+            health_check_interval=docling_serve_settings.eng_rq_health_check_interval,
+            retry=Retry(ExponentialBackoff(cap=1.0, base=0.05), retries=3),
+            retry_on_error=[RedisConnectionError, RedisTimeoutError],
         )
+        self._redis = redis.Redis(connection_pool=self._redis_pool)
+        # Recently resolved statuses, by task id: (expiry on the monotonic clock, task)
+        self._status_cache: dict[str, tuple[float, Task]] = {}
+        self._status_cache_ttl = docling_serve_settings.eng_rq_status_cache_ttl
+        # Identifies the updates published by this replica on the updates channel
+        self._instance_id = uuid.uuid4().hex
+        self._task_ttl = docling_serve_settings.eng_rq_task_ttl
 
     async def task_status(self, task_id: str, wait: float = 0.0) -> Task:
         """
-        Get task status by checking Redis first, then falling back to RQ verification.
-
-        When Redis shows 'pending' but RQ shows 'success', we update Redis
-        and return the RQ status for cross-instance consistency.
+        Get the task status with a single pipelined Redis round trip.
+
+        Completed tasks of this instance, and statuses resolved less than
+        eng_rq_status_cache_ttl seconds ago, are served without Redis. The cached
+        statuses are dropped when the workers or the other replicas publish an
+        update of the task.
+        Otherwise the stored metadata, the RQ job status and its latest result are
+        read together, and the metadata is only written back when the status changed.
         """
-        _log.info(f"Task {task_id} status check")
-
-        # Always check RQ directly first - this is the most reliable source
-        rq_task = await self._get_task_from_rq_direct(task_id)
-        if rq_task:
-            _log.info(f"Task {task_id} in RQ: {rq_task.task_status}")
+        task = self.tasks.get(task_id)
+        if task is not None and task.is_completed():
+            return task
 
-            # Update memory registry
-            self.tasks[task_id] = rq_task
+        cached = self._status_cache.get(task_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
 
-            # Store/update in Redis for other instances
-            await self._store_task_in_redis(rq_task)
-            return rq_task
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            self._read_status(pipe, task_id)
+            task_hash, job_status, results = await pipe.execute()
+        except Exception as e:
+            _log.error(f"Redis status {task_id}: {e}")
+            # Without Redis, only the tasks of this instance are known
+            return await super().task_status(task_id, wait)  # type: ignore[misc]
 
-        # If not in RQ, check Redis (maybe it's cached from another instance)
-        task = await self._get_task_from_redis(task_id)
-        if task:
-            _log.info(f"Task {task_id} in Redis: {task.task_status}")
-
-            # CRITICAL FIX: Check if Redis status might be stale
-            # STARTED tasks might have completed since they were cached
-            if task.task_status in [TaskStatus.PENDING, TaskStatus.STARTED]:
-                _log.debug(f"Task {task_id} verifying stale status")
-
-                # Try to get fresh status from RQ
-                fresh_rq_task = await self._get_task_from_rq_direct(task_id)
-                if fresh_rq_task and fresh_rq_task.task_status != task.task_status:
-                    _log.info(
-                        f"Task {task_id} status updated: {fresh_rq_task.task_status}"
-                    )
-
-                    # Update memory and Redis with fresh status
-                    self.tasks[task_id] = fresh_rq_task
-                    await self._store_task_in_redis(fresh_rq_task)
-                    return fresh_rq_task
-                else:
-                    _log.debug(f"Task {task_id} status consistent")
+        return await self._resolve_status(task_id, task_hash, job_status, results)
 
-            return task
+    async def task_statuses(
+        self, task_ids: list[str]
+    ) -> dict[str, tuple[Task, Optional[int]]]:
+        """
+        Get the status and queue position of many tasks with a single pipelined
+        Redis round trip.
 
-        # Fall back to parent implementation
-        try:
-            parent_task = await super().task_status(task_id, wait)  # type: ignore[misc]
-            _log.debug(f"Task {task_id} from parent: {parent_task.task_status}")
+        Args:
+            task_ids: Ids of the tasks
 
-            # Store in Redis for other instances to find
-            await self._store_task_in_redis(parent_task)
-            return parent_task
-        except TaskNotFoundError:
-            _log.warning(f"Task {task_id} not found")
-            raise
+        Returns:
+            (task, queue position) by task id, without the unknown tasks
+        """
+        statuses: dict[str, tuple[Task, Optional[int]]] = {}
+        pending_ids: list[str] = []
+        for task_id in task_ids:
+            task = self.tasks.get(task_id)
+            if task is not None and task.is_completed():
+                statuses[task_id] = (task, None)
+            else:
+                pending_ids.append(task_id)
+        if not pending_ids:
+            return statuses
 
-    async def _get_task_from_redis(self, task_id: str) -> Optional[Task]:
         try:
-            async with redis.Redis(connection_pool=self._redis_pool) as r:
-                task_data = await r.get(f"{self.redis_prefix}{task_id}:metadata")
-                if not task_data:
-                    return None
-
-                data: dict[str, Any] = json.loads(task_data)
-                meta = data.get("processing_meta") or {}
-                meta.setdefault("num_docs", 0)
-                meta.setdefault("num_processed", 0)
-                meta.setdefault("num_succeeded", 0)
-                meta.setdefault("num_failed", 0)
-
-                return Task(
-                    task_id=data["task_id"],
-                    task_type=data["task_type"],
-                    task_status=TaskStatus(data["task_status"]),
-                    processing_meta=meta,
-                )
+            pipe = self._redis.pipeline(transaction=False)
+            for task_id in pending_ids:
+                self._read_status(pipe, task_id)
+                pipe.lpos(self._rq_queue.key, task_id)  # type: ignore[attr-defined]
+            replies = await pipe.execute()
         except Exception as e:
-            _log.error(f"Redis get task {task_id}: {e}")
-            return None
+            _log.error(f"Redis statuses of {len(pending_ids)} tasks: {e}")
+            statuses.update(await task_statuses_one_by_one(self, pending_ids))  # type: ignore[arg-type]
+            return statuses
 
-    async def _get_task_from_rq_direct(self, task_id: str) -> Optional[Task]:
-        try:
-            _log.debug(f"Checking RQ for task {task_id}")
+        for i, task_id in enumerate(pending_ids):
+            task_hash, job_status, results, position = replies[4 * i : 4 * i + 4]
+            try:
+                task = await self._resolve_status(
+                    task_id, task_hash, job_status, results
+                )
+            except TaskNotFoundError:
+                continue
+            if task.task_status != TaskStatus.PENDING or position is None:
+                statuses[task_id] = (task, None)
+            else:
+                statuses[task_id] = (task, position + 1)
+        return statuses
+
+    def _read_status(self, pipe: Any, task_id: str) -> None:
+        """Queue the reads of the stored task, the RQ job status and its latest result."""
+        pipe.hgetall(self._task_key(task_id))
+        pipe.hget(f"rq:job:{task_id}", "status")
+        pipe.xrevrange(f"rq:results:{task_id}", "+", "-", count=1)
+
+    async def _resolve_status(
+        self,
+        task_id: str,
+        task_hash: dict[bytes, bytes],
+        job_status: Optional[bytes],
+        results: list,
+    ) -> Task:
+        """
+        Update the task from the replies of _read_status().
 
-            temp_task = Task(
+        The task hash, shared by the replicas, is newer than the local copy of the
+        task: its status, result key and processing counters, which the workers
+        increment, are adopted first. The status is then advanced from RQ, never
+        back to a status the task already passed, e.g. once RQ expired the job.
+        The hash is only written back when RQ changed the status.
+        """
+        task = self.tasks.get(task_id)
+        stored = self._task_from_hash(task_id, task_hash)
+        stored_status = stored.task_status if stored is not None else None
+        rq_status, result_key = self._status_from_rq(task_id, job_status, results)
+
+        if stored is not None:
+            if task is None:
+                task = stored
+            else:
+                if task.task_status != stored.task_status:
+                    task.set_status(stored.task_status)
+                task.processing_meta = stored.processing_meta
+            if b"result" in task_hash:
+                self._task_result_keys[task_id] = task_hash[b"result"].decode()
+        if task is None and not task_hash:
+            # Stored by a previous version, written back as a hash below
+            task = await self._get_legacy_task(task_id)
+        if task is None:
+            if rq_status is None:
+                _log.warning(f"Task {task_id} not found")
+                raise TaskNotFoundError()
+            task = Task(
                 task_id=task_id,
                 task_type="convert",
                 task_status=TaskStatus.PENDING,
@@ -131,45 +271,306 @@ class RedisTaskStatusMixin:
                 },
             )
 
-            original_task = self.tasks.get(task_id)
-            self.tasks[task_id] = temp_task
+        if (
+            rq_status is not None
+            and _STATUS_ORDER[rq_status] > _STATUS_ORDER[task.task_status]
+        ):
+            _log.info(f"Task {task_id} status: {task.task_status} -> {rq_status}")
+            task.set_status(rq_status)
+        if result_key is not None:
+            self._task_result_keys[task_id] = result_key
+        self.tasks[task_id] = task
+
+        # Write back for the other instances only on transitions, the counters
+        # only when the hash is missing
+        if stored_status != task.task_status:
+            await self._store_task_in_redis(task, counters=not task_hash)
+
+        self._cache_status(task)
+        return task
+
+    def redis_pool_stats(self) -> dict[str, Any]:
+        """Usage of the Redis connection pool and time spent waiting for its connections."""
+        return self._redis_pool.stats()
+
+    async def close_redis(self) -> None:
+        await self._redis.aclose()
+        await self._redis_pool.disconnect()
+
+    def _cache_status(self, task: Task) -> None:
+        now = time.monotonic()
+        if len(self._status_cache) >= _STATUS_CACHE_PRUNE_SIZE:
+            for task_id, (expiry, _) in list(self._status_cache.items()):
+                if expiry <= now:
+                    del self._status_cache[task_id]
+        self._status_cache[task.task_id] = (now + self._status_cache_ttl, task)
+
+    def _status_from_rq(
+        self, task_id: str, job_status: Optional[bytes], results: list
+    ) -> tuple[Optional[TaskStatus], Optional[str]]:
+        """
+        Task status and result key from the raw RQ job status and latest result.
 
-            try:
-                await super()._update_task_from_rq(task_id)  # type: ignore[misc]
-
-                updated_task = self.tasks.get(task_id)
-                if updated_task and updated_task.task_status != TaskStatus.PENDING:
-                    _log.debug(f"RQ task {task_id}: {updated_task.task_status}")
-
-                    # Store result key if available
-                    if task_id in self._task_result_keys:
-                        try:
-                            async with redis.Redis(
-                                connection_pool=self._redis_pool
-                            ) as r:
-                                await r.set(
-                                    f"{self.redis_prefix}{task_id}:result_key",
-                                    self._task_result_keys[task_id],
-                                    ex=86400,
-                                )
-                                _log.debug(f"Stored result key for {task_id}")
-                        except Exception as e:
-                            _log.error(f"Store result key {task_id}: {e}")
-
-                    return updated_task
-                return None
-
-            finally:
-                # Restore original task state
-                if original_task:
-                    self.tasks[task_id] = original_task
-                elif task_id in self.tasks and self.tasks[task_id] == temp_task:
-                    # Only remove if it's still our temp task
-                    del self.tasks[task_id]
+        Returns:
+            (status, result key), status is None if RQ has no such job
+        """
+        if not job_status:
+            return None, None
+
+        status = job_status.decode()
+        if status == "finished":
+            if results:
+                from rq.results import Result
+
+                result_id, payload = results[0]
+                result = Result.restore(
+                    task_id,
+                    result_id.decode(),
+                    payload,
+                    connection=self._redis_conn,  # type: ignore[attr-defined]
+                )
+                if result.type == Result.Type.SUCCESSFUL:
+                    return TaskStatus.SUCCESS, str(result.return_value)
+            return TaskStatus.FAILURE, None
+        if status in _RQ_PENDING_STATUSES:
+            return TaskStatus.PENDING, None
+        if status == "started":
+            return TaskStatus.STARTED, None
+        return TaskStatus.FAILURE, None
+
+    def _task_key(self, task_id: str) -> str:
+        return f"{self.redis_prefix}{task_id}:task"
+
+    @staticmethod
+    def _task_from_hash(task_id: str, fields: dict[bytes, bytes]) -> Optional[Task]:
+        """
+        Decode a task hash.
+
+        Returns:
+            The task, None if the hash is missing, incomplete or of another version
+        """
+        if not fields or fields.get(b"v") != _TASK_HASH_VERSION:
+            return None
+        try:
+            task = Task(
+                task_id=task_id,
+                task_type=fields[b"type"].decode(),
+                task_status=TaskStatus(fields[b"status"].decode()),
+                processing_meta={
+                    attr: int(fields.get(field.encode(), 0))
+                    for attr, field in _TASK_HASH_COUNTERS.items()
+                },
+            )
+        except (KeyError, ValueError) as e:
+            _log.error(f"Invalid task hash {task_id}: {e}")
+            return None
+        return task
 
+    def _task_to_hash(self, task: Task, counters: bool) -> dict[str, Any]:
+        fields: dict[str, Any] = {
+            "v": _TASK_HASH_VERSION,
+            "type": task.task_type.value
+            if hasattr(task.task_type, "value")
+            else str(task.task_type),
+            "status": task.task_status.value,
+        }
+        meta = task.processing_meta
+        if counters and meta is not None:
+            for attr, field in _TASK_HASH_COUNTERS.items():
+                fields[field] = getattr(meta, attr)
+        result_key = self._task_result_keys.get(task.task_id)
+        if result_key is not None:
+            fields["result"] = result_key
+        return fields
+
+    async def _get_task_from_redis(self, task_id: str) -> Optional[Task]:
+        try:
+            task_hash = await self._redis.hgetall(self._task_key(task_id))
         except Exception as e:
-            _log.error(f"RQ check {task_id}: {e}")
+            _log.error(f"Redis get task {task_id}: {e}")
             return None
+        if not task_hash:
+            task = await self._get_legacy_task(task_id)
+            if task is not None:
+                await self._store_task_in_redis(task, counters=True)
+            return task
+        task = self._task_from_hash(task_id, task_hash)
+        if task is not None and b"result" in task_hash:
+            self._task_result_keys.setdefault(task_id, task_hash[b"result"].decode())
+        return task
+
+    async def _get_legacy_task(self, task_id: str) -> Optional[Task]:
+        """
+        Task stored by the previous versions as JSON in its `:metadata` key, with
+        its result key in `:result_key`.
+
+        Only read when the task has no hash, the caller writes the hash so that
+        the legacy keys are read once.
+        """
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(f"{self.redis_prefix}{task_id}:metadata")
+            pipe.get(f"{self.redis_prefix}{task_id}:result_key")
+            task_data, result_key = await pipe.execute()
+        except Exception as e:
+            _log.error(f"Redis get legacy task {task_id}: {e}")
+            return None
+        if not task_data:
+            return None
+
+        try:
+            data: dict[str, Any] = json.loads(task_data)
+            meta = data.get("processing_meta") or {}
+            task = Task(
+                task_id=task_id,
+                task_type=data["task_type"],
+                task_status=TaskStatus(data["task_status"]),
+                processing_meta={
+                    attr: int(meta.get(attr, 0)) for attr in _TASK_HASH_COUNTERS
+                },
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            _log.error(f"Invalid task metadata {task_id}: {e}")
+            return None
+        if result_key:
+            self._task_result_keys.setdefault(task_id, result_key.decode())
+        return task
+
+    async def incr_task_progress(self, task_id: str, **counts: int) -> None:
+        """
+        Atomically increment processing counters of a stored task.
+
+        Args:
+            task_id: Id of the task
+            counts: Increments by TaskProcessingMeta attribute, e.g. num_processed=1
+        """
+        try:
+            pipe = self._redis.pipeline(transaction=True)
+            for attr, amount in counts.items():
+                pipe.hincrby(self._task_key(task_id), _TASK_HASH_COUNTERS[attr], amount)
+            pipe.expire(self._task_key(task_id), self._task_ttl)
+            await pipe.execute()
+        except Exception as e:
+            _log.error(f"Increment progress of task {task_id}: {e}")
+            return
+
+        self._status_cache.pop(task_id, None)
+        task = self.tasks.get(task_id)
+        if task is not None and task.processing_meta is not None:
+            for attr, amount in counts.items():
+                setattr(
+                    task.processing_meta,
+                    attr,
+                    getattr(task.processing_meta, attr) + amount,
+                )
+
+    async def receive_task_progress(self, request: ProgressCallbackRequest) -> None:
+        """
+        Apply a progress report of the worker of a task.
+
+        The number of documents starts the task, the processed counts are
+        increments added to the stored hash with incr_task_progress(), so the
+        reports of concurrent workers are never lost.
+        """
+        task = await self.get_raw_task(request.task_id)
+        progress = request.progress
+        if isinstance(progress, ProgressSetNumDocs):
+            task.processing_meta = TaskProcessingMeta(num_docs=progress.num_docs)
+            task.set_status(TaskStatus.STARTED)
+            await self._store_task_in_redis(task, counters=True)
+        else:
+            if task.processing_meta is None:
+                raise ProgressInvalid(
+                    "UpdateProcessed was called before setting the expected number "
+                    "of documents."
+                )
+            await self.incr_task_progress(
+                task.task_id,
+                num_processed=progress.num_processed,
+                num_succeeded=progress.num_succeeded,
+                num_failed=progress.num_failed,
+            )
+
+        if self.notifier:  # type: ignore[attr-defined]
+            await self.notifier.notify_task_subscribers(task_id=task.task_id)  # type: ignore[attr-defined]
+
+    async def _listen_for_updates(self):
+        """
+        Apply the task updates published by the workers and by the other replicas.
+
+        Tasks unknown to this replica, e.g. submitted to another one, are only
+        loaded from their Redis hash when they have websocket subscribers or
+        status waiters here, the updates of the other ones are skipped. The
+        websocket subscribers of the task are notified when its status changed,
+        and on the updates published by this replica, whose state is already up
+        to date.
+        """
+        pubsub = self._async_redis_conn.pubsub()  # type: ignore[attr-defined]
+        await pubsub.subscribe(self.config.sub_channel)
+        _log.debug("Listening for updates...")
+
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                data = _TaskStatusUpdate.model_validate_json(message["data"])
+            except ValueError as e:
+                _log.error(f"Invalid task update: {e}")
+                continue
+
+            own_update = data.origin == self._instance_id
+            task = self.tasks.get(data.task_id)
+            if task is None:
+                if not self._watched_here(data.task_id):
+                    continue
+                task = await self._get_task_from_redis(data.task_id)
+                if task is None:
+                    continue
+                self.tasks[data.task_id] = task
+
+            if not own_update:
+                self._status_cache.pop(data.task_id, None)
+                if task.is_completed():
+                    _log.debug("Task already completed. No update will be done.")
+                    continue
+                if (
+                    data.task_status == task.task_status
+                    and data.processing_meta is None
+                ):
+                    continue
+
+                task.set_status(data.task_status)
+                if data.processing_meta is not None:
+                    task.processing_meta = data.processing_meta
+                if (
+                    data.task_status == TaskStatus.SUCCESS
+                    and data.result_key is not None
+                ):
+                    self._task_result_keys[data.task_id] = data.result_key
+
+            notifier = self.notifier  # type: ignore[attr-defined]
+            if notifier is None:
+                continue
+            try:
+                # Only the replicas holding websockets of the task track its subscribers
+                if data.task_id in getattr(notifier, "task_subscribers", {}):
+                    await notifier.notify_task_subscribers(data.task_id)
+                await notifier.notify_queue_positions()
+            except Exception as e:
+                _log.error(f"Notify update of task {data.task_id}: {e}")
+
+    def _watched_here(self, task_id: str) -> bool:
+        """Whether the task has websocket subscribers or status waiters on this replica."""
+        notifier = self.notifier  # type: ignore[attr-defined]
+        if notifier is None:
+            return False
+        return task_id in getattr(notifier, "task_subscribers", {}) or (
+            task_id in getattr(notifier, "task_events", {})
+        )
+
+    async def delete_task(self, task_id: str):
+        self._status_cache.pop(task_id, None)
+        await super().delete_task(task_id)  # type: ignore[misc]
 
     async def get_raw_task(self, task_id: str) -> Task:
         if task_id in self.tasks:
@@ -182,44 +583,46 @@ class RedisTaskStatusMixin:
 
         try:
             parent_task = await super().get_raw_task(task_id)  # type: ignore[misc]
-            await self._store_task_in_redis(parent_task)
+            await self._store_task_in_redis(parent_task, counters=True)
             return parent_task
         except TaskNotFoundError:
             raise
 
-    async def _store_task_in_redis(self, task: Task) -> None:
+    async def _store_task_in_redis(self, task: Task, counters: bool = False) -> None:
+        """
+        Store the task hash and publish its status on the updates channel.
+
+        The hash fields, including the result key once known, are replaced and
+        their TTL renewed in one transaction. The other replicas apply the
+        published status to their copy of the task and push it to their websocket
+        subscribers.
+
+        Args:
+            task: Task to store
+            counters: Also replace the processing counters, only when the task
+                starts or its hash is created, as the workers increment them
+                with incr_task_progress()
+        """
         try:
-            meta: Any = task.processing_meta
-            if hasattr(meta, "model_dump"):
-                meta = meta.model_dump()
-            elif not isinstance(meta, dict):
-                meta = {
-                    "num_docs": 0,
-                    "num_processed": 0,
-                    "num_succeeded": 0,
-                    "num_failed": 0,
-                }
-
-            data: dict[str, Any] = {
-                "task_id": task.task_id,
-                "task_type": task.task_type.value
-                if hasattr(task.task_type, "value")
-                else str(task.task_type),
-                "task_status": task.task_status.value,
-                "processing_meta": meta,
-            }
-            async with redis.Redis(connection_pool=self._redis_pool) as r:
-                await r.set(
-                    f"{self.redis_prefix}{task.task_id}:metadata",
-                    json.dumps(data),
-                    ex=86400,
-                )
+            update = _TaskStatusUpdate(
+                task_id=task.task_id,
+                task_status=task.task_status,
+                result_key=self._task_result_keys.get(task.task_id),
+                processing_meta=task.processing_meta if counters else None,
+                origin=self._instance_id,
+            )
+            key = self._task_key(task.task_id)
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.hset(key, mapping=self._task_to_hash(task, counters))
+            pipe.expire(key, self._task_ttl)
+            pipe.publish(self.config.sub_channel, update.model_dump_json())
+            await pipe.execute()
         except Exception as e:
             _log.error(f"Store task {task.task_id}: {e}")
 
     async def enqueue(self, **kwargs):  # type: ignore[override]
         task = await super().enqueue(**kwargs)  # type: ignore[misc]
-        await self._store_task_in_redis(task)
+        await self._store_task_in_redis(task, counters=True)
         return task
 
     async def task_result(self, task_id: str):  # type: ignore[override]
@@ -228,11 +631,10 @@ class RedisTaskStatusMixin:
             return result
 
         try:
-            async with redis.Redis(connection_pool=self._redis_pool) as r:
-                result_key = await r.get(f"{self.redis_prefix}{task_id}:result_key")
-                if result_key:
-                    self._task_result_keys[task_id] = result_key.decode("utf-8")
-                    return await super().task_result(task_id)  # type: ignore[misc]
+            result_key = await self._redis.hget(self._task_key(task_id), "result")
+            if result_key:
+                self._task_result_keys[task_id] = result_key.decode("utf-8")
+                return await super().task_result(task_id)  # type: ignore[misc]
         except Exception as e:
             _log.error(f"Redis result key {task_id}: {e}")
 
@@ -251,16 +653,40 @@ class RedisTaskStatusMixin:
                 _log.debug(f"Task {task_id} status: {original_status} -> {new_status}")
                 await self._store_task_in_redis(self.tasks[task_id])
 
-        if task_id in self._task_result_keys:
-            try:
-                async with redis.Redis(connection_pool=self._redis_pool) as r:
-                    await r.set(
-                        f"{self.redis_prefix}{task_id}:result_key",
-                        self._task_result_keys[task_id],
-                        ex=86400,
-                    )
-            except Exception as e:
-                _log.error(f"Store result key {task_id}: {e}")
+
+async def task_statuses_one_by_one(
+    orchestrator: BaseOrchestrator, task_ids: list[str]
+) -> dict[str, tuple[Task, Optional[int]]]:
+    """Status and queue position of each task, without the unknown tasks."""
+    statuses: dict[str, tuple[Task, Optional[int]]] = {}
+    for task_id in task_ids:
+        try:
+            task = await orchestrator.task_status(task_id=task_id)
+        except TaskNotFoundError:
+            continue
+        statuses[task_id] = (task, await orchestrator.get_queue_position(task_id))
+    return statuses
+
+
+async def get_task_statuses(
+    orchestrator: BaseOrchestrator, task_ids: list[str]
+) -> dict[str, tuple[Task, Optional[int]]]:
+    """
+    Status and queue position of many tasks.
+
+    The RQ engine resolves them in one Redis round trip, the other engines task
+    by task.
+
+    Args:
+        orchestrator: Orchestrator of the tasks
+        task_ids: Ids of the tasks
+
+    Returns:
+        (task, queue position) by task id, without the unknown tasks
+    """
+    if isinstance(orchestrator, RedisTaskStatusMixin):
+        return await orchestrator.task_statuses(task_ids)
+    return await task_statuses_one_by_one(orchestrator, task_ids)
 
 
 @lru_cache
@@ -273,6 +699,7 @@ def get_async_orchestrator() -> BaseOrchestrator:
             LocalOrchestrator,
             LocalOrchestratorConfig,
         )
+
         # Use custom converter instead of DoclingConverterManager
         from docling_serve.custom_converter import CustomConverterManager
 
@@ -298,8 +725,23 @@ def get_async_orchestrator() -> BaseOrchestrator:
         # CUSTOM: Use CustomConverterManager instead of DoclingConverterManager
         cm = CustomConverterManager(config=cm_config)
 
+        class FigureAwareLocalOrchestrator(LocalOrchestrator):
+            """Local orchestrator removing the figures of the deleted tasks."""
+
+            async def init_task_tracking(self, task: Task):
+                # Before the task is queued, so a worker never runs it unbound
+                if task.convert_options is not None:
+                    cm.bind_task(task.task_id, task.convert_options)
+                await super().init_task_tracking(task)
+
+            async def delete_task(self, task_id: str):
+                await super().delete_task(task_id)
+                cm.unbind_task(task_id)
+                if docling_serve_settings.enable_figures_endpoint:
+                    get_figure_store().release(task_id)
+
         _log.info("[CUSTOM] Using CustomConverterManager for document conversion")
-        return LocalOrchestrator(config=local_config, converter_manager=cm)
+        return FigureAwareLocalOrchestrator(config=local_config, converter_manager=cm)
 
     elif docling_serve_settings.eng_kind == AsyncEngine.RQ:
         from docling_jobkit.orchestrators.rq.orchestrator import (
@@ -313,6 +755,7 @@ def get_async_orchestrator() -> BaseOrchestrator:
         rq_config = RQOrchestratorConfig(
             redis_url=docling_serve_settings.eng_rq_redis_url,
             results_prefix=docling_serve_settings.eng_rq_results_prefix,
+            results_ttl=docling_serve_settings.eng_rq_results_ttl,
             sub_channel=docling_serve_settings.eng_rq_sub_channel,
             scratch_dir=get_scratch(),
         )
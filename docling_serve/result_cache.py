@@ -0,0 +1,194 @@
+"""
+Content-addressed cache of the documents produced by the custom parser.
+
+Entries are keyed by the SHA-256 of the input bytes, the file name (figure ids
+and the document id are derived from it) and a fingerprint of the ParserConfig
+and ConvertDocumentsOptions which can change the output. The cache has two
+tiers, looked up in order:
+
+- a bounded in-memory LRU of serialized documents,
+- optionally, JSON files under <scratch>/result_cache.
+
+Figures are stored by id, without their payload: a cached document is only
+reused while its figure files are in the figures directory.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    # The parser module is only imported once a document is converted
+    from docling_serve.docling_test import Document, ParserConfig
+
+_log = logging.getLogger(__name__)
+
+# Bump when the produced Document changes for the same inputs
+CACHE_VERSION = 1
+
+# ParserConfig fields which only affect how the conversion runs, not its output
+_RUNTIME_FIELDS = {
+    "doc_batch_size",
+    "doc_batch_concurrency",
+    "layout_batch_size",
+    "table_batch_size",
+    "markdown_export_workers",
+    "markdown_parallel_min_pages",
+    "figures_dir",
+    "figure_encode_workers",
+    "fallback_workers",
+    "known_bad_path",
+    "shard_workers",
+    "format_workers",
+    "adaptive_batching",
+    "adaptive_batch_min_size",
+    "adaptive_batch_target_seconds",
+    "adaptive_batch_max_rss",
+    "scratch_dir",
+    "spool_threshold",
+}
+
+
+def hash_source(source: Union[bytes, memoryview, Path]) -> str:
+    """SHA-256 of the input bytes, files are hashed in chunks."""
+    if isinstance(source, Path):
+        digest = hashlib.sha256()
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    return hashlib.sha256(source).hexdigest()
+
+
+def config_fingerprint(
+    parser_config: "ParserConfig", options: Optional[BaseModel] = None
+) -> str:
+    """Fingerprint of the settings which can change the produced Document."""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    digest.update(parser_config.model_dump_json(exclude=_RUNTIME_FIELDS).encode())
+    if options is not None:
+        digest.update(options.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Cache of converted documents with an in-memory LRU and an optional disk tier.
+
+    Args:
+        max_size: Number of documents kept in memory, 0 disables the memory tier
+        disk_dir: If set, documents are also stored as JSON files in this directory
+    """
+
+    def __init__(self, max_size: int = 32, disk_dir: Optional[Path] = None):
+        self.max_size = max_size
+        self.disk_dir = disk_dir
+
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 or self.disk_dir is not None
+
+    @staticmethod
+    def make_key(content_hash: str, filename: str, fingerprint: str) -> str:
+        return hashlib.sha256(
+            f"{content_hash}:{filename}:{fingerprint}".encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional["Document"]:
+        """
+        Return a new copy of the cached document for key, counting the hit or miss.
+
+        The figures of the copy only have their ids, their encoded files are looked
+        up in the figures directory.
+        """
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+        in_memory = payload is not None
+
+        if payload is None:
+            payload = self._get_disk(key)
+
+        doc = None
+        if payload is not None:
+            from docling_serve.docling_test import Document
+
+            try:
+                doc = Document.model_validate_json(payload)
+            except Exception as e:
+                _log.warning(f"Discarding invalid result cache entry {key}: {e}")
+
+        with self._lock:
+            if doc is None or payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        if not in_memory:
+            self._put_memory(key, payload)
+        return doc
+
+    @staticmethod
+    def serialize(doc: "Document") -> str:
+        """JSON of a document without the figure payloads, which are not encoded."""
+        return doc.model_dump_json(exclude={"images": {"__all__": {"data"}}})
+
+    def put(self, key: str, doc: "Document") -> None:
+        """Store the document in all the enabled tiers."""
+        payload = self.serialize(doc)
+        self._put_memory(key, payload)
+        if self.disk_dir is not None:
+            path = self.disk_dir / f"{key}.json"
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                tmp_path.write_text(payload, encoding="utf-8")
+                os.replace(tmp_path, path)
+            except OSError as e:
+                _log.warning(f"Failed to store result cache entry {key} on disk: {e}")
+                tmp_path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop the in-memory and disk entries."""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._memory)}
+
+    def _put_memory(self, key: str, payload: str) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        if self.disk_dir is None:
+            return None
+        try:
+            return (self.disk_dir / f"{key}.json").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            _log.warning(f"Failed to read result cache entry {key} from disk: {e}")
+            return None
@@ -48,9 +48,20 @@ class DoclingServeSettings(BaseSettings):
     result_removal_delay: float = 300  # 5 minutes
     load_models_at_boot: bool = True
     options_cache_size: int = 2
+    result_cache_size: int = 32
+    result_cache_disk: bool = False
+    pdf_shard_min_pages: int = 0
+    pdf_shard_pages: int = 50
+    pdf_shard_workers: int = 2
+    format_workers: dict[str, int] = {}
+    adaptive_batching: bool = False
+    adaptive_batch_min_size: int = 1
+    adaptive_batch_target_seconds: float = 10.0
+    adaptive_batch_max_rss: Optional[int] = None
     enable_remote_services: bool = False
     allow_external_plugins: bool = False
     show_version_info: bool = True
+    enable_figures_endpoint: bool = False
 
     api_key: str = ""
 
@@ -67,6 +78,7 @@ class DoclingServeSettings(BaseSettings):
 
     sync_poll_interval: int = 2  # seconds
     max_sync_wait: int = 1000  # ~16 minutes
+    max_status_batch_size: int = 1000
 
     cors_origins: list[str] = ["*"]
     cors_methods: list[str] = ["*"]
@@ -80,6 +92,12 @@ class DoclingServeSettings(BaseSettings):
     eng_rq_redis_url: str = ""
     eng_rq_results_prefix: str = "docling:results"
     eng_rq_sub_channel: str = "docling:updates"
+    eng_rq_status_cache_ttl: float = 1.0
+    eng_rq_task_ttl: int = 86400
+    eng_rq_results_ttl: int = 3_600 * 4
+    eng_rq_pool_size: int = 50
+    eng_rq_pool_timeout: float = 5.0
+    eng_rq_health_check_interval: float = 30.0
     # KFP engine
     eng_kfp_endpoint: Optional[AnyUrl] = None
     eng_kfp_token: Optional[str] = None
@@ -1,6 +1,10 @@
+import shutil
 import tempfile
+import threading
+from collections.abc import Iterable
 from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from docling_serve.settings import docling_serve_settings
 
@@ -14,3 +18,60 @@ def get_scratch() -> Path:
     )
     scratch_dir.mkdir(exist_ok=True, parents=True)
     return scratch_dir
+
+
+def get_figures_dir() -> Path:
+    figures_dir = get_scratch() / "figures"
+    figures_dir.mkdir(exist_ok=True, parents=True)
+    return figures_dir
+
+
+class FigureStore:
+    """
+    Figures of the tasks, stored under <scratch>/figures/<content hash>/.
+
+    A task owns the figure directories of the documents it returned, a directory is
+    removed with the last task owning it.
+    """
+
+    def __init__(self, figures_dir: Path):
+        self.figures_dir = figures_dir
+        self._task_dirs: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _dir_of(figure_id: str) -> str:
+        return figure_id.split("/", 1)[0]
+
+    def add(self, task_id: str, figure_ids: Iterable[str]) -> None:
+        """Record the figures returned to a task."""
+        dirs = {self._dir_of(figure_id) for figure_id in figure_ids}
+        if not dirs:
+            return
+        with self._lock:
+            self._task_dirs.setdefault(task_id, set()).update(dirs)
+
+    def path(self, task_id: str, figure_id: str) -> Optional[Path]:
+        """File of a figure owned by the task, None if there is none."""
+        with self._lock:
+            if self._dir_of(figure_id) not in self._task_dirs.get(task_id, ()):
+                return None
+        figures_dir = self.figures_dir.resolve()
+        figure_path = (figures_dir / figure_id).resolve()
+        if not figure_path.is_relative_to(figures_dir) or not figure_path.is_file():
+            return None
+        return figure_path
+
+    def release(self, task_id: str) -> None:
+        """Forget a task, deleting the figure directories no other task owns."""
+        with self._lock:
+            dirs = self._task_dirs.pop(task_id, set())
+            for other in self._task_dirs.values():
+                dirs -= other
+        for name in dirs:
+            shutil.rmtree(self.figures_dir / name, ignore_errors=True)
+
+
+@lru_cache
+def get_figure_store() -> FigureStore:
+    return FigureStore(get_figures_dir())
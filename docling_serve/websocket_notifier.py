@@ -1,3 +1,6 @@
+import asyncio
+from typing import Optional
+
 from fastapi import WebSocket
 
 from docling_jobkit.datamodel.task_meta import TaskStatus
@@ -15,9 +18,11 @@ class WebsocketNotifier(BaseNotifier):
     def __init__(self, orchestrator: BaseOrchestrator):
         super().__init__(orchestrator)
         self.task_subscribers: dict[str, set[WebSocket]] = {}
+        self.task_events: dict[str, asyncio.Event] = {}
 
     async def add_task(self, task_id: str):
         self.task_subscribers[task_id] = set()
+        self.task_events[task_id] = asyncio.Event()
 
     async def remove_task(self, task_id: str):
         if task_id in self.task_subscribers:
@@ -26,10 +31,27 @@ class WebsocketNotifier(BaseNotifier):
 
             del self.task_subscribers[task_id]
 
+        # Wake up any waiter, the task is gone
+        self._signal_task_update(task_id)
+        self.task_events.pop(task_id, None)
+
+    def get_update_event(self, task_id: str) -> Optional[asyncio.Event]:
+        """Event set at the next notification for the task, None if not tracked here."""
+        return self.task_events.get(task_id)
+
+    def _signal_task_update(self, task_id: str):
+        event = self.task_events.get(task_id)
+        if event is not None:
+            # Release the current waiters and arm a fresh event for the next update
+            event.set()
+            self.task_events[task_id] = asyncio.Event()
+
     async def notify_task_subscribers(self, task_id: str):
         if task_id not in self.task_subscribers:
             raise RuntimeError(f"Task {task_id} does not have a subscribers list.")
 
+        self._signal_task_update(task_id)
+
         try:
             # Get task status from Redis or RQ directly instead of in-memory registry
             task = await self.orchestrator.task_status(task_id=task_id)
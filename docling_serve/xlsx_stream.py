@@ -0,0 +1,422 @@
+"""
+Streaming access to the chart metadata of an OOXML workbook.
+
+The Excel chart extraction only needs the sheet names, the charts and a few
+cell ranges, but openpyxl in full mode builds the object model of every cell
+of every sheet. StreamingWorkbook opens the workbook in read-only mode, reads
+the drawing and chart parts of each sheet with openpyxl's own chart reader and
+reads cell values on demand by streaming the sheet XML with iterparse, keeping
+only the requested range. The ranges known up front can be prefetched: they
+are merged per sheet and read in a single pass into compact row arrays, which
+serve all the later reads.
+
+It implements the subset of the Workbook/Worksheet API used by the chart
+extraction (sheetnames, wb[name], ws._charts, ws.cell(), ws.iter_rows(values_only=True))
+and returns the same values as a workbook loaded with load_workbook(data_only=True).
+Cell objects (iter_rows(values_only=False)) are not supported: they would need the
+workbook loaded in full mode, which this module exists to avoid.
+
+The streaming relies on openpyxl internals (the read-only worksheet, the sheet
+parser and the drawing readers), the openpyxl versions it supports are pinned in
+pyproject.toml and tests/test_xlsx_stream.py compares it with load_workbook().
+"""
+
+from typing import Any, NamedTuple, Optional
+from warnings import warn
+
+from openpyxl import load_workbook
+from openpyxl.chart.chartspace import ChartSpace
+from openpyxl.chart.reader import read_chart
+from openpyxl.comments.comment_sheet import CommentSheet
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing
+from openpyxl.packaging.relationship import (
+    RelationshipList,
+    get_dependents,
+    get_rel,
+    get_rels_path,
+)
+from openpyxl.utils import coordinate_to_tuple, range_boundaries
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from openpyxl.worksheet._reader import (
+    HYPERLINK_TAG,
+    MERGE_TAG,
+    ROW_TAG,
+    WorkSheetParser,
+)
+from openpyxl.worksheet.hyperlink import HyperlinkList
+from openpyxl.worksheet.merge import MergeCells
+from openpyxl.xml.constants import COMMENTS_NS
+from openpyxl.xml.functions import fromstring, iterparse
+
+
+class _Cell(NamedTuple):
+    value: Any
+
+
+def _find_charts(archive, path: str) -> list:
+    """Charts of a drawing part, read like openpyxl.reader.drawings.find_images() without the images."""
+    tree = fromstring(archive.read(path))
+    try:
+        drawing = SpreadsheetDrawing.from_tree(tree)
+    except TypeError:
+        return []
+
+    rels_path = get_rels_path(path)
+    deps = []
+    if rels_path in archive.namelist():
+        deps = get_dependents(archive, rels_path)
+
+    charts = []
+    for rel in drawing._chart_rels:
+        try:
+            cs = get_rel(archive, deps, rel.id, ChartSpace)
+        except TypeError as e:
+            warn(f"Unable to read chart {rel.id} from {path} {e}")
+            continue
+        chart = read_chart(cs)
+        chart.anchor = rel.anchor
+        charts.append(chart)
+    return charts
+
+
+def _row_index(parser: WorkSheetParser, element) -> int:
+    """Advance the parser row counter like WorkSheetParser.parse_row()."""
+    r = element.get("r")
+    if r is not None:
+        try:
+            parser.row_counter = int(r)
+        except ValueError:
+            val = float(r)
+            if not val.is_integer():
+                raise ValueError(f"{r} is not a valid row number")
+            parser.row_counter = int(val)
+    else:
+        parser.row_counter += 1
+    parser.col_counter = 0
+    return parser.row_counter
+
+
+class StreamingWorksheet:
+    """Worksheet whose cell values are streamed from the sheet XML on demand."""
+
+    def __init__(
+        self,
+        ws: ReadOnlyWorksheet,
+        rels: RelationshipList,
+        charts: list,
+    ):
+        self.title = ws.title
+        self._ws = ws
+        self._rels = rels
+        self._charts = charts
+        # Cells visited so far: in full mode openpyxl creates them, extending max_row/max_column
+        self._touched_row = 0
+        self._touched_col = 0
+        # Merged ranges and dimensions, read once with the first access
+        self._merged: Optional[list[tuple[int, int, int, int]]] = None
+        self._extents = (0, 0)
+        # Prefetched ((min_col, min_row, max_col, max_row), rows of values) regions
+        self._regions: list[tuple[tuple[int, int, int, int], list[tuple]]] = []
+
+    def cell(self, row: int, column: int) -> _Cell:
+        if row < 1 or column < 1:
+            raise ValueError("Row or column values must be at least 1")
+        (values,) = self.iter_rows(
+            min_row=row, max_row=row, min_col=column, max_col=column, values_only=True
+        )
+        return _Cell(values[0])
+
+    def iter_rows(
+        self,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        min_col: Optional[int] = None,
+        max_col: Optional[int] = None,
+        values_only: bool = False,
+    ) -> list[tuple]:
+        if not values_only:
+            raise ValueError(
+                "StreamingWorksheet only reads cell values, use values_only=True"
+            )
+
+        self._read_layout()
+        min_col = min_col or 1
+        min_row = min_row or 1
+        # Open ranges end at the worksheet dimensions, as in Worksheet.iter_rows()
+        max_row = max_row or max(self._extents[0], self._touched_row) or 1
+        max_col = max_col or max(self._extents[1], self._touched_col) or 1
+
+        rows = self._read_rows(min_row, max_row, min_col, max_col)
+        self._touched_row = max(self._touched_row, max_row)
+        self._touched_col = max(self._touched_col, max_col)
+        return rows
+
+    def _parser(self) -> WorkSheetParser:
+        wb = self._ws.parent
+        return WorkSheetParser(
+            None,
+            self._ws._shared_strings,
+            data_only=wb.data_only,
+            epoch=wb.epoch,
+            date_formats=wb._date_formats,
+            timedelta_formats=wb._timedelta_formats,
+        )
+
+    def _read_layout(self) -> None:
+        """
+        Read the merged ranges and the dimensions of the cells openpyxl creates in
+        full mode (cells, merged ranges, hyperlinks, comments), without the values.
+        """
+        if self._merged is not None:
+            return
+
+        wb = self._ws.parent
+        parser = self._parser()
+        ext_row = ext_col = 0
+        refs: list[str] = []
+        with wb._archive.open(self._ws._worksheet_path) as src:
+            for _, element in iterparse(src):
+                tag = element.tag
+                if tag == ROW_TAG:
+                    row_idx = _row_index(parser, element)
+                    if len(element):
+                        # Cells are ordered in a row, the last one has the largest column
+                        coordinate = element[-1].get("r")
+                        if coordinate:
+                            row, col = coordinate_to_tuple(coordinate)
+                            row = max(row, row_idx)
+                        else:
+                            row, col = row_idx, len(element)
+                        ext_row = max(ext_row, row)
+                        ext_col = max(ext_col, col)
+                    element.clear()
+                elif tag == MERGE_TAG:
+                    refs.extend(
+                        cr.ref for cr in MergeCells.from_tree(element).mergeCell
+                    )
+                    element.clear()
+                elif tag == HYPERLINK_TAG:
+                    links = HyperlinkList.from_tree(element).hyperlink
+                    ext_row, ext_col = _extend(
+                        ext_row, ext_col, [link.ref for link in links]
+                    )
+                    element.clear()
+
+        self._merged = [range_boundaries(ref) for ref in refs]
+        for rel in self._rels.find(COMMENTS_NS):
+            comment_sheet = CommentSheet.from_tree(
+                fromstring(wb._archive.read(rel.target))
+            )
+            ext_row, ext_col = _extend(
+                ext_row, ext_col, [ref for ref, _ in comment_sheet.comments]
+            )
+        self._extents = _extend(ext_row, ext_col, refs)
+
+    def prefetch(self, rects: list[tuple[int, int, int, int]]) -> None:
+        """
+        Read the given (min_col, min_row, max_col, max_row) ranges in a single pass and
+        keep them for the next reads. Overlapping ranges are merged into one region.
+        Open bounds (None) extend to the worksheet dimensions.
+        """
+        self._read_layout()
+        max_row = max(self._extents[0], self._touched_row) or 1
+        max_col = max(self._extents[1], self._touched_col) or 1
+        rects = [
+            (min_col or 1, min_row or 1, r_max_col or max_col, r_max_row or max_row)
+            for min_col, min_row, r_max_col, r_max_row in rects
+        ]
+        regions = _merge_rects([r for r in rects if self._cached_region(*r) is None])
+        if not regions:
+            return
+        for region, rows in zip(regions, self._read_regions(regions)):
+            self._regions.append((region, rows))
+
+    def _cached_region(self, min_col: int, min_row: int, max_col: int, max_row: int):
+        for (r_min_col, r_min_row, r_max_col, r_max_row), rows in self._regions:
+            if (
+                r_min_row <= min_row
+                and max_row <= r_max_row
+                and r_min_col <= min_col
+                and max_col <= r_max_col
+            ):
+                return (r_min_col, r_min_row), rows
+        return None
+
+    def _read_rows(
+        self, min_row: int, max_row: int, min_col: int, max_col: int
+    ) -> list[tuple]:
+        cached = self._cached_region(min_col, min_row, max_col, max_row)
+        if cached is None:
+            (rows,) = self._read_regions([(min_col, min_row, max_col, max_row)])
+            return rows
+
+        (r_min_col, r_min_row), region_rows = cached
+        col_start = min_col - r_min_col
+        col_end = max_col - r_min_col + 1
+        return [
+            tuple(region_rows[row - r_min_row][col_start:col_end])
+            for row in range(min_row, max_row + 1)
+        ]
+
+    def _read_regions(
+        self, regions: list[tuple[int, int, int, int]]
+    ) -> list[list[tuple]]:
+        """
+        Stream the sheet XML once up to the last row of the regions, parsing only
+        the rows inside them. Returns the values of every region as rows of cells.
+        """
+        wb = self._ws.parent
+        parser = self._parser()
+        arrays = [
+            [[None] * (max_col - min_col + 1) for _ in range(min_row, max_row + 1)]
+            for min_col, min_row, max_col, max_row in regions
+        ]
+        last_row = max(region[3] for region in regions)
+        first_row = min(region[1] for region in regions)
+
+        with wb._archive.open(self._ws._worksheet_path) as src:
+            for _, element in iterparse(src):
+                if element.tag != ROW_TAG:
+                    continue
+                row_idx = _row_index(parser, element)
+                if row_idx > last_row:
+                    break
+                if row_idx >= first_row and any(
+                    region[1] <= row_idx <= region[3] for region in regions
+                ):
+                    for el in element:
+                        cell = parser.parse_cell(el)
+                        row, col = cell["row"], cell["column"]
+                        for (min_col, min_row, max_col, max_row), array in zip(
+                            regions, arrays
+                        ):
+                            if min_row <= row <= max_row and min_col <= col <= max_col:
+                                array[row - min_row][col - min_col] = cell["value"]
+                element.clear()
+
+        for (min_col, min_row, max_col, max_row), array in zip(regions, arrays):
+            # Merged cells other than the top-left one have no value
+            for m_min_col, m_min_row, m_max_col, m_max_row in self._merged or []:
+                for row in range(max(m_min_row, min_row), min(m_max_row, max_row) + 1):
+                    for col in range(
+                        max(m_min_col, min_col), min(m_max_col, max_col) + 1
+                    ):
+                        if (row, col) != (m_min_row, m_min_col):
+                            array[row - min_row][col - min_col] = None
+
+        return [[tuple(row) for row in array] for array in arrays]
+
+
+def _merge_rects(
+    rects: list[tuple[int, int, int, int]],
+) -> list[tuple[int, int, int, int]]:
+    """
+    Merge overlapping (min_col, min_row, max_col, max_row) ranges into their bounding
+    box, as long as the box is not larger than the ranges it replaces.
+    """
+
+    def area(r):
+        return (r[2] - r[0] + 1) * (r[3] - r[1] + 1)
+
+    regions = sorted(set(rects))
+    merged = True
+    while merged:
+        merged = False
+        out: list[tuple[int, int, int, int]] = []
+        for rect in regions:
+            for i, other in enumerate(out):
+                box = (
+                    min(rect[0], other[0]),
+                    min(rect[1], other[1]),
+                    max(rect[2], other[2]),
+                    max(rect[3], other[3]),
+                )
+                overlaps = (
+                    rect[0] <= other[2] + 1
+                    and other[0] <= rect[2] + 1
+                    and rect[1] <= other[3] + 1
+                    and other[1] <= rect[3] + 1
+                )
+                if overlaps and area(box) <= area(rect) + area(other):
+                    out[i] = box
+                    merged = True
+                    break
+            else:
+                out.append(rect)
+        regions = out
+    return regions
+
+
+def _extend(ext_row: int, ext_col: int, refs: list[str]) -> tuple[int, int]:
+    for ref in refs:
+        _, _, max_col, max_row = range_boundaries(ref)
+        ext_row = max(ext_row, max_row)
+        ext_col = max(ext_col, max_col)
+    return ext_row, ext_col
+
+
+class StreamingWorkbook:
+    """
+    Read-only workbook exposing sheet names, charts and streamed cell values.
+
+    Args:
+        file_obj: Binary file object of the .xlsx/.xlsm workbook
+    """
+
+    def __init__(self, file_obj):
+        self._wb = load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            self._sheets = {
+                name: self._load_sheet(ws) if isinstance(ws, ReadOnlyWorksheet) else ws
+                for name, ws in zip(self._wb.sheetnames, self._wb._sheets)
+            }
+        except Exception:
+            self.close()
+            raise
+
+        self._names_ci: dict[str, str] = {}
+        for name in self._wb.sheetnames:
+            self._names_ci.setdefault(name.lower(), name)
+
+    @property
+    def sheetnames(self) -> list[str]:
+        return self._wb.sheetnames
+
+    def resolve_sheet_name(self, name: str) -> Optional[str]:
+        """The sheet called name, else the first one matching it case-insensitively."""
+        if name in self._sheets:
+            return name
+        return self._names_ci.get(name.lower())
+
+    def prefetch(self, ranges: list[tuple[str, tuple[int, int, int, int]]]) -> None:
+        """
+        Read the (sheet name, (min_col, min_row, max_col, max_row)) ranges with one
+        pass per sheet, so the next reads of these ranges do not parse the sheet again.
+        """
+        by_sheet: dict[str, list] = {}
+        for sheet_name, bounds in ranges:
+            by_sheet.setdefault(sheet_name, []).append(bounds)
+        for sheet_name, rects in by_sheet.items():
+            sheet = self._sheets.get(sheet_name)
+            if isinstance(sheet, StreamingWorksheet):
+                sheet.prefetch(rects)
+
+    def __getitem__(self, name: str):
+        if name not in self._sheets:
+            raise KeyError(f"Worksheet {name} does not exist.")
+        return self._sheets[name]
+
+    def close(self) -> None:
+        self._wb.close()
+
+    def _load_sheet(self, ws: ReadOnlyWorksheet) -> StreamingWorksheet:
+        archive = self._wb._archive
+        rels_path = get_rels_path(ws._worksheet_path)
+        rels = RelationshipList()
+        if rels_path in archive.namelist():
+            rels = get_dependents(archive, rels_path)
+
+        charts = []
+        for rel in rels.find(SpreadsheetDrawing._rel_type):
+            charts.extend(_find_charts(archive, rel.target))
+        return StreamingWorksheet(ws, rels, charts)
@@ -1,5 +1,4 @@
 import json
-import time
 from pathlib import Path
 
 import httpx
@@ -8,6 +7,9 @@ from pypdf import PdfReader
 
 from docling_core.types.doc.document import DoclingDocument
 
+# Client-side splitting. With the custom converter, the server can instead split large
+# PDFs itself by setting DOCLING_SERVE_PDF_SHARD_MIN_PAGES (see docs/configuration.md).
+
 # Variables to use
 path_to_pdf = Path("./tests/2206.01062v1.pdf")
 pages_per_file = 4
@@ -29,19 +31,23 @@ def get_task_result(task_id: str):
     return response.json()
 
 
-def check_task_status(task_id: str):
-    response = httpx.get(f"{base_url}/status/poll/{task_id}", timeout=15)
-    task = response.json()
-    task_status = task["task_status"]
-
-    task_finished = False
-    if task_status == "success":
-        task_finished = True
+def wait_tasks(task_ids: list[str], wait: float = 30):
+    # Long-poll the status of all the tasks until they are all completed
+    response = httpx.post(
+        f"{base_url}/status/poll",
+        json={"task_ids": task_ids, "wait": wait, "wait_for": "all"},
+        timeout=wait + 15,
+    )
+    statuses = response.json()
 
-    if task_status in ("failure", "revoked"):
-        raise RuntimeError("A conversion failed")
+    if statuses["not_found"]:
+        raise RuntimeError(f"Unknown tasks: {statuses['not_found']}")
 
-    time.sleep(5)
+    task_finished = {}
+    for task in statuses["tasks"]:
+        if task["task_status"] in ("failure", "revoked"):
+            raise RuntimeError("A conversion failed")
+        task_finished[task["task_id"]] = task["task_status"] == "success"
 
     return task_finished
 
@@ -85,18 +91,17 @@ def main():
             )
             splitted_pdfs.append(ConvertedSplittedPdf(task_id=task_id))
 
-    all_files_converted = False
-    while not all_files_converted:
-        found_conversion_running = False
-        for splitted_pdf in splitted_pdfs:
-            if not splitted_pdf.conversion_finished:
-                found_conversion_running = True
-                print("checking conversion status...")
-                splitted_pdf.conversion_finished = check_task_status(
-                    splitted_pdf.task_id
-                )
-        if not found_conversion_running:
-            all_files_converted = True
+    running = splitted_pdfs
+    while running:
+        print(f"checking conversion status of {len(running)} tasks...")
+        task_finished = wait_tasks([splitted_pdf.task_id for splitted_pdf in running])
+        for splitted_pdf in running:
+            splitted_pdf.conversion_finished = task_finished[splitted_pdf.task_id]
+        running = [
+            splitted_pdf
+            for splitted_pdf in splitted_pdfs
+            if not splitted_pdf.conversion_finished
+        ]
 
     for splitted_pdf in splitted_pdfs:
         splitted_pdf.result = get_task_result(splitted_pdf.task_id)
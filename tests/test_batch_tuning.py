@@ -0,0 +1,74 @@
+import pytest
+
+from docling_serve import batch_tuning as batch_tuning_module, docling_test
+from docling_serve.batch_tuning import (
+    BatchSizeController,
+    BatchTuning,
+    BatchTuningRegistry,
+)
+
+
+@pytest.fixture
+def rss(monkeypatch):
+    value = {"rss": None}
+    monkeypatch.setattr(batch_tuning_module, "current_rss", lambda: value["rss"])
+    return value
+
+
+def test_shrinks_to_the_pages_fitting_the_target(rss):
+    controller = BatchSizeController("layout", 64, BatchTuning(target_seconds=10))
+
+    assert controller.observe(64, 64.0) == 10
+    assert controller.stats()["adjustments"] == 1
+
+
+def test_doubles_after_a_fast_full_batch(rss):
+    controller = BatchSizeController("layout", 64, BatchTuning(target_seconds=10))
+    controller.size = 8
+
+    # Partial batches do not show whether a larger one fits
+    assert controller.observe(4, 0.4) == 8
+    assert controller.observe(8, 0.8) == 16
+    assert controller.observe(16, 1.6) == 32
+    assert controller.observe(32, 3.2) == 64
+    assert controller.observe(64, 6.4) == 64
+
+
+def test_halves_above_max_rss(rss):
+    controller = BatchSizeController(
+        "table", 64, BatchTuning(min_size=8, target_seconds=10, max_rss=1000)
+    )
+    rss["rss"] = 2000
+
+    assert [controller.observe(64, 0.1) for _ in range(4)] == [32, 16, 8, 8]
+
+    # No growth close to the limit
+    rss["rss"] = 900
+    assert controller.observe(8, 0.1) == 8
+    rss["rss"] = 100
+    assert controller.observe(8, 0.1) == 16
+
+
+def test_registry_keeps_existing_controllers(rss):
+    registry = BatchTuningRegistry()
+    registry.configure("key", {"layout": 64, "table": 32}, BatchTuning())
+    registry.controllers("key")["layout"].size = 16
+    registry.configure("key", {"layout": 64}, BatchTuning())
+
+    stats = registry.stats()["key"]
+    assert stats["layout"]["batch_size"] == 16
+    assert stats["table"]["max_size"] == 32
+    assert registry.controllers("other") == {}
+
+
+def test_adaptive_batching_warns_without_pipeline_support(monkeypatch, caplog):
+    monkeypatch.setattr(docling_test, "_ADAPTIVE_BATCHING_SUPPORTED", False)
+    configured = []
+    monkeypatch.setattr(
+        docling_test.batch_tuning, "configure", lambda *args: configured.append(args)
+    )
+
+    docling_test.DoclingParser(docling_test.ParserConfig(adaptive_batching=True))
+
+    assert configured == []
+    assert "batch sizes stay fixed" in caplog.text
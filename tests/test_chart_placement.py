@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from docling_serve.docling_test import (
+    DoclingParser,
+    ParserConfig,
+    _normalize_ws,
+    _NormalizedText,
+)
+
+PAGE = (
+    "## Revenue\n\nRevenue  grew in\nthe third quarter.\n\n"
+    "| a | b |\n|---|---|\n| 1 | 2 |\n\n"
+    "## Costs\n\nCosts were stable over the year.\n\nClosing remarks."
+)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return DoclingParser(ParserConfig())
+
+
+def _chart(title: str, pre_text: str = "", post_text: str = "") -> dict[str, str]:
+    return {
+        "title": title,
+        "table": f"| {title} |\n|---|",
+        "pre_text": pre_text,
+        "post_text": post_text,
+    }
+
+
+def test_charts_placed_after_their_context(parser):
+    charts = [
+        _chart("Revenue", pre_text="the third quarter."),
+        _chart("Costs", post_text="Closing remarks."),
+    ]
+
+    text = parser._insert_charts_at_position(PAGE, charts)
+
+    assert text.index("# Chart: Revenue") > text.index("third quarter")
+    assert text.index("# Chart: Revenue") < text.index("## Costs")
+    assert text.index("# Chart: Costs") < text.index("Closing remarks.")
+    assert (
+        text.replace("\n# Chart: Revenue\n| Revenue |\n|---|\n", "").replace(
+            "\n# Chart: Costs\n| Costs |\n|---|\n", ""
+        )
+        == PAGE
+    )
+
+
+def test_unmatched_chart_appended(parser):
+    text = parser._insert_charts_at_position(PAGE, [_chart("Other", "not on page")])
+
+    assert text == PAGE + "\n# Chart: Other\n| Other |\n|---|\n"
+
+
+def test_single_scan_matches_rebuild(parser):
+    # The rebuild inserts charts one at a time in the growing string
+    rng = random.Random(0)
+    words = PAGE.split()
+    for _ in range(200):
+        charts = []
+        for i in range(rng.randint(1, 4)):
+            start = rng.randrange(len(words))
+            context = " ".join(words[start : start + rng.randint(0, 4)])
+            if rng.random() < 0.2:
+                context = "missing text"
+            if rng.random() < 0.5:
+                charts.append(_chart(f"c{i}", pre_text=context))
+            else:
+                charts.append(_chart(f"c{i}", post_text=context))
+
+        assert parser._insert_charts_at_position(
+            PAGE, charts
+        ) == parser._insert_charts_by_rebuild(PAGE, charts, 0)
+
+
+def test_normalized_text_contains():
+    index = _NormalizedText(PAGE)
+    for start in range(0, len(PAGE), 7):
+        for needle in ("Revenue grew in the", "stable over", "| 1 | 2 |", "absent"):
+            assert index.contains(needle, start) == (
+                needle in _normalize_ws(PAGE[start:])
+            )
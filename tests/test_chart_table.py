@@ -0,0 +1,51 @@
+import datetime as dt
+
+import pytest
+
+from docling_serve.chart_table import render_chart_table
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("tabulate")
+
+CASES = {
+    "ints": (["Q1", "Q2", "Q3"], {"Sales": [10, 12, 9], "Costs": [4, 5, 6]}),
+    "ints and floats": (["Q1", "Q2"], {"Sales": [10, 12.25], "Costs": [4, 5]}),
+    "missing values": (["Q1", "Q2", "Q3"], {"Sales": [1.5, None, 3]}),
+    "mixed columns": (["a", "b"], {"Name": ["x", "y"], "Value": [1, 2.5]}),
+    "numeric index": ([2022, 2023, 2024], {"Revenue": [1e6, 2.5e6, 1e-7]}),
+    "float index": ([0.5, 1.25], {"v": [1, 2]}),
+    "bools": (["a", "b"], {"Flag": [True, False]}),
+    "dates": (
+        ["a", "b"],
+        {"Date": [dt.datetime(2024, 1, 31), dt.datetime(2024, 2, 1, 12, 30)]},
+    ),
+    "durations": (["a", "b"], {"Time": [dt.timedelta(days=1), dt.timedelta(-1, 5)]}),
+    "date index": ([dt.datetime(2024, 1, 1), dt.datetime(2024, 6, 1)], {"v": [1, 2]}),
+    "uint64": (["a", "b"], {"Big": [2**63, 2**64 - 1]}),
+    "beyond int64 with negatives": (["a", "b"], {"Big": [2**63, -1]}),
+    "numeric strings": (["a", "b", "c"], {"Text": ["1", "2.50", "x"]}),
+    "multiline": (["first\nline", "b"], {"Value": ["two\nlines", "one"]}),
+    "wide characters": (["매출", "비용"], {"금액": [100, 2000]}),
+    "no series": (["a", "b"], {}),
+    "no categories": ([], {"Sales": []}),
+}
+
+
+@pytest.mark.parametrize("categories,series", CASES.values(), ids=list(CASES))
+def test_matches_pandas_to_markdown(categories, series):
+    expected = pd.DataFrame(series, index=categories).to_markdown()
+
+    assert render_chart_table(categories, series) == expected
+
+
+def test_missing_dates_kept_as_objects():
+    # pandas turns the None into NaT, which tabulate cannot format: the
+    # documented difference, chart values are never missing dates
+    series = {"Date": [dt.datetime(2024, 1, 31), None]}
+
+    assert render_chart_table(["a", "b"], series) == (
+        "|    | Date                |\n"
+        "|:---|:--------------------|\n"
+        "| a  | 2024-01-31 00:00:00 |\n"
+        "| b  |                     |"
+    )
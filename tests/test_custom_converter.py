@@ -0,0 +1,82 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from docling_core.types.io import DocumentStream
+from docling_jobkit.convert.manager import DoclingConverterManagerConfig
+from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
+
+from docling_serve import docling_test
+from docling_serve.custom_converter import CustomConverterManager
+from docling_serve.docling_test import Document, Figure, ParserConfig
+
+
+class _FakeDocTool:
+    def __init__(self, config):
+        self.config = config
+        self.closed = False
+
+        self.converted: list[str] = []
+
+    def run_iter(self, file_dict, page_range=None, content_hashes=None):
+        for name in file_dict:
+            self.converted.append(name)
+            figure = Figure.from_image(
+                id=f"{name}/fig.png", image=Image.new("RGB", (2, 2))
+            )
+            images = [figure] if name.startswith("figures") else []
+            yield Document(id=name, text=f"# {name}", images=images)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(docling_test, "DocTool", _FakeDocTool)
+    return CustomConverterManager(DoclingConverterManagerConfig(options_cache_size=2))
+
+
+def test_evicted_doc_tools_closed(manager):
+    configs = [ParserConfig(images_scale=scale) for scale in (1.0, 2.0, 3.0)]
+    tools = [manager.get_doc_tool(config) for config in configs]
+
+    assert manager.get_doc_tool(configs[2]) is tools[2]
+    assert [tool.closed for tool in tools] == [True, False, False]
+
+
+def test_clear_cache_closes_doc_tools(manager):
+    tools = [
+        manager.get_doc_tool(ParserConfig(images_scale=scale)) for scale in (1.0, 2.0)
+    ]
+
+    manager.clear_cache()
+
+    assert all(tool.closed for tool in tools)
+    assert manager.get_doc_tool(ParserConfig(images_scale=1.0)) is not tools[0]
+
+
+def test_uncached_doc_tools_closed(manager):
+    manager.config.options_cache_size = 0
+
+    assert manager.get_doc_tool(ParserConfig()).closed
+
+
+def test_documents_with_figures_not_cached_without_figures_dir(manager):
+    assert manager.parser_config.figures_dir is None
+    options = ConvertDocumentsOptions()
+    tool = manager.get_doc_tool(manager.get_parser_config(options))
+
+    def convert(name):
+        source = DocumentStream(name=name, stream=BytesIO(b"%PDF-" + name.encode()))
+        return list(manager.convert_documents([source], options))
+
+    for _ in range(2):
+        (result,) = convert("figures.pdf")
+        # The figure payloads are still available on the second conversion
+        assert result._custom_images[0].data
+        (result,) = convert("text.pdf")
+        assert result._custom_markdown == "# text.pdf"
+
+    assert tool.converted == ["figures.pdf", "text.pdf", "figures.pdf"]
@@ -0,0 +1,10 @@
+from docling_serve.docling_test import DoclingParser
+
+
+def test_chart_categories_fitted_to_series_length():
+    fit = DoclingParser._fit_chart_categories
+
+    assert fit(["a", "b"], 2) == ["a", "b"]
+    assert fit([], 2) == ["Item 1", "Item 2"]
+    assert fit([1], 3) == ["1", "Item 2", "Item 3"]
+    assert fit([1, 2, 3], 2) == ["1", "2"]
@@ -14,6 +14,7 @@ from docling_core.types.doc import DoclingDocument, PictureItem
 
 from docling_serve.app import create_app
 from docling_serve.settings import docling_serve_settings
+from docling_serve.storage import get_figure_store
 
 
 @pytest.fixture(scope="session")
@@ -62,6 +63,17 @@ async def test_openapijson(client: AsyncClient):
     assert "openapi" in schema
 
 
+@pytest.mark.asyncio
+async def test_status_poll_batch(client: AsyncClient, auth_headers: dict):
+    response = await client.post(
+        "/v1/status/poll",
+        json={"task_ids": ["missing-task", "missing-task"], "wait": 0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"tasks": [], "not_found": ["missing-task"]}
+
+
 @pytest.mark.asyncio
 async def test_convert_file(client: AsyncClient, auth_headers: dict):
     """Test convert single file to all outputs"""
@@ -212,3 +224,30 @@ async def test_referenced_artifacts(client: AsyncClient, auth_headers: dict):
                         assert item.image is not None
                         print(f"{item.image.uri}=")
                         assert str(item.image.uri) in namelist
+
+
+@pytest.mark.asyncio
+async def test_figure_served_to_its_task_only(
+    client: AsyncClient, auth_headers: dict, monkeypatch
+):
+    monkeypatch.setattr(docling_serve_settings, "enable_figures_endpoint", True)
+    store = get_figure_store()
+    figure_path = store.figures_dir / "0123456789abcdef" / "report" / "fig.png"
+    figure_path.parent.mkdir(parents=True, exist_ok=True)
+    figure_path.write_bytes(b"png")
+    store.add("task-a", ["0123456789abcdef/report/fig.png"])
+    try:
+        response = await client.get(
+            "/v1/figures/task-a/0123456789abcdef/report/fig.png", headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.content == b"png"
+        assert response.headers["content-type"] == "image/png"
+
+        response = await client.get(
+            "/v1/figures/task-b/0123456789abcdef/report/fig.png", headers=auth_headers
+        )
+        assert response.status_code == 404
+    finally:
+        store.release("task-a")
+    assert not figure_path.exists()
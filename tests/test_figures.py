@@ -0,0 +1,142 @@
+import base64
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.datamodel.task_targets import InBodyTarget
+
+from docling_serve.docling_test import (
+    DoclingParser,
+    Figure,
+    ParserConfig,
+    _BoundedExecutor,
+)
+from docling_serve.orchestrator_factory import get_async_orchestrator
+from docling_serve.settings import docling_serve_settings
+from docling_serve.storage import FigureStore, get_figure_store
+
+
+def _write(store: FigureStore, figure_id: str) -> None:
+    path = store.figures_dir / figure_id
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"image")
+
+
+def test_figure_key_depends_on_content(tmp_path):
+    parser = DoclingParser(ParserConfig(figures_dir=tmp_path))
+    first = parser._figure_key("report.pdf", "a" * 64)
+    second = parser._figure_key("report.pdf", "b" * 64)
+
+    assert first == f"{'a' * 16}/report"
+    assert first != second
+
+
+def test_figure_key_unchanged_without_figures_dir():
+    parser = DoclingParser(ParserConfig())
+
+    assert parser._figure_key("report.pdf", "a" * 64) == "report"
+
+
+def test_store_serves_owned_figures_only(tmp_path):
+    store = FigureStore(tmp_path)
+    _write(store, "hash1/report/page_0001/fig.png")
+    store.add("task-a", ["hash1/report/page_0001/fig.png"])
+
+    assert store.path("task-a", "hash1/report/page_0001/fig.png") is not None
+    assert store.path("task-b", "hash1/report/page_0001/fig.png") is None
+    assert store.path("task-a", "hash1/report/page_0001/missing.png") is None
+    assert store.path("task-a", "hash1/../../outside.png") is None
+
+
+def test_store_keeps_shared_directories_until_last_owner(tmp_path):
+    store = FigureStore(tmp_path)
+    _write(store, "hash1/report/fig.png")
+    _write(store, "hash2/other/fig.png")
+    store.add("task-a", ["hash1/report/fig.png", "hash2/other/fig.png"])
+    store.add("task-b", ["hash1/report/fig.png"])
+
+    store.release("task-a")
+    assert (tmp_path / "hash1").exists()
+    assert not (tmp_path / "hash2").exists()
+
+    store.release("task-b")
+    assert not (tmp_path / "hash1").exists()
+
+
+@pytest.mark.asyncio
+async def test_deleted_task_releases_its_figures(monkeypatch):
+    monkeypatch.setattr(docling_serve_settings, "enable_figures_endpoint", True)
+    orchestrator = get_async_orchestrator()
+    options = ConvertDocumentsOptions()
+    # Tracked without being queued, so no worker picks it up
+    task = Task(
+        task_id="figures-task",
+        sources=[],
+        target=InBodyTarget(),
+        convert_options=options,
+    )
+    await orchestrator.init_task_tracking(task)
+    assert orchestrator.cm._task_ids[id(options)] == task.task_id
+
+    store = get_figure_store()
+    _write(store, "hash-deleted/report/fig.png")
+    store.add(task.task_id, ["hash-deleted/report/fig.png"])
+
+    await orchestrator.delete_task(task.task_id)
+
+    assert id(options) not in orchestrator.cm._task_ids
+    assert store.path(task.task_id, "hash-deleted/report/fig.png") is None
+    assert not (store.figures_dir / "hash-deleted").exists()
+
+
+def test_figure_data_encoded_on_first_access():
+    image = Image.new("RGB", (4, 4), "red")
+    figure = Figure.from_image(id="hash1/report/fig.png", image=image)
+
+    assert figure._data is None
+    payload = base64.b64decode(figure.data)
+    assert Image.open(io.BytesIO(payload)).size == (4, 4)
+    assert figure._image is None
+
+
+def test_figure_spilled_on_background_pool(tmp_path):
+    executor = _BoundedExecutor(max_workers=1, max_pending=1)
+    figures = [
+        Figure.from_image(id=f"hash1/report/fig{i}.png", image=Image.new("L", (2, 2)))
+        for i in range(3)
+    ]
+    try:
+        for figure in figures:
+            figure.spill(tmp_path, executor)
+        # get_bytes() waits for the background write
+        assert all(figure.get_bytes() for figure in figures)
+    finally:
+        executor.shutdown()
+
+    assert sorted(p.name for p in (tmp_path / "hash1" / "report").iterdir()) == [
+        "fig0.png",
+        "fig1.png",
+        "fig2.png",
+    ]
+
+
+def test_bounded_executor_blocks_past_max_pending():
+    executor = _BoundedExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        executor.submit(release.wait)
+        second = threading.Thread(target=executor.submit, args=(lambda: None,))
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()
+
+        release.set()
+        second.join(5)
+        assert not second.is_alive()
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+FORMAT_MODULES = ["pptx", "openpyxl", "docling.document_converter"]
+
+
+def _loaded_after(code: str) -> list[str]:
+    script = (
+        f"import json, sys\n{code}\n"
+        f"print(json.dumps([m for m in {FORMAT_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_parser_import_loads_no_format_modules():
+    assert _loaded_after("import docling_serve.docling_test") == []
+
+
+def test_format_modules_loaded_with_their_first_file():
+    loaded = _loaded_after(
+        "from docling_serve.docling_test import _format_handler, _load_format_modules\n"
+        "_load_format_modules(_format_handler('deck.pptx'))"
+    )
+
+    assert loaded == ["pptx"]
@@ -0,0 +1,101 @@
+import pytest
+
+from docling_core.types.doc import (
+    BoundingBox,
+    DocItemLabel,
+    DoclingDocument,
+    ProvenanceItem,
+    Size,
+    TableCell,
+    TableData,
+)
+from docling_core.types.doc.base import ImageRefMode
+from docling_core.types.doc.document import BaseMeta, SummaryMetaField
+
+from docling_serve.markdown_pages import export_markdown_pages
+
+
+def _prov(page_no: int) -> ProvenanceItem:
+    return ProvenanceItem(
+        page_no=page_no, bbox=BoundingBox(l=0, t=0, r=10, b=10), charspan=(0, 1)
+    )
+
+
+def _table(rows: list[list[str]]) -> TableData:
+    data = TableData(num_rows=len(rows), num_cols=len(rows[0]))
+    for i, row in enumerate(rows):
+        for j, text in enumerate(row):
+            data.table_cells.append(
+                TableCell(
+                    text=text,
+                    start_row_offset_idx=i,
+                    end_row_offset_idx=i + 1,
+                    start_col_offset_idx=j,
+                    end_col_offset_idx=j + 1,
+                    column_header=i == 0,
+                )
+            )
+    return data
+
+
+@pytest.fixture
+def document() -> DoclingDocument:
+    doc = DoclingDocument(name="sample")
+    for page_no in range(1, 5):
+        doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+
+    doc.add_title(text="Report", prov=_prov(1))
+    doc.add_heading(text="Intro_section", prov=_prov(1))
+    doc.add_text(label=DocItemLabel.TEXT, text="First page text.", prov=_prov(1))
+
+    # A list spanning two pages
+    group = doc.add_unordered_list()
+    doc.add_list_item(text="item on page 1", parent=group, prov=_prov(1))
+    doc.add_list_item(text="item on page 2", parent=group, prov=_prov(2))
+
+    table = doc.add_table(data=_table([["a", "b"], ["1", "2"]]), prov=_prov(2))
+    caption = doc.add_text(label=DocItemLabel.CAPTION, text="Caption", prov=_prov(3))
+    table.captions.append(caption.get_ref())
+
+    doc.add_picture(prov=_prov(3))
+    doc.add_text(label=DocItemLabel.TEXT, text="No provenance")
+    doc.add_text(label=DocItemLabel.PAGE_FOOTER, text="footer", prov=_prov(4))
+    return doc
+
+
+@pytest.mark.parametrize(
+    "image_mode", [ImageRefMode.PLACEHOLDER, ImageRefMode.REFERENCED]
+)
+def test_pages_match_export_to_markdown(document, image_mode, caplog):
+    pages = export_markdown_pages(document, range(1, 6), image_mode=image_mode)
+
+    # Produced by the single pass, not by the page-by-page fallback
+    assert "exporting page by page" not in caplog.text
+
+    assert pages == {
+        page_no: document.export_to_markdown(page_no=page_no, image_mode=image_mode)
+        for page_no in range(1, 6)
+    }
+
+
+def test_parallel_export_matches_serial(document):
+    serial = export_markdown_pages(document, range(1, 5))
+    parallel = export_markdown_pages(
+        document, range(1, 5), max_workers=2, parallel_min_pages=1
+    )
+
+    assert parallel == serial
+
+
+def test_body_meta_exported_page_by_page(document):
+    document.body.meta = BaseMeta(summary=SummaryMetaField(text="Summary"))
+
+    pages = export_markdown_pages(document, [1, 2])
+
+    assert pages == {
+        page_no: document.export_to_markdown(page_no=page_no) for page_no in [1, 2]
+    }
+
+
+def test_no_pages(document):
+    assert export_markdown_pages(document, []) == {}
@@ -0,0 +1,80 @@
+import contextlib
+import threading
+import time
+
+import docling.document_converter
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
+from docling.pipeline.standard_pdf_pipeline import StandardPdfPipeline
+
+from docling_serve.model_registry import ModelRegistry
+
+
+class _SlowPipeline(StandardPdfPipeline):
+    created = 0
+
+    def __init__(self, pipeline_options):
+        type(self).created += 1
+        time.sleep(0.2)
+
+
+def _converter(options: PdfPipelineOptions) -> DocumentConverter:
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(
+                pipeline_cls=_SlowPipeline, pipeline_options=options
+            )
+        }
+    )
+
+
+def test_converters_share_one_pipeline(monkeypatch):
+    # Without a process-wide lock in DocumentConverter, only the registry guards
+    # the creation
+    monkeypatch.setattr(
+        docling.document_converter, "_PIPELINE_CACHE_LOCK", contextlib.nullcontext()
+    )
+    _SlowPipeline.created = 0
+    registry = ModelRegistry()
+    options = PdfPipelineOptions()
+    key = registry.options_key(options)
+    converters = [_converter(options) for _ in range(4)]
+    registry.acquire(key, *converters)
+
+    pipelines = []
+    threads = [
+        threading.Thread(
+            target=lambda c=c: pipelines.append(c._get_pipeline(InputFormat.PDF))
+        )
+        for c in converters
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _SlowPipeline.created == 1
+    assert all(pipeline is pipelines[0] for pipeline in pipelines)
+    assert registry.stats() == {key: {"refs": 1, "pipelines": 1}}
+
+
+def test_entries_released_with_last_reference():
+    registry = ModelRegistry()
+    options = PdfPipelineOptions()
+    key = registry.options_key(options)
+    registry.acquire(key, _converter(options))
+    registry.acquire(key, _converter(options))
+
+    registry.release(key)
+    assert registry.stats()[key]["refs"] == 1
+    registry.release(key)
+    assert registry.stats() == {}
+
+
+def test_options_key_matches_converter_hash():
+    options = PdfPipelineOptions(do_ocr=False)
+
+    assert ModelRegistry.options_key(options) == _converter(
+        options
+    )._get_pipeline_options_hash(options)
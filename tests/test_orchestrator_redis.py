@@ -0,0 +1,459 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from docling_jobkit.datamodel.callback import (
+    ProgressCallbackRequest,
+    ProgressSetNumDocs,
+    ProgressUpdateProcessed,
+)
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.datamodel.task_meta import TaskStatus
+from docling_jobkit.orchestrators.base_orchestrator import ProgressInvalid
+from docling_jobkit.orchestrators.rq import orchestrator as rq_orchestrator
+from docling_jobkit.orchestrators.rq.orchestrator import (
+    RQOrchestrator,
+    RQOrchestratorConfig,
+)
+
+from docling_serve.orchestrator_factory import (
+    RedisTaskStatusMixin,
+    _TaskStatusUpdate,
+    _TimedBlockingConnectionPool,
+)
+from docling_serve.settings import docling_serve_settings
+
+
+class _Orchestrator(RedisTaskStatusMixin, RQOrchestrator):
+    pass
+
+
+class _Notifier:
+    def __init__(self):
+        self.task_subscribers: dict[str, set] = {}
+        self.notified: list[str] = []
+
+    async def notify_task_subscribers(self, task_id: str):
+        self.notified.append(task_id)
+
+    async def notify_queue_positions(self):
+        pass
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _replica(monkeypatch, server) -> _Orchestrator:
+    monkeypatch.setattr(
+        rq_orchestrator.redis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeRedis(server=server),
+    )
+    monkeypatch.setattr(
+        rq_orchestrator.async_redis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server),
+    )
+    orchestrator = _Orchestrator(config=RQOrchestratorConfig())
+    orchestrator._redis = fakeredis.FakeAsyncRedis(server=server)
+    orchestrator._status_cache_ttl = 0
+    return orchestrator
+
+
+@pytest.fixture
+def orchestrator(monkeypatch, server):
+    return _replica(monkeypatch, server)
+
+
+def _task(task_id: str, status: TaskStatus = TaskStatus.PENDING) -> Task:
+    return Task(
+        task_id=task_id,
+        task_type="convert",
+        task_status=status,
+        processing_meta={
+            "num_docs": 1,
+            "num_processed": 0,
+            "num_succeeded": 0,
+            "num_failed": 0,
+        },
+    )
+
+
+def _set_job_status(server, task_id: str, status: str) -> None:
+    fakeredis.FakeRedis(server=server).hset(f"rq:job:{task_id}", "status", status)
+
+
+def _count_round_trips(orchestrator, monkeypatch) -> list:
+    executed = []
+    pipeline = orchestrator._redis.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counted_execute(*args, **kwargs):
+            executed.append(len(pipe.command_stack))
+            return await execute(*args, **kwargs)
+
+        pipe.execute = counted_execute
+        return pipe
+
+    monkeypatch.setattr(orchestrator._redis, "pipeline", counting_pipeline)
+    return executed
+
+
+async def test_task_statuses_in_one_round_trip(orchestrator, server, monkeypatch):
+    orchestrator._rq_queue.enqueue("builtins.print", job_id="other")
+    orchestrator._rq_queue.enqueue("builtins.print", job_id="queued")
+    _set_job_status(server, "started", "started")
+    _set_job_status(server, "failed", "failed")
+    done = _task("done", TaskStatus.SUCCESS)
+    orchestrator.tasks["done"] = done
+    executed = _count_round_trips(orchestrator, monkeypatch)
+
+    statuses = await orchestrator.task_statuses(
+        ["queued", "started", "failed", "done", "unknown"]
+    )
+
+    assert {
+        task_id: (task.task_status, position)
+        for task_id, (task, position) in statuses.items()
+    } == {
+        "queued": (TaskStatus.PENDING, 2),
+        "started": (TaskStatus.STARTED, None),
+        "failed": (TaskStatus.FAILURE, None),
+        "done": (TaskStatus.SUCCESS, None),
+    }
+    assert statuses["done"][0] is done
+    # The reads of the four pending tasks in one round trip
+    assert executed[0] == 4 * 4
+
+    # Once their hashes are written, only the tasks still running are read
+    executed.clear()
+    await orchestrator.task_statuses(["queued", "started", "failed", "done"])
+    assert executed == [2 * 4]
+
+
+async def test_status_written_back_only_on_transitions(
+    orchestrator, server, monkeypatch
+):
+    stored = []
+    store = orchestrator._store_task_in_redis
+
+    async def recording_store(task, **kwargs):
+        stored.append(task.task_status)
+        await store(task, **kwargs)
+
+    monkeypatch.setattr(orchestrator, "_store_task_in_redis", recording_store)
+    _set_job_status(server, "task", "started")
+
+    assert (await orchestrator.task_status("task")).task_status == TaskStatus.STARTED
+    await orchestrator.task_status("task")
+    assert stored == [TaskStatus.STARTED]
+
+    _set_job_status(server, "task", "failed")
+    assert (await orchestrator.task_status("task")).task_status == TaskStatus.FAILURE
+    assert stored == [TaskStatus.STARTED, TaskStatus.FAILURE]
+
+
+async def test_stored_status_adopted_once_the_job_expired(
+    orchestrator, server, monkeypatch
+):
+    # Completed through another replica, RQ already expired the job
+    done = _task("task", TaskStatus.SUCCESS)
+    done.processing_meta.num_succeeded = 1
+    other = _replica(monkeypatch, server)
+    other._task_result_keys["task"] = "results:task"
+    await other._store_task_in_redis(done, counters=True)
+    orchestrator.tasks["task"] = _task("task", TaskStatus.STARTED)
+    stored = []
+    store = orchestrator._store_task_in_redis
+
+    async def recording_store(task, **kwargs):
+        stored.append(task.task_status)
+        await store(task, **kwargs)
+
+    monkeypatch.setattr(orchestrator, "_store_task_in_redis", recording_store)
+
+    task = await orchestrator.task_status("task")
+
+    assert task.task_status == TaskStatus.SUCCESS
+    assert task.processing_meta.num_succeeded == 1
+    assert orchestrator._task_result_keys["task"] == "results:task"
+    assert stored == []
+
+
+async def test_stored_status_never_regressed_by_rq(orchestrator, server):
+    await orchestrator._store_task_in_redis(
+        _task("task", TaskStatus.FAILURE), counters=True
+    )
+    _set_job_status(server, "task", "started")
+
+    assert (await orchestrator.task_status("task")).task_status == TaskStatus.FAILURE
+    stored = await orchestrator._redis.hget(orchestrator._task_key("task"), "status")
+    assert stored == b"failure"
+
+
+async def test_hot_statuses_served_from_the_local_cache(orchestrator, server):
+    orchestrator._status_cache_ttl = 60
+    _set_job_status(server, "task", "started")
+    await orchestrator.task_status("task")
+
+    _set_job_status(server, "task", "failed")
+
+    assert (await orchestrator.task_status("task")).task_status == TaskStatus.STARTED
+    orchestrator._status_cache.clear()
+    assert (await orchestrator.task_status("task")).task_status == TaskStatus.FAILURE
+
+
+async def _publish(orchestrator, update: _TaskStatusUpdate) -> None:
+    await orchestrator._redis.publish(
+        orchestrator.config.sub_channel, update.model_dump_json()
+    )
+
+
+async def _until(condition) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+async def test_published_updates_applied_by_origin(monkeypatch, server):
+    replica = _replica(monkeypatch, server)
+    notifier = _Notifier()
+    replica.notifier = notifier
+    replica.tasks["own"] = _task("own", TaskStatus.STARTED)
+    replica.tasks["worker"] = _task("worker", TaskStatus.STARTED)
+    notifier.task_subscribers = {"own": set(), "worker": set(), "remote": set()}
+    # Submitted to another replica, only its hash is known here
+    other = _replica(monkeypatch, server)
+    await other._store_task_in_redis(_task("remote", TaskStatus.PENDING))
+    await other._store_task_in_redis(_task("unwatched", TaskStatus.PENDING))
+
+    listener = asyncio.create_task(replica._listen_for_updates())
+    try:
+        await asyncio.sleep(0.05)
+        # Without subscribers here, the tasks of the other replicas are not loaded
+        await _publish(
+            replica,
+            _TaskStatusUpdate(task_id="unwatched", task_status=TaskStatus.STARTED),
+        )
+        # This replica's own update is not applied again, its subscribers are notified
+        await _publish(
+            replica,
+            _TaskStatusUpdate(
+                task_id="own",
+                task_status=TaskStatus.FAILURE,
+                origin=replica._instance_id,
+            ),
+        )
+        await _publish(
+            replica,
+            _TaskStatusUpdate(
+                task_id="worker", task_status=TaskStatus.SUCCESS, result_key="key"
+            ),
+        )
+        await _publish(
+            replica, _TaskStatusUpdate(task_id="remote", task_status=TaskStatus.STARTED)
+        )
+        await _until(lambda: len(notifier.notified) >= 3)
+    finally:
+        listener.cancel()
+
+    assert replica.tasks["own"].task_status == TaskStatus.STARTED
+    assert replica.tasks["worker"].task_status == TaskStatus.SUCCESS
+    assert replica._task_result_keys["worker"] == "key"
+    assert replica.tasks["remote"].task_status == TaskStatus.STARTED
+    assert "unwatched" not in replica.tasks
+    assert set(notifier.notified) == {"own", "worker", "remote"}
+
+
+async def test_task_hash_round_trip(orchestrator):
+    task = _task("task", TaskStatus.STARTED)
+    task.processing_meta.num_processed = 3
+    orchestrator._task_result_keys["task"] = "results:task"
+    await orchestrator._store_task_in_redis(task, counters=True)
+    orchestrator._task_result_keys.clear()
+
+    loaded = await orchestrator._get_task_from_redis("task")
+
+    assert (loaded.task_type, loaded.task_status) == (
+        task.task_type,
+        TaskStatus.STARTED,
+    )
+    assert loaded.processing_meta == task.processing_meta
+    assert orchestrator._task_result_keys["task"] == "results:task"
+
+
+async def test_task_hash_of_another_version_ignored(orchestrator):
+    await orchestrator._store_task_in_redis(_task("task"))
+    await orchestrator._redis.hset(orchestrator._task_key("task"), "v", "0")
+
+    assert await orchestrator._get_task_from_redis("task") is None
+
+
+async def test_legacy_metadata_read_once(orchestrator):
+    prefix = f"{orchestrator.redis_prefix}task"
+    await orchestrator._redis.set(
+        f"{prefix}:metadata",
+        json.dumps(
+            {
+                "task_id": "task",
+                "task_type": "convert",
+                "task_status": "success",
+                "processing_meta": {"num_docs": 2, "num_succeeded": 2},
+            }
+        ),
+    )
+    await orchestrator._redis.set(f"{prefix}:result_key", "results:task")
+
+    task = await orchestrator._get_task_from_redis("task")
+    await orchestrator._redis.delete(f"{prefix}:metadata", f"{prefix}:result_key")
+    orchestrator._task_result_keys.clear()
+
+    # Converted to a hash on the first read
+    assert task.task_status == TaskStatus.SUCCESS
+    assert task.processing_meta.num_succeeded == 2
+    assert (await orchestrator._get_task_from_redis("task")).model_dump(
+        include={"task_status", "processing_meta"}
+    ) == task.model_dump(include={"task_status", "processing_meta"})
+    assert orchestrator._task_result_keys["task"] == "results:task"
+
+
+async def test_legacy_metadata_resolved_by_status_polls(orchestrator, server):
+    await orchestrator._redis.set(
+        f"{orchestrator.redis_prefix}task:metadata",
+        json.dumps(
+            {"task_id": "task", "task_type": "convert", "task_status": "started"}
+        ),
+    )
+
+    task = await orchestrator.task_status("task")
+
+    assert task.task_status == TaskStatus.STARTED
+    assert await orchestrator._redis.hget(orchestrator._task_key("task"), "v") == b"1"
+
+
+async def test_progress_reports_increment_the_task_hash(monkeypatch, server):
+    replicas = [_replica(monkeypatch, server) for _ in range(2)]
+    await replicas[0]._store_task_in_redis(_task("task"))
+
+    await replicas[0].receive_task_progress(
+        ProgressCallbackRequest(task_id="task", progress=ProgressSetNumDocs(num_docs=4))
+    )
+    for replica, failed in zip(replicas, (0, 1)):
+        await replica.receive_task_progress(
+            ProgressCallbackRequest(
+                task_id="task",
+                progress=ProgressUpdateProcessed(
+                    num_processed=2,
+                    num_succeeded=2 - failed,
+                    num_failed=failed,
+                    docs_succeeded=[],
+                    docs_failed=[],
+                ),
+            )
+        )
+
+    stored = await replicas[1]._redis.hgetall(replicas[1]._task_key("task"))
+    assert (stored[b"status"], stored[b"docs"], stored[b"processed"]) == (
+        b"started",
+        b"4",
+        b"4",
+    )
+    assert (stored[b"succeeded"], stored[b"failed"]) == (b"3", b"1")
+
+    # A status transition written back by a replica keeps the counters
+    _set_job_status(server, "task", "failed")
+    task = await replicas[0].task_status("task")
+
+    stored = await replicas[1]._redis.hgetall(replicas[1]._task_key("task"))
+    assert (stored[b"status"], stored[b"processed"]) == (b"failure", b"4")
+    assert task.processing_meta.num_processed == 4
+
+
+async def test_progress_before_the_number_of_documents(orchestrator):
+    task = _task("task")
+    task.processing_meta = None
+    orchestrator.tasks["task"] = task
+    progress = ProgressUpdateProcessed(
+        num_processed=1,
+        num_succeeded=1,
+        num_failed=0,
+        docs_succeeded=[],
+        docs_failed=[],
+    )
+
+    with pytest.raises(ProgressInvalid):
+        await orchestrator.receive_task_progress(
+            ProgressCallbackRequest(task_id="task", progress=progress)
+        )
+
+
+def _pool(server, timeout: float) -> _TimedBlockingConnectionPool:
+    return _TimedBlockingConnectionPool(
+        connection_class=fakeredis.FakeAsyncRedisConnection,
+        max_connections=1,
+        timeout=timeout,
+        server=server,
+    )
+
+
+def test_pool_sized_from_settings(orchestrator):
+    stats = orchestrator.redis_pool_stats()
+
+    assert stats["max_connections"] == docling_serve_settings.eng_rq_pool_size
+    assert stats["acquisitions"] == stats["timeouts"] == 0
+
+
+async def test_exhausted_pool_times_out(server):
+    pool = _pool(server, timeout=0.1)
+    connection = await pool.get_connection()
+
+    with pytest.raises(RedisConnectionError):
+        await pool.get_connection()
+
+    stats = pool.stats()
+    assert (stats["in_use"], stats["acquisitions"], stats["timeouts"]) == (1, 2, 1)
+    assert stats["wait_seconds_max"] >= 0.1
+    await pool.release(connection)
+    assert pool.stats()["idle"] == 1
+
+
+async def test_exhausted_pool_waits_for_a_released_connection(server):
+    pool = _pool(server, timeout=5)
+    connection = await pool.get_connection()
+
+    async def release_later():
+        await asyncio.sleep(0.05)
+        await pool.release(connection)
+
+    release = asyncio.create_task(release_later())
+    assert await pool.get_connection() is connection
+    await release
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 0
+    assert 0.05 <= stats["wait_seconds_max"] < 5
+
+
+async def test_close_redis_disconnects_the_pool(orchestrator, server):
+    pool = _pool(server, timeout=1)
+    orchestrator._redis_pool = pool
+    orchestrator._redis = redis.Redis(connection_pool=pool)
+    await orchestrator._store_task_in_redis(_task("task"))
+    connections = list(pool._available_connections)
+
+    await orchestrator.close_redis()
+
+    assert connections
+    assert not any(connection.is_connected for connection in connections)
+    assert pool.stats()["in_use"] == 0
@@ -0,0 +1,361 @@
+import threading
+from io import BytesIO
+from types import SimpleNamespace
+
+import pypdfium2 as pdfium
+import pytest
+
+from docling_core.types.doc import (
+    BoundingBox,
+    DocItemLabel,
+    DoclingDocument,
+    ProvenanceItem,
+    Size,
+)
+
+from docling_serve import docling_test
+from docling_serve.docling_test import (
+    DoclingParser,
+    DocTool,
+    Document,
+    FormatHandler,
+    ParserConfig,
+    _format_handler,
+    register_format_handler,
+)
+
+
+def _result(name: str, ok: bool = True, error: str = "") -> SimpleNamespace:
+    return SimpleNamespace(
+        status=SimpleNamespace(name="SUCCESS" if ok else "FAILURE"),
+        input=SimpleNamespace(file=SimpleNamespace(name=name)),
+        errors=[SimpleNamespace(error_message=error)] if error else [],
+        document=None,
+    )
+
+
+class _FakeConverter:
+    """Converter returning canned results, recording the converted files."""
+
+    def __init__(self, failures: dict[str, str]):
+        self.failures = failures
+        self.calls: list[tuple[str, tuple[int, int]]] = []
+
+    def _convert(self, source, page_range):
+        self.calls.append((source.name, page_range))
+        error = self.failures.get(source.name, "")
+        return _result(source.name, ok=not error, error=error)
+
+    def convert(self, source, raises_on_error=True, page_range=None):
+        return self._convert(source, page_range)
+
+    def convert_all(self, sources, raises_on_error=True, page_range=None):
+        for source in sources:
+            yield self._convert(source, page_range)
+
+
+def _parser(tmp_path, **kwargs) -> DoclingParser:
+    parser = DoclingParser(
+        ParserConfig(known_bad_path=tmp_path / "known_bad.txt", **kwargs)
+    )
+    # Finalized documents carry the name of the converter which produced them
+    parser._finalize_result = lambda result, filename, raw_sources: Document(
+        id=filename, text=result.converter
+    )
+    return parser
+
+
+def _use_converters(parser, primary_failures=None, fallback_failures=None):
+    parser.converter = _FakeConverter(primary_failures or {})
+    parser.fallback_converter = _FakeConverter(fallback_failures or {})
+    for converter, name in (
+        (parser.converter, "primary"),
+        (parser.fallback_converter, "fallback"),
+    ):
+        convert = converter._convert
+
+        def tagged(source, page_range, convert=convert, name=name):
+            result = convert(source, page_range)
+            result.converter = name
+            return result
+
+        converter._convert = tagged
+
+
+@pytest.fixture
+def files():
+    return {
+        "good.pdf": BytesIO(b"%PDF-good"),
+        "codepoint.pdf": BytesIO(b"%PDF-codepoint"),
+        "broken.pdf": BytesIO(b"%PDF-broken"),
+    }
+
+
+def test_invalid_code_point_retried_on_fallback(tmp_path, files):
+    parser = _parser(tmp_path)
+    _use_converters(
+        parser,
+        primary_failures={
+            "codepoint.pdf": "Invalid code point 0xFFFF",
+            "broken.pdf": "Unsupported",
+        },
+    )
+
+    docs = {doc.id: doc.text for doc in parser.parse_iter(files)}
+
+    assert docs == {"good.pdf": "primary", "codepoint.pdf": "fallback"}
+    assert [name for name, _ in parser.fallback_converter.calls] == ["codepoint.pdf"]
+
+
+def test_known_bad_files_skip_the_primary_backend(tmp_path, files):
+    parser = _parser(tmp_path)
+    _use_converters(parser, primary_failures={"codepoint.pdf": "Invalid code point"})
+    list(parser.parse_iter(files))
+
+    # A new parser reads the fingerprints persisted by the first one
+    parser = _parser(tmp_path)
+    _use_converters(parser)
+    docs = {doc.id: doc.text for doc in parser.parse_iter(files)}
+
+    assert docs["codepoint.pdf"] == "fallback"
+    assert "codepoint.pdf" not in [name for name, _ in parser.converter.calls]
+    assert (tmp_path / "known_bad.txt").read_text().count("\n") == 1
+
+
+def test_caller_content_hashes_reused(tmp_path, files, monkeypatch):
+    parser = _parser(tmp_path)
+    _use_converters(parser, primary_failures={"codepoint.pdf": "Invalid code point"})
+    hashes = {name: f"hash-of-{name}" for name in files}
+
+    def fail(raw):
+        raise AssertionError("file hashed again")
+
+    monkeypatch.setattr(docling_test, "hash_source", fail)
+    list(parser.parse_iter(files, content_hashes=hashes))
+
+    assert (tmp_path / "known_bad.txt").read_text() == "hash-of-codepoint.pdf\n"
+
+
+def _pdf(num_pages: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(num_pages):
+        pdf.new_page(100, 100)
+    buffer = BytesIO()
+    pdf.save(buffer)
+    pdf.close()
+    return buffer.getvalue()
+
+
+def _shard_document(num_pages: int) -> DoclingDocument:
+    doc = DoclingDocument(name="shard")
+    for page_no in range(1, num_pages + 1):
+        doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+        doc.add_text(
+            label=DocItemLabel.TEXT,
+            text=f"text of shard page {page_no}",
+            prov=ProvenanceItem(
+                page_no=page_no,
+                bbox=BoundingBox(l=0, t=0, r=10, b=10),
+                charspan=(0, 1),
+            ),
+        )
+    return doc
+
+
+def test_shards_only_contain_their_pages(tmp_path):
+    parser = _parser(tmp_path, shard_min_pages=9, shard_pages=4)
+
+    raw = _pdf(10)
+    shards = parser._page_shards("big.pdf", raw, (2, 10))
+
+    assert shards == [(2, 5), (6, 9), (10, 10)]
+    assert [
+        len(pdfium.PdfDocument(parser._extract_pages(raw, *shard))) for shard in shards
+    ] == [4, 4, 1]
+    assert parser._page_shards("small.pdf", _pdf(8), (1, 9)) == []
+
+
+def test_shard_pages_numbered_as_in_the_file(tmp_path):
+    parser = _parser(tmp_path, shard_min_pages=10, shard_pages=2)
+    converted = []
+
+    def convert(source, raises_on_error=True, page_range=None):
+        converted.append(
+            (len(pdfium.PdfDocument(source.stream.getvalue())), page_range)
+        )
+        result = _result(source.name)
+        result.document = _shard_document(2)
+        return result
+
+    parser.converter.convert = convert
+
+    text, _ = parser._convert_shard("big.pdf", _pdf(8), (5, 6), "0" * 64)
+
+    # The shard is cut by its worker and converted whole, not as a page range
+    assert converted == [(2, None)]
+    assert "- Page 5 -\n\ntext of shard page 1" in text
+    assert "- Page 6 -\n\ntext of shard page 2" in text
+
+
+def test_failed_shard_drops_the_file_with_an_error(tmp_path, caplog):
+    parser = _parser(tmp_path, shard_min_pages=4, shard_pages=2)
+    _use_converters(
+        parser,
+        primary_failures={"big.pdf": "Unsupported"},
+        fallback_failures={"big.pdf": "Unsupported"},
+    )
+
+    docs = list(parser.parse_iter({"big.pdf": BytesIO(_pdf(4))}))
+
+    assert docs == []
+    assert "Dropping big.pdf: 2 of its 2 page ranges failed" in caplog.text
+
+
+def test_format_handlers_by_extension(monkeypatch):
+    monkeypatch.setattr(
+        docling_test, "_FORMAT_HANDLERS", dict(docling_test._FORMAT_HANDLERS)
+    )
+
+    assert _format_handler("Sheet.XLSM").name == "xlsx"
+    assert _format_handler("scan.tiff").model_backed
+    # Other formats are exported as a single linear document
+    assert _format_handler("notes.md").name == "docx"
+
+    register_format_handler(
+        FormatHandler(name="markdown", extensions=(".MD",), process=print)
+    )
+    assert _format_handler("notes.md").name == "markdown"
+
+
+def test_office_files_do_not_wait_for_the_primary_batch(tmp_path):
+    parser = _parser(tmp_path, format_workers={"xlsx": 3})
+    _use_converters(parser)
+    sheet_released = threading.Event()
+    threads = {}
+    convert = parser.converter._convert
+
+    def record_thread(source, page_range):
+        threads[source.name] = threading.current_thread().name
+        if source.name == "sheet.xlsx":
+            assert sheet_released.wait(10)
+        return convert(source, page_range)
+
+    parser.converter._convert = record_thread
+    docs = parser.parse_iter(
+        {"sheet.xlsx": BytesIO(b"PK-sheet"), "good.pdf": BytesIO(b"%PDF-good")}
+    )
+
+    # The PDF comes out while the spreadsheet is still being converted
+    assert next(docs).id == "good.pdf"
+    sheet_released.set()
+    assert [doc.id for doc in docs] == ["sheet.xlsx"]
+    assert threads["sheet.xlsx"].startswith("xlsx-format")
+    assert not threads["good.pdf"].startswith("xlsx-format")
+    assert parser._format_executors["xlsx"]._max_workers == 3
+
+
+def _pools(parser) -> list:
+    return [
+        parser._fallback_executor,
+        parser._shard_executor,
+        parser._figure_executor,
+        *parser._format_executors.values(),
+    ]
+
+
+def _is_shut_down(executor) -> bool:
+    try:
+        executor.submit(int).result()
+    except RuntimeError:
+        return True
+    return False
+
+
+def test_close_shuts_down_the_worker_pools(tmp_path):
+    parser = _parser(tmp_path, shard_min_pages=10, figure_encode_workers=1)
+    parser._format_executor(_format_handler("sheet.xlsx"))
+    pools = _pools(parser)
+
+    parser.close()
+
+    assert len(pools) == 4
+    assert all(_is_shut_down(pool) for pool in pools)
+    assert parser._format_executors == {}
+
+
+def test_close_waits_for_running_conversions(tmp_path, files):
+    parser = _parser(tmp_path)
+    _use_converters(parser, primary_failures={"codepoint.pdf": "Invalid code point"})
+    docs = parser.parse_iter(files)
+    first = next(docs)
+
+    parser.close()
+    assert not _is_shut_down(parser._fallback_executor)
+
+    # The fallback conversion is still submitted to the open pool
+    assert {first.id, *(doc.id for doc in docs)} == set(files)
+    assert _is_shut_down(parser._fallback_executor)
+
+
+def test_closed_parser_reopens_for_a_conversion(tmp_path, files):
+    parser = _parser(tmp_path)
+    _use_converters(parser, primary_failures={"codepoint.pdf": "Invalid code point"})
+    parser.close()
+
+    docs = {doc.id: doc.text for doc in parser.parse_iter(files)}
+
+    assert docs["codepoint.pdf"] == "fallback"
+    assert _is_shut_down(parser._fallback_executor)
+
+
+def test_documents_yielded_as_soon_as_finalized(tmp_path, files, monkeypatch):
+    parser = _parser(tmp_path)
+    _use_converters(parser)
+    monkeypatch.setattr(docling_test, "DoclingParser", lambda config: parser)
+    docs = DocTool(config=parser.config)
+
+    results = docs.run_iter(files)
+
+    # Later files are only converted once the first document was consumed
+    assert next(results).id == "good.pdf"
+    assert [name for name, _ in parser.converter.calls] == ["good.pdf"]
+    assert [doc.id for doc in results] == ["codepoint.pdf", "broken.pdf"]
+    assert [doc.id for doc in docs.run(files)] == list(files)
+
+
+def test_inputs_share_their_upload_buffer(tmp_path):
+    parser = _parser(tmp_path)
+    upload = BytesIO(b"%PDF-small")
+
+    doc_sources, raw_sources, spooled = parser._input_streams({"small.pdf": upload})
+
+    assert raw_sources["small.pdf"] is upload.getvalue()
+    assert doc_sources[0].stream.getvalue() is raw_sources["small.pdf"]
+    assert spooled == []
+
+
+def test_large_inputs_spooled_once_and_released(tmp_path):
+    parser = _parser(tmp_path, scratch_dir=tmp_path / "scratch", spool_threshold=8)
+    _use_converters(parser)
+    converted = []
+    convert = parser.converter._convert
+
+    def record_source(source, page_range):
+        if source.name == "large.pdf":
+            converted.append((source, source.read_bytes()))
+        return convert(source, page_range)
+
+    parser.converter._convert = record_source
+    files = {"large.pdf": BytesIO(b"%PDF-large"), "tiny.pdf": BytesIO(b"%PDF")}
+
+    docs = [doc.id for doc in parser.parse_iter(files)]
+
+    assert sorted(docs) == ["large.pdf", "tiny.pdf"]
+    # Docling reads the large file from the scratch directory, removed afterwards
+    [(path, content)] = converted
+    assert path.is_relative_to(tmp_path / "scratch" / "spool")
+    assert content == b"%PDF-large"
+    assert not path.exists()
+    # Only the spooled upload buffer is released
+    assert files["large.pdf"].getvalue() == b""
+    assert files["tiny.pdf"].getvalue() == b"%PDF"
@@ -0,0 +1,136 @@
+import random
+from io import BytesIO
+from types import SimpleNamespace
+
+import pptx
+import pytest
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+from docling_serve.docling_test import (
+    DoclingParser,
+    ParserConfig,
+    _parsed_presentations,
+    _PresentationCache,
+    _SlideTextIndex,
+)
+
+
+def _shape(top: int, height: int, text: str = "", has_text_frame: bool = True):
+    return SimpleNamespace(
+        top=top,
+        height=height,
+        has_text_frame=has_text_frame,
+        text_frame=SimpleNamespace(text=text),
+    )
+
+
+def _closest(shapes, chart) -> tuple[str, str]:
+    """Closest text above and below by a scan of every shape."""
+    above, below = [], []
+    for other in shapes:
+        if other is chart or not other.has_text_frame:
+            continue
+        text = other.text_frame.text.strip()
+        if not text:
+            continue
+        if other.top + other.height < chart.top:
+            above.append((chart.top - other.top - other.height, text))
+        elif other.top > chart.top + chart.height:
+            below.append((other.top - chart.top - chart.height, text))
+    above.sort(key=lambda x: x[0])
+    below.sort(key=lambda x: x[0])
+    return (above[0][1] if above else "", below[0][1] if below else "")
+
+
+def test_closest_text_above_and_below():
+    shapes = [
+        _shape(0, 10, "Title"),
+        _shape(20, 10, " Subtitle "),
+        _shape(25, 5, "   "),
+        _shape(40, 50, has_text_frame=False),
+        _shape(95, 10, "Note"),
+        _shape(120, 10, "Footer"),
+    ]
+    index = _SlideTextIndex(shapes)
+
+    assert (index.above(40), index.below(90)) == ("Subtitle", "Note")
+    # Touching shapes are neither above nor below
+    assert (index.above(30), index.below(95)) == ("Title", "Footer")
+    assert (index.above(5), index.below(130)) == ("", "")
+
+
+def test_index_matches_scan():
+    rng = random.Random(0)
+    for _ in range(300):
+        shapes = [
+            _shape(
+                rng.randrange(0, 100, 5),
+                rng.randrange(0, 30, 5),
+                rng.choice(["", "a", "b", "c", "d"]),
+                rng.random() < 0.8,
+            )
+            for _ in range(rng.randint(0, 8))
+        ]
+        chart = _shape(rng.randrange(0, 100, 5), rng.randrange(0, 30, 5))
+        chart.has_text_frame = False
+        shapes.insert(rng.randint(0, len(shapes)), chart)
+        index = _SlideTextIndex(shapes)
+
+        assert (
+            index.above(chart.top),
+            index.below(chart.top + chart.height),
+        ) == _closest(shapes, chart)
+
+
+def _deck() -> bytes:
+    prs = pptx.Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Quarterly sales"
+    data = CategoryChartData()
+    data.categories = ["Q1", "Q2"]
+    data.add_series("Sales", (10, 12))
+    slide.shapes.add_chart(
+        XL_CHART_TYPE.COLUMN_CLUSTERED,
+        Inches(1),
+        Inches(2),
+        Inches(4),
+        Inches(3),
+        data,
+    )
+    slide.shapes.add_textbox(
+        Inches(1), Inches(5.5), Inches(4), Inches(1)
+    ).text = "Sales grew"
+    buffer = BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return DoclingParser(ParserConfig())
+
+
+def test_deck_parsed_once(parser, monkeypatch):
+    deck = BytesIO(_deck())
+    opened = []
+    monkeypatch.setattr(pptx, "Presentation", lambda *args: opened.append(args) or None)
+
+    docs = list(parser.parse_iter({"deck.pptx": deck}))
+
+    # Charts come from the package parsed by the Docling backend
+    assert opened == []
+    assert "| Q2 |      12 |" in docs[0].text
+    assert docs[0].text.index("# Chart:") < docs[0].text.index("Sales grew")
+    assert _parsed_presentations._entries == {}
+
+
+def test_presentation_cache_bounded():
+    cache = _PresentationCache(max_size=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+
+    assert cache.pop("a") is None
+    assert cache.pop("c") == "C"
+    assert cache.pop("c") is None
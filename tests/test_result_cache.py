@@ -0,0 +1,87 @@
+from PIL import Image
+
+from docling_serve.docling_test import Document, Figure, ParserConfig
+from docling_serve.result_cache import ResultCache, config_fingerprint, hash_source
+
+
+def _document(name: str = "report.pdf") -> Document:
+    figure = Figure.from_image(
+        id="hash1/report/page_0001/fig.png", image=Image.new("RGB", (2, 2))
+    )
+    return Document(id=name, text="# Report", images=[figure])
+
+
+def test_put_does_not_encode_figures():
+    cache = ResultCache(max_size=4)
+    doc = _document()
+
+    cache.put("key", doc)
+
+    assert doc.images[0]._data is None
+    assert '"data"' not in ResultCache.serialize(doc)
+
+
+def test_hits_are_independent_copies():
+    cache = ResultCache(max_size=4)
+    cache.put("key", _document())
+
+    first = cache.get("key")
+    first.text = "changed"
+    first.images.clear()
+    second = cache.get("key")
+
+    assert second.text == "# Report"
+    assert [figure.id for figure in second.images] == ["hash1/report/page_0001/fig.png"]
+    assert cache.stats() == {"hits": 2, "misses": 0, "size": 1}
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_size=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, _document(key))
+
+    assert cache.get("a") is None
+    assert cache.get("c").id == "c"
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 2}
+
+
+def test_disk_tier_survives_memory(tmp_path):
+    ResultCache(max_size=0, disk_dir=tmp_path).put("key", _document())
+
+    cache = ResultCache(max_size=2, disk_dir=tmp_path)
+    assert cache.get("key").text == "# Report"
+
+    cache.clear()
+    assert cache.get("key") is None
+
+
+def test_figures_attached_from_figures_dir(tmp_path):
+    cache = ResultCache(max_size=2)
+    doc = _document()
+    doc.images[0].spill(tmp_path)
+    cache.put("key", doc)
+
+    cached = cache.get("key")
+    assert cached.images[0].attach(tmp_path)
+    assert cached.images[0].get_bytes() == doc.images[0].get_bytes()
+
+    (tmp_path / doc.images[0].id).unlink()
+    assert not cache.get("key").images[0].attach(tmp_path)
+
+
+def test_fingerprint_ignores_runtime_settings(tmp_path):
+    base = ParserConfig()
+
+    assert config_fingerprint(base) == config_fingerprint(
+        base.model_copy(update={"layout_batch_size": 64, "figures_dir": tmp_path})
+    )
+    assert config_fingerprint(base) != config_fingerprint(
+        base.model_copy(update={"do_ocr": not base.do_ocr})
+    )
+
+
+def test_hash_source_of_path_and_bytes(tmp_path):
+    path = tmp_path / "input.pdf"
+    path.write_bytes(b"%PDF-1.4 content")
+
+    assert hash_source(path) == hash_source(b"%PDF-1.4 content")
@@ -0,0 +1,62 @@
+import asyncio
+from types import SimpleNamespace
+
+from docling_jobkit.datamodel.task_meta import TaskStatus
+
+from docling_serve.websocket_notifier import WebsocketNotifier
+
+
+class _Orchestrator:
+    def __init__(self):
+        self.status = TaskStatus.STARTED
+
+    async def task_status(self, task_id: str):
+        return SimpleNamespace(
+            task_id=task_id,
+            task_type="convert",
+            task_status=self.status,
+            processing_meta=None,
+            is_completed=lambda: self.status == TaskStatus.SUCCESS,
+        )
+
+    async def get_queue_position(self, task_id: str):
+        return None
+
+
+async def _woken(event: asyncio.Event) -> bool:
+    try:
+        await asyncio.wait_for(event.wait(), timeout=1)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+async def test_waiters_woken_by_the_task_notification():
+    notifier = WebsocketNotifier(_Orchestrator())
+    await notifier.add_task("task")
+    event = notifier.get_update_event("task")
+    waiter = asyncio.create_task(_woken(event))
+
+    await notifier.notify_task_subscribers("task")
+
+    assert await waiter
+    # A fresh event is armed for the next update
+    assert not notifier.get_update_event("task").is_set()
+
+
+async def test_waiters_woken_when_the_task_is_removed():
+    notifier = WebsocketNotifier(_Orchestrator())
+    await notifier.add_task("task")
+    waiter = asyncio.create_task(_woken(notifier.get_update_event("task")))
+
+    await notifier.remove_task("task")
+
+    assert await waiter
+    assert notifier.get_update_event("task") is None
+
+
+async def test_untracked_tasks_have_no_event():
+    notifier = WebsocketNotifier(_Orchestrator())
+
+    # Their waiters fall back to polling
+    assert notifier.get_update_event("other") is None
@@ -0,0 +1,152 @@
+import datetime
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.chart import BarChart, Reference
+from openpyxl.comments import Comment
+
+from docling_serve.docling_test import DoclingParser, ParserConfig
+from docling_serve.xlsx_stream import StreamingWorkbook, _merge_rects
+
+
+def _workbook() -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data Sheet"
+    ws.append(["Month", "Sales", "Costs"])
+    for month, sales, costs in [("Jan", 10, 4), ("Feb", 12.5, 5), ("Mar", 9, None)]:
+        ws.append([month, sales, costs])
+    ws["A6"] = datetime.datetime(2024, 1, 31)
+    ws["B6"] = "=SUM(B2:B4)"
+    ws["A8"] = "Merged title"
+    ws.merge_cells("A8:C9")
+    ws["E2"] = "Text above the chart"
+    ws["H1"].hyperlink = "https://example.com"
+    ws["J12"].comment = Comment("note", "author")
+
+    chart = BarChart()
+    chart.title = "Sales"
+    chart.add_data(Reference(ws, min_col=2, min_row=1, max_col=3, max_row=4), True)
+    chart.set_categories(Reference(ws, min_col=1, min_row=2, max_row=4))
+    ws.add_chart(chart, "E3")
+
+    other = wb.create_sheet("Empty")
+    other["B2"] = "only cell"
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+class _FullWorkbook:
+    """load_workbook() result with the sheet lookup the parser uses."""
+
+    def __init__(self, data: bytes):
+        self._wb = load_workbook(BytesIO(data), data_only=True)
+        self.sheetnames = self._wb.sheetnames
+
+    def resolve_sheet_name(self, name):
+        return name if name in self.sheetnames else None
+
+    def __getitem__(self, name):
+        return self._wb[name]
+
+
+@pytest.fixture(scope="module")
+def data() -> bytes:
+    return _workbook()
+
+
+@pytest.fixture
+def streaming(data):
+    wb = StreamingWorkbook(BytesIO(data))
+    yield wb
+    wb.close()
+
+
+def test_values_match_full_workbook(data, streaming):
+    full = load_workbook(BytesIO(data), data_only=True)
+
+    assert streaming.sheetnames == full.sheetnames
+    for name in full.sheetnames:
+        for row in range(1, 22):
+            for col in range(1, 12):
+                assert (
+                    streaming[name].cell(row=row, column=col).value
+                    == full[name].cell(row=row, column=col).value
+                ), (name, row, col)
+
+
+def test_open_ranges_end_at_full_mode_dimensions(data, streaming):
+    full = load_workbook(BytesIO(data), data_only=True)
+
+    for name in full.sheetnames:
+        assert streaming[name].iter_rows(values_only=True) == list(
+            full[name].iter_rows(values_only=True)
+        )
+
+
+def test_merged_cells_only_keep_top_left_value(streaming):
+    assert streaming["Data Sheet"].iter_rows(
+        min_row=8, max_row=9, min_col=1, max_col=3, values_only=True
+    ) == [("Merged title", None, None), (None, None, None)]
+
+
+def test_prefetched_ranges_served_without_parsing(streaming, monkeypatch):
+    sheet = streaming["Data Sheet"]
+    streaming.prefetch([("Data Sheet", (1, 1, 3, 4)), ("Data Sheet", (2, 3, 3, 6))])
+
+    def fail(regions):
+        raise AssertionError(f"parsed again for {regions}")
+
+    monkeypatch.setattr(sheet, "_read_regions", fail)
+    assert sheet.iter_rows(
+        min_row=2, max_row=4, min_col=1, max_col=2, values_only=True
+    ) == [("Jan", 10), ("Feb", 12.5), ("Mar", 9)]
+
+
+def test_cell_objects_not_read(streaming):
+    with pytest.raises(ValueError, match="values_only=True"):
+        streaming["Data Sheet"].iter_rows(min_row=1, max_row=2, max_col=2)
+
+
+def test_charts_match_full_workbook(data, streaming):
+    full = load_workbook(BytesIO(data), data_only=True)
+    stream_charts = streaming["Data Sheet"]._charts
+    full_charts = full["Data Sheet"]._charts
+
+    assert len(stream_charts) == len(full_charts) == 1
+    assert [s.val.numRef.f for s in stream_charts[0].series] == [
+        s.val.numRef.f for s in full_charts[0].series
+    ]
+    assert stream_charts[0].anchor._from.row == full_charts[0].anchor._from.row
+    assert streaming["Empty"]._charts == []
+
+
+def test_merge_rects():
+    # Overlapping and adjacent ranges merge into their bounding box
+    assert _merge_rects([(1, 1, 2, 5), (2, 3, 3, 6)]) == [(1, 1, 3, 6)]
+    assert _merge_rects([(1, 1, 1, 5), (2, 1, 2, 5)]) == [(1, 1, 2, 5)]
+    # Disjoint ranges, or a box much larger than the ranges, stay apart
+    assert _merge_rects([(1, 1, 1, 1), (5, 5, 5, 5)]) == [(1, 1, 1, 1), (5, 5, 5, 5)]
+    assert _merge_rects([(1, 1, 10, 1), (1, 1, 1, 10)]) == [
+        (1, 1, 1, 10),
+        (1, 1, 10, 1),
+    ]
+    assert _merge_rects([(1, 1, 1, 1), (1, 1, 1, 1)]) == [(1, 1, 1, 1)]
+
+
+def test_chart_metadata_matches_full_workbook(data):
+    parser = DoclingParser(ParserConfig())
+    full = _FullWorkbook(data)
+
+    sheet_names, charts_by_page = parser._extract_excel_metadata(BytesIO(data))
+
+    assert sheet_names == ["Data Sheet", "Empty"]
+    assert list(charts_by_page) == [1]
+    (chart,) = charts_by_page[1]
+    (full_chart,) = full["Data Sheet"]._charts
+    assert chart["table"] == parser._resolve_excel_chart_data(full, full_chart)
+    assert chart["pre_text"] == "Text above the chart"
+    assert "| Jan" in chart["table"]